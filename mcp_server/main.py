@@ -5,6 +5,7 @@ Provides comprehensive MCP tools for peer review system interaction.
 
 import os
 import sys
+import json
 import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
@@ -23,16 +24,41 @@ from tools import author
 from tools import reviewer
 from tools import editor
 from utils.convex_client import cleanup_convex_client
-from utils.security import security_config, validate_auth_token, sanitize_input, require_rate_limit, validate_file_upload
+from utils.auth_manager import cleanup_auth_manager
+from utils.executor import shutdown_backend_executor
+from utils.table_mirror import cleanup_table_mirror
+from utils.upload_session import cleanup_upload_manager
+from utils.deadline import with_deadline
+from utils.concurrency import ConcurrencyLimitMiddleware
+from utils.security import security_config, validate_auth_token, sanitize_input, require_rate_limit, validate_file_upload, validate_upload_metadata, cleanup_rate_limits
 
 # Create FastMCP server
 mcp = FastMCP("Cyan Science Journal MCP Server")
 
+# Adaptive per-tool and total in-flight limits; excess calls are shed
+concurrency = ConcurrencyLimitMiddleware()
+mcp.add_middleware(concurrency)
+
+# Per-tool deadlines in seconds; tools not listed use MCP_TOOL_DEADLINE
+TOOL_DEADLINES = {
+    "submit_manuscript": 120,
+    "upload_proofed_manuscript": 120,
+    "commit_manuscript_upload": 120,
+    "get_editor_dashboard": 15,
+    "get_reviewer_dashboard": 15,
+}
+
+def tool():
+    """Register an MCP tool whose calls are cancelled once their deadline passes."""
+    def decorator(func):
+        return mcp.tool()(with_deadline(TOOL_DEADLINES.get(func.__name__))(func))
+    return decorator
+
 # =============================================================================
 # AUTHENTICATION TOOLS
 # =============================================================================
 
-@mcp.tool()
+@tool()
 @require_rate_limit()
 async def authenticate_user(email: str, password: str) -> dict:
     """
@@ -54,7 +80,7 @@ async def authenticate_user(email: str, password: str) -> dict:
     except ValueError as e:
         return {"success": False, "error": f"Invalid input: {str(e)}"}
 
-@mcp.tool()
+@tool()
 async def get_current_user(auth_token: str) -> dict:
     """
     Get current authenticated user information.
@@ -73,7 +99,7 @@ async def get_current_user(auth_token: str) -> dict:
     except ValueError as e:
         return {"success": False, "error": f"Invalid token: {str(e)}"}
 
-@mcp.tool()
+@tool()
 async def logout_user(auth_token: str) -> dict:
     """
     Logout user and invalidate authentication session.
@@ -86,7 +112,7 @@ async def logout_user(auth_token: str) -> dict:
     """
     return await auth.logout_user(auth_token)
 
-@mcp.tool()
+@tool()
 async def refresh_session(auth_token: str) -> dict:
     """
     Refresh user session with updated data from backend.
@@ -99,7 +125,7 @@ async def refresh_session(auth_token: str) -> dict:
     """
     return await auth.refresh_session(auth_token)
 
-@mcp.tool()
+@tool()
 async def check_permissions(auth_token: str, required_roles: list) -> dict:
     """
     Check if authenticated user has required permissions.
@@ -113,7 +139,7 @@ async def check_permissions(auth_token: str, required_roles: list) -> dict:
     """
     return await auth.check_permissions(auth_token, required_roles)
 
-@mcp.tool()
+@tool()
 async def create_user_account(email: str, password: str, name: str, roles: list = None) -> dict:
     """
     Create new user account in the system.
@@ -129,7 +155,7 @@ async def create_user_account(email: str, password: str, name: str, roles: list
     """
     return await auth.create_user_account(email, password, name, roles)
 
-@mcp.tool()
+@tool()
 async def request_role_elevation(auth_token: str, requested_role: str, reason: str) -> dict:
     """
     Request elevation to reviewer or editor role.
@@ -144,7 +170,7 @@ async def request_role_elevation(auth_token: str, requested_role: str, reason: s
     """
     return await auth.request_role_elevation(auth_token, requested_role, reason)
 
-@mcp.tool()
+@tool()
 async def get_session_info(auth_token: str) -> dict:
     """
     Get detailed session information for authenticated user.
@@ -157,7 +183,7 @@ async def get_session_info(auth_token: str) -> dict:
     """
     return await auth.get_session_info(auth_token)
 
-@mcp.tool()
+@tool()
 async def validate_token(auth_token: str) -> dict:
     """
     Validate authentication token.
@@ -174,7 +200,7 @@ async def validate_token(auth_token: str) -> dict:
 # AUTHOR TOOLS
 # =============================================================================
 
-@mcp.tool()
+@tool()
 @require_rate_limit()
 async def submit_manuscript(
     auth_token: str,
@@ -220,7 +246,141 @@ async def submit_manuscript(
     except ValueError as e:
         return {"success": False, "error": f"Validation failed: {str(e)}"}
 
-@mcp.tool()
+@tool()
+@require_rate_limit()
+async def begin_manuscript_upload(
+    auth_token: str,
+    file_name: str,
+    file_size: int,
+    content_type: str = "application/pdf",
+    sha256: str = None
+) -> dict:
+    """
+    Start a chunked manuscript upload, for files too large to send in one call.
+    
+    Send the base64 encoded file in order with append_manuscript_upload,
+    then submit it with commit_manuscript_upload. When sha256 matches a
+    file you uploaded recently, already_uploaded is true and the chunks
+    can be skipped. When resumable is true, an interrupted upload can be
+    continued from the offset given by get_manuscript_upload_status.
+    
+    Args:
+        auth_token: Authentication token
+        file_name: Original file name
+        file_size: Size of the file in bytes (before base64 encoding)
+        content_type: MIME type of the file
+        sha256: Hex SHA-256 of the file (optional; verified at commit)
+        
+    Returns:
+        Upload ID, the largest chunk (in base64 characters) accepted, and
+        whether the file is already stored
+    """
+    try:
+        validate_auth_token(auth_token)
+        if file_size <= 0:
+            raise ValueError("File is empty")
+        validate_upload_metadata(file_size, file_name, content_type)
+        if sha256 is not None and (len(sha256) != 64 or any(c not in "0123456789abcdefABCDEF" for c in sha256)):
+            raise ValueError("sha256 must be 64 hex characters")
+        
+        return await author.begin_manuscript_upload(file_name, file_size, content_type, sha256, auth_token)
+    except ValueError as e:
+        return {"success": False, "error": f"Validation failed: {str(e)}"}
+
+@tool()
+async def append_manuscript_upload(auth_token: str, upload_id: str, chunk: str, offset: int = None) -> dict:
+    """
+    Append the next chunk of a file to an upload.
+    
+    Pass offset (the position of the chunk in the base64 text) to make
+    retries safe: anything the upload already holds is skipped, and a
+    chunk that would leave a gap is refused with the offset to resume from.
+    
+    Args:
+        auth_token: Authentication token
+        upload_id: Upload ID from begin_manuscript_upload
+        chunk: Next piece of the base64 encoded file; may end mid-group
+        offset: Position of the chunk in the base64 text (optional)
+        
+    Returns:
+        Next offset, bytes received so far and bytes still expected
+    """
+    try:
+        validate_auth_token(auth_token)
+        return await author.append_manuscript_upload(upload_id, chunk, offset, auth_token)
+    except ValueError as e:
+        return {"success": False, "error": f"Upload failed: {str(e)}"}
+
+@tool()
+async def get_manuscript_upload_status(auth_token: str, upload_id: str) -> dict:
+    """
+    Get how far an upload has got, to resume it after a dropped connection.
+    
+    Args:
+        auth_token: Authentication token
+        upload_id: Upload ID from begin_manuscript_upload
+        
+    Returns:
+        Offset to continue appending from, bytes received and bytes still expected
+    """
+    try:
+        validate_auth_token(auth_token)
+        return await author.get_manuscript_upload_status(upload_id, auth_token)
+    except ValueError as e:
+        return {"success": False, "error": f"Upload status failed: {str(e)}"}
+
+@tool()
+async def commit_manuscript_upload(
+    auth_token: str,
+    upload_id: str,
+    title: str,
+    abstract: str,
+    keywords: list,
+    language: str
+) -> dict:
+    """
+    Finish an upload and submit the manuscript for peer review.
+    
+    Args:
+        auth_token: Authentication token
+        upload_id: Upload ID from begin_manuscript_upload
+        title: Manuscript title
+        abstract: Manuscript abstract
+        keywords: List of keywords
+        language: Manuscript language
+        
+    Returns:
+        Submission result with manuscript ID
+    """
+    try:
+        validate_auth_token(auth_token)
+        title = sanitize_input(title, max_length=500)
+        abstract = sanitize_input(abstract, max_length=5000)
+        language = sanitize_input(language, max_length=10)
+        
+        return await author.commit_manuscript_upload(upload_id, title, abstract, keywords, language, auth_token)
+    except ValueError as e:
+        return {"success": False, "error": f"Validation failed: {str(e)}"}
+
+@tool()
+async def abort_manuscript_upload(auth_token: str, upload_id: str) -> dict:
+    """
+    Abandon an upload in progress; nothing is stored.
+    
+    Args:
+        auth_token: Authentication token
+        upload_id: Upload ID from begin_manuscript_upload
+        
+    Returns:
+        Confirmation that the upload was aborted
+    """
+    try:
+        validate_auth_token(auth_token)
+        return await author.abort_manuscript_upload(upload_id, auth_token)
+    except ValueError as e:
+        return {"success": False, "error": f"Upload abort failed: {str(e)}"}
+
+@tool()
 async def get_my_manuscripts(auth_token: str) -> dict:
     """
     Get all manuscripts submitted by the current author.
@@ -233,7 +393,7 @@ async def get_my_manuscripts(auth_token: str) -> dict:
     """
     return await author.get_my_manuscripts(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_manuscript_details(auth_token: str, manuscript_id: str) -> dict:
     """
     Get detailed information about a specific manuscript.
@@ -247,7 +407,7 @@ async def get_manuscript_details(auth_token: str, manuscript_id: str) -> dict:
     """
     return await author.get_manuscript_details(manuscript_id, auth_token)
 
-@mcp.tool()
+@tool()
 async def check_manuscript_status(auth_token: str, manuscript_id: str) -> dict:
     """
     Check the current status of a manuscript.
@@ -261,7 +421,7 @@ async def check_manuscript_status(auth_token: str, manuscript_id: str) -> dict:
     """
     return await author.check_manuscript_status(manuscript_id, auth_token)
 
-@mcp.tool()
+@tool()
 async def download_manuscript_file(auth_token: str, manuscript_id: str) -> dict:
     """
     Get download URL for manuscript file.
@@ -279,7 +439,7 @@ async def download_manuscript_file(auth_token: str, manuscript_id: str) -> dict:
 # REVIEWER TOOLS
 # =============================================================================
 
-@mcp.tool()
+@tool()
 async def get_reviewer_dashboard(auth_token: str) -> dict:
     """
     Get reviewer dashboard with assigned reviews and statistics.
@@ -290,9 +450,9 @@ async def get_reviewer_dashboard(auth_token: str) -> dict:
     Returns:
         Dashboard data with reviews and stats
     """
-    return await reviewer.get_reviewer_dashboard(auth_token)
+    return await reviewer.get_reviewer_dashboard(auth_token=auth_token)
 
-@mcp.tool()
+@tool()
 async def get_assigned_reviews(auth_token: str) -> dict:
     """
     Get all reviews assigned to the current reviewer.
@@ -305,7 +465,7 @@ async def get_assigned_reviews(auth_token: str) -> dict:
     """
     return await reviewer.get_assigned_reviews(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_review_details(auth_token: str, review_id: str) -> dict:
     """
     Get details of a specific review assignment.
@@ -319,7 +479,7 @@ async def get_review_details(auth_token: str, review_id: str) -> dict:
     """
     return await reviewer.get_review_details(review_id, auth_token)
 
-@mcp.tool()
+@tool()
 async def get_pending_reviews(auth_token: str) -> dict:
     """
     Get all pending reviews for the current reviewer.
@@ -332,7 +492,7 @@ async def get_pending_reviews(auth_token: str) -> dict:
     """
     return await reviewer.get_pending_reviews(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_completed_reviews(auth_token: str) -> dict:
     """
     Get all completed reviews for the current reviewer.
@@ -345,7 +505,7 @@ async def get_completed_reviews(auth_token: str) -> dict:
     """
     return await reviewer.get_completed_reviews(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_overdue_reviews(auth_token: str) -> dict:
     """
     Get all overdue reviews for the current reviewer.
@@ -358,7 +518,7 @@ async def get_overdue_reviews(auth_token: str) -> dict:
     """
     return await reviewer.get_overdue_reviews(auth_token)
 
-@mcp.tool()
+@tool()
 async def submit_review(
     auth_token: str,
     review_id: str,
@@ -381,7 +541,7 @@ async def submit_review(
     """
     return await reviewer.submit_review(review_id, score, comments, recommendation, auth_token)
 
-@mcp.tool()
+@tool()
 async def get_review_history(auth_token: str) -> dict:
     """
     Get the reviewer's complete review history.
@@ -394,7 +554,7 @@ async def get_review_history(auth_token: str) -> dict:
     """
     return await reviewer.get_review_history(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_review_statistics(auth_token: str) -> dict:
     """
     Get reviewer's performance statistics.
@@ -407,7 +567,7 @@ async def get_review_statistics(auth_token: str) -> dict:
     """
     return await reviewer.get_review_statistics(auth_token)
 
-@mcp.tool()
+@tool()
 async def download_manuscript_for_review(auth_token: str, review_id: str) -> dict:
     """
     Get download URL for a manuscript under review.
@@ -421,7 +581,7 @@ async def download_manuscript_for_review(auth_token: str, review_id: str) -> dic
     """
     return await reviewer.download_manuscript(review_id, auth_token)
 
-@mcp.tool()
+@tool()
 async def get_review_guidelines() -> dict:
     """
     Get peer review guidelines and best practices.
@@ -435,7 +595,7 @@ async def get_review_guidelines() -> dict:
 # EDITOR TOOLS
 # =============================================================================
 
-@mcp.tool()
+@tool()
 async def get_editor_dashboard(auth_token: str) -> dict:
     """
     Get editor dashboard with manuscripts, reviews, and statistics.
@@ -446,9 +606,9 @@ async def get_editor_dashboard(auth_token: str) -> dict:
     Returns:
         Dashboard data with editorial overview
     """
-    return await editor.get_editor_dashboard(auth_token)
+    return await editor.get_editor_dashboard(auth_token=auth_token)
 
-@mcp.tool()
+@tool()
 async def get_manuscripts_for_editor(auth_token: str) -> dict:
     """
     Get manuscripts assigned to current editor.
@@ -461,7 +621,7 @@ async def get_manuscripts_for_editor(auth_token: str) -> dict:
     """
     return await editor.get_manuscripts_for_editor(auth_token)
 
-@mcp.tool()
+@tool()
 async def assign_reviewer_to_manuscript(
     auth_token: str,
     manuscript_id: str,
@@ -482,7 +642,7 @@ async def assign_reviewer_to_manuscript(
     """
     return await editor.assign_reviewer_to_manuscript(manuscript_id, reviewer_id, deadline_days, auth_token)
 
-@mcp.tool()
+@tool()
 async def remove_reviewer_from_manuscript(
     auth_token: str,
     review_id: str,
@@ -501,7 +661,7 @@ async def remove_reviewer_from_manuscript(
     """
     return await editor.remove_reviewer_from_manuscript(review_id, reason, auth_token)
 
-@mcp.tool()
+@tool()
 async def get_available_reviewers(auth_token: str) -> dict:
     """
     Get list of available reviewers for assignment.
@@ -514,7 +674,7 @@ async def get_available_reviewers(auth_token: str) -> dict:
     """
     return await editor.get_available_reviewers(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_reviews_for_manuscript(
     auth_token: str,
     manuscript_id: str
@@ -531,7 +691,7 @@ async def get_reviews_for_manuscript(
     """
     return await editor.get_reviews_for_manuscript(manuscript_id, auth_token)
 
-@mcp.tool()
+@tool()
 async def make_editorial_decision(
     auth_token: str,
     manuscript_id: str,
@@ -552,7 +712,7 @@ async def make_editorial_decision(
     """
     return await editor.make_editorial_decision(manuscript_id, decision, comments, auth_token)
 
-@mcp.tool()
+@tool()
 async def get_proofing_tasks(auth_token: str) -> dict:
     """
     Get proofing tasks for manuscripts accepted for publication.
@@ -565,7 +725,7 @@ async def get_proofing_tasks(auth_token: str) -> dict:
     """
     return await editor.get_proofing_tasks(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_proofing_task_details(
     auth_token: str,
     task_id: str
@@ -582,7 +742,7 @@ async def get_proofing_task_details(
     """
     return await editor.get_proofing_task_details(task_id, auth_token)
 
-@mcp.tool()
+@tool()
 async def upload_proofed_manuscript(
     auth_token: str,
     task_id: str,
@@ -605,9 +765,9 @@ async def upload_proofed_manuscript(
     Returns:
         Upload result
     """
-    return await editor.upload_proofed_manuscript(task_id, file_data, file_name, proofing_notes, content_type, auth_token)
+    return await editor.upload_proofed_file(task_id, file_data, file_name, proofing_notes, auth_token, content_type)
 
-@mcp.tool()
+@tool()
 async def publish_article(
     auth_token: str,
     task_id: str,
@@ -632,7 +792,7 @@ async def publish_article(
     """
     return await editor.publish_article(task_id, doi, volume, issue, page_numbers, auth_token)
 
-@mcp.tool()
+@tool()
 async def get_published_articles(auth_token: str) -> dict:
     """
     Get list of published articles.
@@ -645,7 +805,7 @@ async def get_published_articles(auth_token: str) -> dict:
     """
     return await editor.get_published_articles(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_editorial_statistics(auth_token: str) -> dict:
     """
     Get editorial statistics and performance metrics.
@@ -658,7 +818,7 @@ async def get_editorial_statistics(auth_token: str) -> dict:
     """
     return await editor.get_editorial_statistics(auth_token)
 
-@mcp.tool()
+@tool()
 async def get_editorial_guidelines() -> dict:
     """
     Get editorial guidelines and best practices.
@@ -697,6 +857,11 @@ A peer-reviewed open access journal focused on advancing scientific knowledge an
 - Website: https://cyansciencejournal.org
 """
 
+@mcp.resource("resource://server/load")
+def get_server_load() -> str:
+    """Concurrency limits, queue lengths and shed calls, overall and per tool."""
+    return json.dumps(concurrency.get_stats(), indent=2)
+
 @mcp.resource("resource://submission/guidelines")
 def get_submission_guidelines() -> str:
     """Provides manuscript submission guidelines."""
@@ -851,16 +1016,22 @@ This resource template will fetch published article details.
 # SERVER LIFECYCLE
 # =============================================================================
 
-async def startup():
-    """Server startup tasks."""
+async def startup() -> int:
+    """Server startup tasks; returns the number of registered tools."""
     print("🚀 Starting Cyan Science Journal MCP Server...")
     print("🔗 Connecting to Convex backend...")
     # Additional startup tasks can be added here
+    return len(await mcp.get_tools())
 
 async def shutdown():
     """Server shutdown tasks."""
     print("🛑 Shutting down MCP Server...")
+    await cleanup_upload_manager()
+    await cleanup_auth_manager()
+    await cleanup_table_mirror()
+    await cleanup_rate_limits()
     await cleanup_convex_client()
+    shutdown_backend_executor()
     print("✅ Cleanup complete")
 
 # =============================================================================
@@ -880,7 +1051,7 @@ if __name__ == "__main__":
     signal.signal(signal.SIGTERM, signal_handler)
 
     # Run startup tasks
-    asyncio.run(startup())
+    tool_count = asyncio.run(startup())
 
     try:
         host = os.getenv("MCP_SERVER_HOST", "127.0.0.1")
@@ -889,7 +1060,7 @@ if __name__ == "__main__":
         
         print(f"🚀 Starting Cyan Science Journal MCP Server")
         print(f"🌐 Streamable HTTP transport: http://{host}:{port}{path}")
-        print(f"🔧 Available tools: 47 (auth, author, reviewer, editor)")
+        print(f"🔧 Available tools: {tool_count} (auth, author, reviewer, editor)")
         
         # Use FastMCP's built-in Streamable HTTP transport
         mcp.run(
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Generate utils/convex_api.py from the Convex backend sources.
+
+Reads the module list from convex/_generated/api.d.ts, the public query,
+mutation and action definitions (with their `args` validators) from each
+module, and the table definitions from convex/schema.ts. Emits:
+
+- a TypedDict per table document,
+- a precompiled argument encoder per function, and
+- ConvexApi, a mixin with one typed async method per function.
+
+Usage:
+    python scripts/generate_convex_api.py [--check]
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MCP_ROOT = Path(__file__).resolve().parent.parent
+CONVEX_DIR = MCP_ROOT.parent / "convex"
+OUTPUT = MCP_ROOT / "utils" / "convex_api.py"
+
+
+# --- Validator parsing -----------------------------------------------------
+
+class Validator:
+    """Parsed `v.*(...)` validator."""
+
+    def __init__(self, kind: str, args: Optional[list] = None, fields: Optional[Dict[str, "Validator"]] = None):
+        self.kind = kind
+        self.args = args or []
+        self.fields = fields or {}
+
+    @property
+    def optional(self) -> bool:
+        return self.kind == "optional"
+
+    def inner(self) -> "Validator":
+        return self.args[0] if self.optional else self
+
+
+TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<comment>//[^\n]*|/\*.*?\*/)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<name>[A-Za-z_$][\w$]*)
+      | (?P<punct>\.\.\.|[{}()\[\],:.])
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def tokenize(source: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        if source[pos:].strip() == "":
+            break
+        match = TOKEN_RE.match(source, pos)
+        if not match:
+            raise SyntaxError(f"Cannot tokenize near: {source[pos:pos + 40]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind != "comment":
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class Parser:
+    def __init__(self, source: str):
+        self.tokens = tokenize(source)
+        self.pos = 0
+
+    def peek(self) -> Tuple[str, str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ("eof", "")
+
+    def take(self, value: Optional[str] = None) -> str:
+        kind, text = self.peek()
+        if value is not None and text != value:
+            raise SyntaxError(f"Expected {value!r}, got {text!r}")
+        self.pos += 1
+        return text
+
+    def object(self) -> Dict[str, Validator]:
+        """Parse `{ key: validator, ... }`."""
+        fields = {}
+        self.take("{")
+        while self.peek()[1] != "}":
+            key = self.take()
+            if key[0] in "\"'":
+                key = key[1:-1]
+            self.take(":")
+            fields[key] = self.validator()
+            if self.peek()[1] == ",":
+                self.take(",")
+        self.take("}")
+        return fields
+
+    def validator(self) -> Validator:
+        """Parse `v.kind(...)`."""
+        self.take("v")
+        self.take(".")
+        kind = self.take()
+        self.take("(")
+        args: list = []
+        fields: Dict[str, Validator] = {}
+        while self.peek()[1] != ")":
+            token_kind, text = self.peek()
+            if text == "{":
+                fields = self.object()
+            elif text == "v":
+                args.append(self.validator())
+            elif token_kind == "string":
+                args.append(self.take()[1:-1])
+            elif token_kind == "number":
+                args.append(float(self.take()))
+            elif text in ("true", "false"):
+                args.append(self.take() == "true")
+            else:
+                raise SyntaxError(f"Unexpected {text!r} in v.{kind}()")
+            if self.peek()[1] == ",":
+                self.take(",")
+        self.take(")")
+        return Validator(kind, args, fields)
+
+
+def balanced(source: str, start: int) -> str:
+    """Return the bracketed text starting at source[start] ('{' or '(')."""
+    pairs = {"{": "}", "(": ")"}
+    opener = source[start]
+    closer = pairs[opener]
+    depth = 0
+    i = start
+    quote = None
+    while i < len(source):
+        ch = source[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'`":
+            quote = ch
+        elif source.startswith("//", i):
+            i = source.index("\n", i)
+            continue
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return source[start:i + 1]
+        i += 1
+    raise SyntaxError("Unbalanced brackets")
+
+
+FUNCTION_RE = re.compile(r"^export const (\w+) = (query|mutation|action)\(\{", re.MULTILINE)
+ARGS_RE = re.compile(r"^\s+args:\s*\{", re.MULTILINE)
+TABLE_RE = re.compile(r"^\s{2}(\w+): defineTable\(\{", re.MULTILINE)
+
+
+def parse_functions(module: str, source: str) -> List[Tuple[str, str, Dict[str, Validator]]]:
+    """(function name, kind, args) for each public function in a module."""
+    functions = []
+    for match in FUNCTION_RE.finditer(source):
+        body = balanced(source, match.end() - 1)
+        args: Dict[str, Validator] = {}
+        args_match = ARGS_RE.search(body)
+        if args_match:
+            args = Parser(balanced(body, args_match.end() - 1)).object()
+        functions.append((f"{module}:{match.group(1)}", match.group(2), args))
+    return functions
+
+
+def parse_tables(source: str) -> Dict[str, Dict[str, Validator]]:
+    tables = {}
+    for match in TABLE_RE.finditer(source):
+        tables[match.group(1)] = Parser(balanced(source, match.end() - 1)).object()
+    return tables
+
+
+def parse_modules(api_source: str) -> List[str]:
+    return re.findall(r'import type \* as (\w+) from "\.\./\w+\.js";', api_source)
+
+
+# --- Code generation -------------------------------------------------------
+
+def q(value) -> str:
+    """Python literal for a string/number/bool, double-quoted like the rest of the repo."""
+    if isinstance(value, str):
+        return json.dumps(value)
+    return repr(value)
+
+
+def q_tuple(values) -> str:
+    return "(" + ", ".join(q(v) for v in values) + ("," if len(values) == 1 else "") + ")"
+
+
+def snake(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+def py_type(validator: Validator) -> str:
+    kind = validator.kind
+    if kind == "optional":
+        return f"Optional[{py_type(validator.args[0])}]"
+    if kind in ("string", "id"):
+        return "str"
+    if kind in ("number", "float64"):
+        return "float"
+    if kind in ("int64", "bigint"):
+        return "int"
+    if kind == "boolean":
+        return "bool"
+    if kind == "null":
+        return "None"
+    if kind == "literal":
+        return f"Literal[{q(validator.args[0])}]"
+    if kind == "array":
+        return f"List[{py_type(validator.args[0])}]"
+    if kind == "union":
+        if all(a.kind == "literal" for a in validator.args):
+            return "Literal[" + ", ".join(q(a.args[0]) for a in validator.args) + "]"
+        return "Union[" + ", ".join(py_type(a) for a in validator.args) + "]"
+    return "Any"
+
+
+def literal_values(validator: Validator) -> Optional[Tuple]:
+    if validator.kind == "literal":
+        return (validator.args[0],)
+    if validator.kind == "union" and all(a.kind == "literal" for a in validator.args):
+        return tuple(a.args[0] for a in validator.args)
+    return None
+
+
+def encode_expr(validator: Validator, expr: str) -> str:
+    """Python expression converting `expr` to Convex JSON for a validator."""
+    kind = validator.kind
+    if kind in ("number", "float64"):
+        # Convex numbers are float64; a Python int would encode as int64
+        return f"float({expr})"
+    if kind in ("string", "id", "boolean", "null") or literal_values(validator):
+        return expr
+    if kind == "array":
+        item = encode_expr(validator.args[0], "item")
+        return f"list({expr})" if item == "item" else f"[{item} for item in {expr}]"
+    return f"convex_to_json({expr})"
+
+
+def generate(modules: List[str], functions, tables) -> str:
+    out: List[str] = []
+    w = out.append
+    w('"""')
+    w("Typed Convex API for MCP server.")
+    w("Generated by scripts/generate_convex_api.py from convex/_generated/api.d.ts,")
+    w("convex/*.ts and convex/schema.ts. Do not edit by hand.")
+    w('"""')
+    w("")
+    w("from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, TypedDict, Union")
+    w("")
+    w("from convex.values import convex_to_json")
+    w("")
+    w("from .convex_codec import EncodedArgs")
+    w("")
+    w("if TYPE_CHECKING:")
+    w("    from .convex_client import ConvexResponse")
+    w("")
+    w(f"MODULES = {q_tuple(modules)}")
+    w("")
+    w("")
+    w("def _check(name: str, value: Any, allowed: tuple) -> Any:")
+    w("    if value not in allowed:")
+    w("        raise ValueError(f\"{name} must be one of {', '.join(map(str, allowed))}, got {value!r}\")")
+    w("    return value")
+    w("")
+    w("")
+    w("# --- Documents (convex/schema.ts) ---")
+    for table, fields in tables.items():
+        w("")
+        w("")
+        class_name = table[0].upper() + table[1:] + "Doc"
+        w(f"class {class_name}(TypedDict, total=False):")
+        w("    _id: str")
+        w("    _creationTime: float")
+        for field, validator in fields.items():
+            w(f"    {field}: {py_type(validator.inner())}")
+    w("")
+    w("")
+    w("# --- Argument encoders ---")
+    for name, kind, args in functions:
+        module, fn = name.split(":")
+        ident = f"{module}_{snake(fn)}"
+        params = [f"{snake(a)}: {py_type(v)}" for a, v in args.items() if not v.optional]
+        params += [f"{snake(a)}: {py_type(v)} = None" for a, v in args.items() if v.optional]
+        w("")
+        w("")
+        w(f"def encode_{ident}({', '.join(params)}) -> EncodedArgs:")
+        required = [(a, v) for a, v in args.items() if not v.optional]
+        optional = [(a, v) for a, v in args.items() if v.optional]
+        for a, v in args.items():
+            allowed = literal_values(v.inner())
+            if allowed:
+                target = snake(a)
+                if v.optional:
+                    w(f"    if {target} is not None:")
+                    w(f"        _check({q(a)}, {target}, {q_tuple(allowed)})")
+                else:
+                    w(f"    _check({q(a)}, {target}, {q_tuple(allowed)})")
+        if required:
+            w("    args = EncodedArgs({")
+            for a, v in required:
+                w(f"        {q(a)}: {encode_expr(v, snake(a))},")
+            w("    })")
+        else:
+            w("    args = EncodedArgs()")
+        for a, v in optional:
+            w(f"    if {snake(a)} is not None:")
+            w(f"        args[{q(a)}] = {encode_expr(v.inner(), snake(a))}")
+        w("    return args")
+    w("")
+    w("")
+    w("class ConvexApi:")
+    w('    """')
+    w("    One typed method per public Convex function.")
+    w("")
+    w("    Mixed into ConvexClient, which provides `_call(kind, name, args,")
+    w("    auth_token)` and `_invalid_arguments(name, error)`.")
+    w('    """')
+    for name, kind, args in functions:
+        module, fn = name.split(":")
+        ident = f"{module}_{snake(fn)}"
+        params = [f"{snake(a)}: {py_type(v)}" for a, v in args.items() if not v.optional]
+        params += [f"{snake(a)}: {py_type(v)} = None" for a, v in args.items() if v.optional]
+        call_args = ", ".join(f"{snake(a)}={snake(a)}" for a in args)
+        w("")
+        w(f"    async def {ident}(")
+        w("        self,")
+        for p in params:
+            w(f"        {p},")
+        w("        auth_token: Optional[str] = None,")
+        w("    ) -> \"ConvexResponse\":")
+        w(f'        """{name} ({kind})"""')
+        w("        try:")
+        w(f"            args = encode_{ident}({call_args})")
+        w("        except (TypeError, ValueError) as e:")
+        w(f"            return self._invalid_arguments({q(name)}, e)")
+        w(f"        return await self._call({q(kind)}, {q(name)}, args, auth_token)")
+    w("")
+    w("")
+    w("FUNCTIONS: Dict[str, str] = {")
+    for name, kind, _ in functions:
+        w(f"    {q(name)}: {q(kind)},")
+    w("}")
+    w("")
+    return "\n".join(out)
+
+
+def build() -> str:
+    modules = parse_modules((CONVEX_DIR / "_generated" / "api.d.ts").read_text())
+    functions = []
+    for module in modules:
+        functions.extend(parse_functions(module, (CONVEX_DIR / f"{module}.ts").read_text()))
+    tables = parse_tables((CONVEX_DIR / "schema.ts").read_text())
+    return generate(modules, functions, tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--check", action="store_true", help="fail if the generated file is out of date")
+    options = parser.parse_args()
+
+    code = build()
+    if options.check:
+        if not OUTPUT.exists() or OUTPUT.read_text() != code:
+            print(f"{OUTPUT} is out of date; run scripts/generate_convex_api.py")
+            sys.exit(1)
+        print(f"{OUTPUT} is up to date")
+        return
+    OUTPUT.write_text(code)
+    print(f"Wrote {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for adaptive concurrency limits and load shedding.
+Offers tool calls faster than a simulated backend can serve them, each with
+a client-side deadline, and compares running every call with running them
+through ConcurrencyLimitMiddleware. Runs offline.
+
+Usage:
+    python test_concurrency_performance.py [overload_factor] [seconds]
+"""
+
+import sys
+import time
+import asyncio
+import statistics
+
+from mcp import McpError
+from mcp.types import CallToolRequestParams
+from fastmcp.server.middleware import MiddlewareContext
+
+from utils.concurrency import ConcurrencyLimitMiddleware
+
+CAPACITY = 8          # calls the backend serves at once
+SERVICE_MS = 20       # time per call once it is being served
+DEADLINE_MS = 500     # client gives up after this
+OVERLOAD = 2.0
+SECONDS = 3.0
+
+
+class Backend:
+    """Serves CAPACITY calls at a time; the rest queue inside it."""
+
+    def __init__(self):
+        self.slots = asyncio.Semaphore(CAPACITY)
+
+    async def call(self, context):
+        async with self.slots:
+            await asyncio.sleep(SERVICE_MS / 1000)
+        return "ok"
+
+
+async def offer_load(run_call, rate: float, seconds: float) -> dict:
+    """Start calls at a fixed rate and sort each into served, late or shed."""
+    outcome = {"served": [], "late": 0, "shed": 0}
+
+    async def one():
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(run_call(), DEADLINE_MS / 1000)
+            outcome["served"].append((time.perf_counter() - start) * 1000)
+        except asyncio.TimeoutError:
+            outcome["late"] += 1
+        except McpError:
+            outcome["shed"] += 1
+
+    tasks = []
+    begin = time.perf_counter()
+    for i in range(int(rate * seconds)):
+        delay = begin + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one()))
+    await asyncio.gather(*tasks)
+    return outcome
+
+
+def report(name: str, outcome: dict, seconds: float):
+    served = sorted(outcome["served"])
+    p50 = statistics.median(served) if served else 0.0
+    p99 = served[int(len(served) * 0.99) - 1] if served else 0.0
+    print(f"{name:>12} {len(served) / seconds:>9.0f} {outcome['late']:>7} {outcome['shed']:>7} {p50:>9.0f} {p99:>9.0f}")
+
+
+async def run_concurrency_benchmark(overload: float, seconds: float):
+    capacity_rate = CAPACITY / (SERVICE_MS / 1000)
+    rate = capacity_rate * overload
+    print("🧪 Load Shedding Benchmark")
+    print(f"📊 backend serves {capacity_rate:.0f} calls/s, offered {rate:.0f} calls/s for {seconds:g}s, {DEADLINE_MS}ms deadline")
+    print("=" * 60)
+    print(f"{'':>12} {'goodput/s':>9} {'late':>7} {'shed':>7} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+
+    backend = Backend()
+    context = MiddlewareContext(message=CallToolRequestParams(name="get_manuscript", arguments={}))
+    report("unlimited", await offer_load(lambda: backend.call(context), rate, seconds), seconds)
+
+    backend = Backend()
+    middleware = ConcurrencyLimitMiddleware(queue_timeout=0.1)
+    report("adaptive", await offer_load(lambda: middleware.on_call_tool(context, backend.call), rate, seconds), seconds)
+
+    stats = middleware.get_stats()["tools"]["get_manuscript"]
+    print(f"\n📈 get_manuscript limit settled at {stats['limit']} (started at {middleware.initial}), "
+          f"{stats['queued']} calls queued, {stats['shed'] + stats['queue_timeouts']} shed")
+
+
+if __name__ == "__main__":
+    overload = float(sys.argv[1]) if len(sys.argv) > 1 else OVERLOAD
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else SECONDS
+    asyncio.run(run_concurrency_benchmark(overload, seconds))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test that tool calls running past their deadline shrink the concurrency limit.
+Calls a tool that outlives its with_deadline budget through a FastMCP
+server with ConcurrencyLimitMiddleware, and checks the tool's limit drops
+while a tool that finishes in time leaves it alone. Runs offline.
+"""
+
+import asyncio
+
+from fastmcp import Client, FastMCP
+
+from utils.concurrency import ConcurrencyLimitMiddleware
+from utils.deadline import with_deadline
+
+EXPIRED_CALLS = 5
+
+
+def make_server():
+    mcp = FastMCP("deadline-test")
+    middleware = ConcurrencyLimitMiddleware(initial=16, min_limit=2)
+    mcp.add_middleware(middleware)
+
+    @mcp.tool()
+    @with_deadline(0.05)
+    async def slow_tool() -> dict:
+        await asyncio.sleep(1)
+        return {"success": True}
+
+    @mcp.tool()
+    @with_deadline(1)
+    async def fast_tool() -> dict:
+        return {"success": True}
+
+    return mcp, middleware
+
+
+async def test_expired_tool_shrinks_limit():
+    """with_deadline returns an error result on expiry; the limiter must still back off."""
+    print(f"1. Calling a tool that expires {EXPIRED_CALLS} times...")
+    mcp, middleware = make_server()
+    async with Client(mcp) as client:
+        for _ in range(EXPIRED_CALLS):
+            result = await client.call_tool("slow_tool", {})
+            assert result.data["success"] is False, result.data
+        await client.call_tool("fast_tool", {})
+    stats = middleware.get_stats()["tools"]
+    assert stats["slow_tool"]["limit"] < middleware.initial, f"slow_tool limit stayed at {stats['slow_tool']['limit']}"
+    assert stats["fast_tool"]["limit"] >= middleware.initial, f"fast_tool limit fell to {stats['fast_tool']['limit']}"
+    print(f"   ✅ slow_tool limit {middleware.initial} -> {stats['slow_tool']['limit']}, "
+          f"fast_tool stays at {stats['fast_tool']['limit']}")
+
+
+async def run_deadline_tests():
+    print("🧪 Deadline Backoff Tests")
+    print("=" * 60)
+    await test_expired_tool_shrinks_limit()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_deadline_tests())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for upload deduplication.
+Replays agents that retry submit_manuscript after timeouts with the same
+PDF against a fake Convex whose storage accepts uploads at a fixed
+bandwidth, and reports time, bytes sent to storage and bytes saved by the
+content index. Runs offline.
+
+Usage:
+    python test_dedup_performance.py [size_mb] [retries]
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import asyncio
+
+import httpx
+
+from tools import author
+from utils.auth_manager import UserSession
+from utils.content_index import get_content_index
+from utils.convex_client import get_convex_client
+
+SIZE_MB = 8
+RETRIES = 3           # extra attempts per submission
+SUBMISSIONS = 5
+BANDWIDTH_MB_S = 50   # storage upload speed
+UPLOAD_URL = "http://convex.invalid/api/storage/upload?token=bench"
+
+
+class FakeConvex(httpx.AsyncBaseTransport):
+    """Storage that takes time proportional to the bytes uploaded; mutations answer at once."""
+
+    def __init__(self):
+        self.uploads = 0
+        self.uploaded_bytes = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/storage/upload":
+            size = 0
+            async for chunk in request.stream:
+                size += len(chunk)
+            await asyncio.sleep(size / (BANDWIDTH_MB_S * 2**20))
+            self.uploads += 1
+            self.uploaded_bytes += size
+            return httpx.Response(200, json={"storageId": f"storage{self.uploads}"})
+        path = json.loads(await request.aread())["path"]
+        value = UPLOAD_URL if path == "manuscripts:generateUploadUrl" else f"manuscript-{time.perf_counter_ns()}"
+        return httpx.Response(200, json={"status": "success", "value": value})
+
+
+async def submit_with_retries(submit, session: UserSession, pdf: str, retries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(1 + retries):
+        result = await submit(
+            "Title", "Abstract", ["k"], "en", pdf, "paper.pdf", "application/pdf", "token", session=session
+        )
+        assert result["success"]
+    return time.perf_counter() - start
+
+
+async def run_dedup_benchmark(size_mb: float, retries: int):
+    print("🧪 Upload Deduplication Benchmark")
+    print(f"📊 {SUBMISSIONS} submissions of {size_mb:g}MB, each retried {retries}x, storage at {BANDWIDTH_MB_S}MB/s")
+    print("=" * 64)
+
+    fake = FakeConvex()
+    client = get_convex_client()
+    client.async_client._client = httpx.AsyncClient(base_url=client.base_url, transport=fake)
+    # Call past the auth decorator with a ready-made session
+    submit = author.submit_manuscript.__wrapped__
+    session = UserSession(
+        user_id="author1", email="a@example.org", name="A", roles=["author"],
+        auth_token="token", expires_at=time.time() + 3600,
+    )
+    pdfs = [base64.b64encode(b"%PDF-1.7\n" + os.urandom(int(size_mb * 2**20) - 16) + b"\n%%EOF\n").decode() for _ in range(SUBMISSIONS)]
+
+    index = get_content_index()
+    for label, ttl in (("no dedup", 0.0), ("dedup", 3600.0)):
+        index.ttl = ttl
+        index._entries.clear()
+        fake.uploads = fake.uploaded_bytes = 0
+        before_saved = index.bytes_saved
+        elapsed = sum([await submit_with_retries(submit, session, pdf, retries) for pdf in pdfs])
+        print(f"{label:>10}  {elapsed:6.2f}s  {fake.uploads:3d} uploads  "
+              f"{fake.uploaded_bytes / 2**20:7.1f}MB sent  {(index.bytes_saved - before_saved) / 2**20:7.1f}MB saved")
+
+    print(f"\n📈 {index.get_stats()}")
+    await client.close()
+
+
+if __name__ == "__main__":
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else SIZE_MB
+    retries = int(sys.argv[2]) if len(sys.argv) > 2 else RETRIES
+    asyncio.run(run_dedup_benchmark(size_mb, retries))
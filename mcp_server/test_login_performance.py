@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark for login throughput.
+Simulates a fleet restart: every agent logs in at once against a backend
+with fixed per-call latency. Compares the two-round-trip login (signIn,
+then loggedInUser) with the single-trip path that takes the user id from
+the token and the profile from cache. Runs offline.
+
+Usage:
+    python test_login_performance.py [agents] [latency_ms]
+"""
+
+import sys
+import json
+import time
+import base64
+import asyncio
+
+import httpx
+
+from utils.auth_manager import AuthManager
+from utils.convex_client import ConvexClient
+
+AGENTS = 500
+LATENCY_MS = 40
+CONCURRENCY = 100
+
+
+def fake_token(user_id: str, attempt: int) -> str:
+    """A JWT-shaped token with a Convex Auth subject; the signature is not checked."""
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+    claims = {"sub": f"{user_id}|session{attempt}", "aud": "convex", "exp": time.time() + 3600}
+    return f"{encode({'alg': 'RS256'})}.{encode(claims)}.signature"
+
+
+class FakeBackend:
+    """Answers auth:signIn and auth:loggedInUser after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.attempt = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        body = json.loads(request.content)
+        if body["path"] == "auth:signIn":
+            self.attempt += 1
+            email = body["args"]["params"]["email"]
+            value = {"tokens": {"token": fake_token(email.split("@")[0], self.attempt), "refreshToken": "r"}}
+        else:
+            token = request.headers["Authorization"].split(" ", 1)[1]
+            subject = json.loads(base64.urlsafe_b64decode(token.split(".")[1] + "=="))["sub"]
+            user_id = subject.split("|")[0]
+            value = {
+                "_id": user_id, "email": f"{user_id}@example.org", "name": user_id,
+                "userData": {"roles": ["author", "reviewer"]},
+            }
+        return httpx.Response(200, json={"status": "success", "value": value})
+
+
+async def login_storm(manager: AuthManager, agents: int) -> float:
+    """Log every agent in, CONCURRENCY at a time; returns logins per second."""
+    limit = asyncio.Semaphore(CONCURRENCY)
+
+    async def login(i: int):
+        async with limit:
+            session = await manager.authenticate_user(f"agent{i}@example.org", "password")
+            assert session is not None and session.user_id == f"agent{i}"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(i) for i in range(agents)))
+    return agents / (time.perf_counter() - start)
+
+
+async def run_login_benchmark(agents: int, latency_ms: float):
+    print("🧪 Login Throughput Benchmark")
+    print(f"📊 {agents} agents, {CONCURRENCY} concurrent logins, {latency_ms:g}ms per backend call")
+    print("=" * 60)
+
+    backend = FakeBackend(latency_ms / 1000)
+    client = ConvexClient(base_url="http://convex.invalid")
+    client.async_client._client = httpx.AsyncClient(
+        base_url="http://convex.invalid", transport=httpx.MockTransport(backend.handle)
+    )
+    manager = AuthManager()
+    manager.convex_client = client
+
+    # Before: nothing cached, so each login also runs loggedInUser
+    manager.user_cache_ttl = 0
+    backend.calls = 0
+    before = await login_storm(manager, agents)
+    print(f"   two round trips   {before:8.1f} logins/s   {backend.calls / agents:.1f} calls/login")
+
+    # After: the next storm, with the profiles the first one fetched
+    manager.user_cache_ttl = 300
+    backend.calls = 0
+    after = await login_storm(manager, agents)
+    print(f"   single trip       {after:8.1f} logins/s   {backend.calls / agents:.1f} calls/login")
+    print(f"\n📈 {after / before:.1f}x login throughput")
+    stats = manager.get_stats()
+    print(f"   {stats['logins_single_trip']} single-trip, {stats['logins_two_trips']} two-trip logins")
+
+    await manager.stop_sweeper()
+    await client.close()
+
+
+if __name__ == "__main__":
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else AGENTS
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else LATENCY_MS
+    asyncio.run(run_login_benchmark(agents, latency_ms))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the rate limiter.
+Compares the GCRA limiter with the per-client timestamp deques it
+replaced: memory and per-call cost with up to 1M distinct clients, and how
+idle clients are evicted. Runs offline.
+
+Usage:
+    python test_rate_limit_performance.py [clients]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from typing import Callable
+
+from utils.security import RateLimiter
+
+CLIENTS = 1_000_000
+REQUESTS_PER_CLIENT = 5
+MAX_REQUESTS = 100
+WINDOW = 60
+
+
+class DequeRateLimiter:
+    """The sliding-window limiter RateLimiter used before GCRA."""
+
+    def __init__(self, max_requests: int, window_seconds: int):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.requests = defaultdict(deque)
+
+    def is_allowed(self, client_id: str) -> bool:
+        now = time.time()
+        client_requests = self.requests[client_id]
+        while client_requests and client_requests[0] < now - self.window_seconds:
+            client_requests.popleft()
+        if len(client_requests) >= self.max_requests:
+            return False
+        client_requests.append(now)
+        return True
+
+
+def fill(limiter, clients: int, keys) -> tuple:
+    """Bytes per client and ns per call after REQUESTS_PER_CLIENT calls from each client."""
+    tracemalloc.start()
+    for key in keys:
+        limiter.is_allowed(key)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS_PER_CLIENT - 1):
+        for key in keys:
+            limiter.is_allowed(key)
+    per_call = (time.perf_counter() - start) / (clients * (REQUESTS_PER_CLIENT - 1)) * 1e9
+    return size / clients, per_call
+
+
+def run_memory_benchmark(clients: int):
+    print(f"\n💾 {clients:,} distinct clients, {REQUESTS_PER_CLIENT} requests each")
+    keys = [f"token:{i:032x}" for i in range(clients)]
+    for label, factory in (
+        ("deque window", lambda: DequeRateLimiter(MAX_REQUESTS, WINDOW)),
+        ("GCRA", lambda: RateLimiter(MAX_REQUESTS, WINDOW, max_keys=clients)),
+    ):
+        limiter = factory()
+        per_key, per_call = fill(limiter, clients, keys)
+        print(f"   {label:<13} {per_key:6.0f} B/client   {per_call:6.0f} ns/call")
+        del limiter
+        gc.collect()
+
+
+def run_eviction_benchmark(clients: int):
+    print("\n🧹 Idle-client eviction (window 0.2s)")
+    limiter = RateLimiter(MAX_REQUESTS, 0.2, max_keys=clients)
+    for i in range(clients):
+        limiter.is_allowed(f"burst{i}")
+    print(f"   after a burst from {clients:,} clients: {limiter.get_stats()['keys']:,} keys")
+    # Two windows of traffic from a small set of clients retire both generations
+    for _ in range(2):
+        time.sleep(0.25)
+        for i in range(1000):
+            limiter.is_allowed(f"steady{i}")
+    print(f"   two windows later, 1,000 active clients: {limiter.get_stats()['keys']:,} keys ({limiter.evicted:,} evicted)")
+
+    capped = RateLimiter(MAX_REQUESTS, WINDOW, max_keys=10_000)
+    for i in range(clients):
+        capped.is_allowed(f"client{i}")
+    print(f"   with max_keys=10,000 and {clients:,} clients in one window: {capped.get_stats()['keys']:,} keys")
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else CLIENTS
+    print("🧪 Rate Limiter Benchmark")
+    print("=" * 60)
+    run_memory_benchmark(clients)
+    run_eviction_benchmark(clients)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test that a command cancelled mid-roundtrip does not desync a shared RESP connection.
+Cancels a session lookup and a rate limit lease while their replies are in
+flight, then checks the next command gets its own reply. Runs offline
+against the in-process stand-in server.
+"""
+
+import asyncio
+
+from utils.resp import LocalRespServer, RespClient
+from utils.rate_lease import RespLeaseBackend, install_lease_script
+
+
+async def cancel_in_flight(coro):
+    """Start a command, let it write its request, and cancel it while it waits for the reply."""
+    task = asyncio.ensure_future(coro)
+    await asyncio.sleep(0)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def test_cancelled_get():
+    """A cancelled GET must not hand its reply to the next caller."""
+    print("1. Cancelling a session lookup mid-roundtrip...")
+    server = await LocalRespServer().start()
+    client = RespClient(server.url)
+    try:
+        await client.execute("SET", "sess:alice", "alice-record")
+        await client.execute("SET", "sess:bob", "bob-record")
+        await cancel_in_flight(client.execute("GET", "sess:alice"))
+        reply = await client.execute("GET", "sess:bob")
+        assert reply == b"bob-record", f"GET sess:bob returned {reply!r}"
+        print("   ✅ next lookup got its own record")
+    finally:
+        await client.close()
+        await server.stop()
+
+
+async def test_cancelled_lease():
+    """A cancelled lease must not hand its {granted, retry} reply to the next key."""
+    print("2. Cancelling a rate limit lease mid-roundtrip...")
+    server = await LocalRespServer().start()
+    install_lease_script(server)
+    backend = RespLeaseBackend(server.url, prefix="test:")
+    try:
+        # Use up "busy"; a lease on it is refused with a retry time
+        granted, _ = await backend.lease("busy", 1.0, 10.0, 10)
+        assert granted == 10
+        await cancel_in_flight(backend.lease("busy", 1.0, 10.0, 10))
+        granted, retry = await backend.lease("idle", 1.0, 10.0, 5)
+        assert (granted, retry) == (5, 0.0), f"lease on idle returned {(granted, retry)}"
+        granted, retry = await backend.lease("busy", 1.0, 10.0, 1)
+        assert granted == 0 and retry > 0, f"lease on busy returned {(granted, retry)}"
+        print("   ✅ later leases got their own replies")
+    finally:
+        await backend.close()
+        await server.stop()
+
+
+async def run_cancellation_tests():
+    print("🧪 RESP Cancellation Tests")
+    print("=" * 60)
+    await test_cancelled_get()
+    await test_cancelled_lease()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_cancellation_tests())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark for resumable uploads.
+Sends a PDF in chunks over a flaky agent connection, where some appends are
+lost on the way in or their replies are lost on the way out, and storage
+refuses the first upload at commit. Compares restarting from zero after a
+failure (uploads streamed straight to storage) with resuming from the
+checkpointed offset (uploads spooled to disk), and reports base64
+characters sent by the client and bytes sent to storage. Runs offline.
+
+Usage:
+    python test_resumable_upload_performance.py [size_mb] [drop_rate]
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import random
+import asyncio
+import tempfile
+
+import httpx
+
+from utils.convex_client import get_convex_client
+from utils.upload_session import UploadOffsetError, UploadSessionManager
+
+SIZE_MB = 20
+DROP_RATE = 0.05      # chance an append is lost in either direction
+STORAGE_FAILURES = 1  # upload POSTs refused before storage accepts one
+TRIALS = 5
+UPLOAD_URL = "http://convex.invalid/api/storage/upload?token=bench"
+
+
+class FlakyStorage(httpx.AsyncBaseTransport):
+    """Fake Convex whose storage refuses the first uploads after reading them."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.uploaded_bytes = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/storage/upload":
+            async for chunk in request.stream:
+                self.uploaded_bytes += len(chunk)
+            if self.failures:
+                self.failures -= 1
+                return httpx.Response(503)
+            return httpx.Response(200, json={"storageId": "storage1"})
+        await request.aread()
+        return httpx.Response(200, json={"status": "success", "value": UPLOAD_URL})
+
+
+class FlakyLink:
+    """Calls to the server that are lost before arriving or whose reply is lost."""
+
+    def __init__(self, drop_rate: float, seed: int = 0):
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.sent_chars = 0
+        self.drops = 0
+
+    async def call(self, func, *args, size: int = 0):
+        self.sent_chars += size
+        if self.random.random() < self.drop_rate / 2:
+            self.drops += 1
+            raise ConnectionError("request lost")
+        result = await func(*args)
+        if self.random.random() < self.drop_rate / 2:
+            self.drops += 1
+            raise ConnectionError("reply lost")
+        return result
+
+
+async def upload_restarting(manager: UploadSessionManager, link: FlakyLink, text: str, size: int) -> str:
+    """Any failure loses the upload; begin again from the first byte."""
+    step = manager.max_chunk_size
+    while True:
+        session = None
+        try:
+            session = await link.call(manager.begin, "bench", "paper.pdf", size, "application/pdf", "token")
+            for offset in range(0, len(text), step):
+                chunk = text[offset:offset + step]
+                await link.call(manager.append, session.upload_id, "bench", chunk, size=len(chunk))
+            return await link.call(manager.commit, session.upload_id, "bench", "token")
+        except (ConnectionError, ValueError):
+            if session is not None:
+                await manager.abort(session.upload_id, "bench")
+
+
+async def upload_resuming(manager: UploadSessionManager, link: FlakyLink, text: str, size: int) -> str:
+    """After a failure, ask for the offset and continue from there."""
+    step = manager.max_chunk_size
+    while True:
+        try:
+            session = await link.call(manager.begin, "bench", "paper.pdf", size, "application/pdf", "token")
+            break
+        except ConnectionError:
+            pass
+    offset = 0
+    while True:
+        try:
+            while offset < len(text):
+                chunk = text[offset:offset + step]
+                upload = await link.call(manager.append, session.upload_id, "bench", chunk, offset, size=len(chunk))
+                offset = upload.offset
+            return await link.call(manager.commit, session.upload_id, "bench", "token")
+        except UploadOffsetError as e:
+            offset = e.offset
+        except (ConnectionError, ValueError):
+            try:
+                offset = (await link.call(manager.status, session.upload_id, "bench"))["offset"]
+            except ConnectionError:
+                pass
+
+
+async def run_resumable_upload_benchmark(size_mb: float, drop_rate: float):
+    print("🧪 Resumable Upload Benchmark")
+    print(f"📊 {TRIALS} uploads of {size_mb:g}MB, {drop_rate:.0%} of calls dropped, "
+          f"storage refuses {STORAGE_FAILURES} upload(s) each time")
+    print("=" * 72)
+
+    client = get_convex_client()
+    file = b"%PDF-1.7\n" + os.urandom(int(size_mb * 2**20) - 16) + b"\n%%EOF\n"
+    text = base64.b64encode(file).decode()
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        for label, spool, upload in (("restart", "", upload_restarting), ("resume", spool_dir, upload_resuming)):
+            manager = UploadSessionManager(spool_dir=spool)
+            elapsed = drops = sent_chars = uploaded_bytes = 0
+            for seed in range(TRIALS):
+                storage = FlakyStorage(STORAGE_FAILURES)
+                client.async_client._client = httpx.AsyncClient(base_url=client.base_url, transport=storage)
+                link = FlakyLink(drop_rate, seed)
+                start = time.perf_counter()
+                storage_id = await upload(manager, link, text, len(file))
+                elapsed += time.perf_counter() - start
+                assert storage_id == "storage1"
+                drops += link.drops
+                sent_chars += link.sent_chars
+                uploaded_bytes += storage.uploaded_bytes
+            print(f"{label:>8}  {elapsed:6.2f}s  {drops:3d} drops  "
+                  f"{sent_chars / 2**20:7.1f}MB sent by client ({sent_chars / len(text) / TRIALS:4.2f}x)  "
+                  f"{uploaded_bytes / 2**20:7.1f}MB to storage")
+            print(f"\n📈 {json.dumps(manager.get_stats())}\n")
+
+    await client.close()
+
+
+if __name__ == "__main__":
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else SIZE_MB
+    drop_rate = float(sys.argv[2]) if len(sys.argv) > 2 else DROP_RATE
+    asyncio.run(run_resumable_upload_benchmark(size_mb, drop_rate))
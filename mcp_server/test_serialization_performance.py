@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Convex request/response serialization.
+Compares the generic path (convex_to_json + json, json + json_to_convex)
+with the generated encoders and the fast codec used by the transport.
+Runs offline; no Convex deployment is needed.
+
+Usage:
+    python test_serialization_performance.py
+"""
+
+import json
+import time
+from typing import Callable
+
+from convex.values import convex_to_json, json_to_convex
+
+from utils.convex_api import encode_reviews_submit_review, encode_manuscripts_submit_manuscript
+from utils.convex_codec import CODEC, dumps, loads, encode_args, decode_value
+
+ITERATIONS = 20000
+RESPONSE_ROWS = 200
+
+
+def time_per_call(func: Callable[[], object], iterations: int = ITERATIONS) -> float:
+    """Mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def sample_response() -> bytes:
+    """A manuscripts listing as Convex would return it."""
+    rows = [
+        {
+            "_id": f"k57{i:05d}manuscript",
+            "_creationTime": 1720000000000.0 + i,
+            "title": f"Manuscript {i}",
+            "abstract": "Lorem ipsum dolor sit amet " * 20,
+            "keywords": ["psychology", "methods", "review"],
+            "language": "en",
+            "fileId": f"kg2{i:05d}storage",
+            "status": "inReview",
+            "authors": ["Ada Lovelace", "Alan Turing"],
+            "fileUrl": f"https://example.convex.cloud/api/storage/{i}",
+        }
+        for i in range(RESPONSE_ROWS)
+    ]
+    return json.dumps({"status": "success", "value": rows}).encode()
+
+
+def run_request_benchmark():
+    print("\n📤 Request encoding (args → body bytes)")
+    review = dict(review_id="jd7abc", score=8, comments_md="Solid work. " * 50, recommendation="minor")
+    manuscript = dict(
+        title="A study", abstract="Abstract " * 100, keywords=["a", "b", "c"],
+        language="en", file_id="kg2storage",
+    )
+    cases = [
+        (
+            "reviews:submitReview",
+            lambda: {"reviewId": review["review_id"], "score": float(review["score"]),
+                     "commentsMd": review["comments_md"], "recommendation": review["recommendation"]},
+            lambda: encode_reviews_submit_review(**review),
+        ),
+        (
+            "manuscripts:submitManuscript",
+            lambda: {"title": manuscript["title"], "abstract": manuscript["abstract"],
+                     "keywords": manuscript["keywords"], "language": manuscript["language"],
+                     "fileId": manuscript["file_id"]},
+            lambda: encode_manuscripts_submit_manuscript(**manuscript),
+        ),
+    ]
+    for name, build_dict, build_encoded in cases:
+        generic = time_per_call(
+            lambda: json.dumps({"path": name, "format": "convex_encoded_json", "args": convex_to_json(build_dict())}).encode()
+        )
+        fast = time_per_call(
+            lambda: dumps({"path": name, "format": "convex_encoded_json", "args": encode_args(build_encoded())})
+        )
+        print(f"   {name:<30} generic {generic:7.2f}µs   generated+{CODEC} {fast:7.2f}µs   ({generic / fast:.1f}x)")
+
+
+def run_response_benchmark():
+    print(f"\n📥 Response decoding ({RESPONSE_ROWS} manuscripts)")
+    raw = sample_response()
+    iterations = ITERATIONS // 20
+
+    generic = time_per_call(lambda: json_to_convex(json.loads(raw)["value"]), iterations)
+    fast = time_per_call(lambda: decode_value(loads(raw)["value"], raw), iterations)
+    print(f"   {len(raw) / 1024:.0f} KiB body")
+    print(f"   generic {generic:9.1f}µs   {CODEC}+fast path {fast:9.1f}µs   ({generic / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    print("🧪 Convex Serialization Benchmark")
+    print(f"🔧 Codec: {CODEC}")
+    print("=" * 50)
+    run_request_benchmark()
+    run_response_benchmark()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark for AuthManager session lookups.
+Shows token and email lookup latency as the number of active sessions
+grows, against the previous linear scan, the cost of expiring sessions
+with the expiry heap against a full-dict scan, and the memory and
+permission-check cost of the slotted session against the pydantic model
+it replaced. Runs offline.
+
+Usage:
+    python test_session_performance.py [max_sessions]
+"""
+
+import sys
+import time
+import random
+import tracemalloc
+from typing import Callable, List
+
+from pydantic import BaseModel
+
+from utils.auth_manager import AuthManager, UserSession, role_mask
+
+SESSION_COUNTS = [100, 1_000, 10_000, 100_000, 1_000_000]
+LOOKUPS = 2000
+# The linear scan gets slow quickly; only sample it this far
+MAX_SCAN_SESSIONS = 100_000
+FOOTPRINT_SESSIONS = 100_000
+
+
+class PydanticSession(BaseModel):
+    """The session model AuthManager used before the slotted class."""
+    user_id: str
+    email: str
+    name: str
+    roles: List[str]
+    auth_token: str
+    expires_at: float
+    validated_at: float = 0.0
+    roles_generation: int = 0
+
+
+def make_session(i: int, ttl: float = 3600) -> UserSession:
+    return UserSession(
+        user_id=f"user{i}",
+        email=f"user{i}@example.org",
+        name=f"User {i}",
+        roles=["author"],
+        auth_token=f"eyJhbGciOiJSUzI1NiJ9.{i:012d}.signature{i}",
+        expires_at=time.time() + ttl,
+        validated_at=0.0,
+        roles_generation=0,
+    )
+
+
+def linear_scan(manager: AuthManager, auth_token: str):
+    """The lookup AuthManager used before the indexes."""
+    for session in manager.sessions.values():
+        if session.auth_token == auth_token:
+            return session
+    return None
+
+
+def time_lookups(lookup: Callable[[str], object], keys: List[str]) -> float:
+    """Mean microseconds per lookup."""
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def run_session_benchmark(max_sessions: int):
+    print("🧪 Session Lookup Benchmark")
+    print("=" * 70)
+    print(f"{'sessions':>10} {'by token (µs)':>15} {'by email (µs)':>15} {'linear scan (µs)':>18}")
+
+    manager = AuthManager()
+    added = 0
+    for count in [c for c in SESSION_COUNTS if c <= max_sessions]:
+        while added < count:
+            manager._add_session(make_session(added))
+            added += 1
+
+        sample = [random.randrange(count) for _ in range(LOOKUPS)]
+        tokens = [make_session(i).auth_token for i in sample]
+        emails = [f"user{i}@example.org" for i in sample]
+
+        # The lookups never await; drive them synchronously to time only the lookup itself
+        by_token = time_lookups(lambda t: _run(manager.get_session_by_token(t)), tokens)
+        by_email = time_lookups(lambda e: _run(manager.get_session_by_email(e)), emails)
+
+        scan = "-"
+        if count <= MAX_SCAN_SESSIONS:
+            scan_keys = tokens[: max(10, LOOKUPS * 100 // count)]
+            scan = f"{time_lookups(lambda t: linear_scan(manager, t), scan_keys):.1f}"
+        print(f"{count:>10,} {by_token:>15.2f} {by_email:>15.2f} {scan:>18}")
+
+
+def full_scan_cleanup(manager: AuthManager):
+    """The expiry pass AuthManager used before the heap."""
+    now = time.time()
+    for session in [s for s in manager.sessions.values() if s.expires_at <= now]:
+        manager._remove_session(session)
+
+
+def run_sweep_benchmark(max_sessions: int):
+    print("\n🧹 Expiry sweep (1% of sessions due)")
+    print(f"{'sessions':>10} {'heap (ms)':>12} {'full scan (ms)':>16}")
+    for count in [c for c in SESSION_COUNTS if c <= max_sessions]:
+        results = []
+        for sweep in (lambda m: m._expire_due(), full_scan_cleanup):
+            manager = AuthManager()
+            manager.max_sessions = count
+            for i in range(count):
+                manager._add_session(make_session(i, -1 if i % 100 == 0 else 3600))
+            start = time.perf_counter()
+            sweep(manager)
+            results.append((time.perf_counter() - start) * 1000)
+            assert len(manager.sessions) == count - (count + 99) // 100
+        print(f"{count:>10,} {results[0]:>12.2f} {results[1]:>16.2f}")
+
+
+def session_fields(i: int) -> dict:
+    return dict(
+        user_id=f"user{i}", email=f"user{i}@example.org", name=f"User {i}",
+        roles=["author", "reviewer"], auth_token=f"eyJhbGciOiJSUzI1NiJ9.{i:012d}.signature{i}",
+        expires_at=time.time() + 3600,
+    )
+
+
+def measure_footprint(build: Callable[[dict], object], fields: List[dict]):
+    """Bytes per session and microseconds per construction."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    sessions = [build(f) for f in fields]
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del sessions
+    return size / len(fields), elapsed / len(fields) * 1e6
+
+
+def run_footprint_benchmark():
+    print(f"\n💾 Session representation ({FOOTPRINT_SESSIONS:,} sessions)")
+    # Strings are shared by both models, so only the session objects are measured
+    fields = [session_fields(i) for i in range(FOOTPRINT_SESSIONS)]
+    old_bytes, old_build = measure_footprint(lambda f: PydanticSession(**f), fields)
+    new_bytes, new_build = measure_footprint(lambda f: UserSession(**f), fields)
+    print(f"   pydantic model   {old_bytes:7.0f} B/session   {old_build:6.2f}µs to build   {old_bytes * FOOTPRINT_SESSIONS / 2**20:6.1f} MiB total")
+    print(f"   slotted session  {new_bytes:7.0f} B/session   {new_build:6.2f}µs to build   {new_bytes * FOOTPRINT_SESSIONS / 2**20:6.1f} MiB total")
+
+    print("\n🔐 Permission check (session with author+reviewer, require editor/reviewer)")
+    old = PydanticSession(**fields[0])
+    new = UserSession(**fields[0])
+    iterations = 200_000
+
+    def list_scan():
+        # What require_auth did per call: build the list, scan it per role
+        required = ["reviewer", "editor"]
+        return "any" in required or any(role in old.roles for role in required)
+
+    compiled = role_mask(["reviewer", "editor"])
+    for label, check in (("list scan", list_scan), ("compiled mask", lambda: new.role_mask & compiled)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            check()
+        print(f"   {label:<14} {(time.perf_counter() - start) / iterations * 1e9:7.1f} ns")
+
+
+def _run(coro):
+    """Run a coroutine that completes without suspending."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("lookup suspended")
+
+
+if __name__ == "__main__":
+    max_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else SESSION_COUNTS[-1]
+    run_session_benchmark(max_sessions)
+    run_sweep_benchmark(max_sessions)
+    run_footprint_benchmark()
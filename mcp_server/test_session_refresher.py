@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test that reloading sessions from a shared store does not grow the refresh schedule.
+Reloads one session many times through a SQLite store with caching off,
+then checks the refresher holds a single plan for it and still refreshes
+the reloaded session when it comes due. Runs offline.
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+
+from utils.auth_manager import AuthManager, UserSession
+from utils.session_store import SQLiteSessionStore
+
+RELOADS = 2000
+
+
+def make_session() -> UserSession:
+    now = time.time()
+    return UserSession(
+        user_id="user1",
+        email="user1@example.org",
+        name="User 1",
+        roles=["author"],
+        auth_token="eyJhbGciOiJSUzI1NiJ9.000000000001.signature1",
+        expires_at=now + 24 * 3600,
+        validated_at=now,
+        last_used=now,
+    )
+
+
+def force_due(refresher):
+    """Move every planned refresh into the past."""
+    refresher._heap = [(0.0,) + entry[1:] for entry in refresher._heap]
+    refresher._planned = {key: (0.0, expires_at) for key, (_, expires_at) in refresher._planned.items()}
+
+
+async def test_reloads_keep_one_plan():
+    """Every store reload re-adds the session; it must not queue another refresh."""
+    print(f"1. Reloading one session {RELOADS} times from the store...")
+    store = SQLiteSessionStore(os.path.join(tempfile.mkdtemp(), "sessions.db"))
+    manager = AuthManager(store=store)
+    manager.cache_ttl = 0
+    try:
+        session = make_session()
+        manager._add_session(session)
+        await manager._save(session)
+        for _ in range(RELOADS):
+            assert await manager.get_session_by_token(session.auth_token) is not None
+        stats = manager.refresher.get_stats()
+        assert stats["scheduled"] == 1, f"{stats['scheduled']} plans for one session"
+        assert stats["heap_entries"] == 1, f"{stats['heap_entries']} heap entries for one session"
+        print(f"   ✅ {stats['heap_entries']} heap entry after {RELOADS} reloads")
+
+        # The plan follows the session key, so the reloaded object is refreshed
+        refreshed = []
+
+        async def refresh(auth_token):
+            refreshed.append(auth_token)
+            return session
+
+        refresher = manager.refresher
+        refresher.refresh = refresh
+        force_due(refresher)
+        attempted = await refresher.run_once()
+        assert attempted == 1 and refreshed == [session.auth_token], f"refreshed {refreshed}"
+        assert refresher.get_stats()["scheduled"] == 0
+        print("   ✅ reloaded session refreshed when due")
+    finally:
+        await manager.stop_sweeper()
+        await store.close()
+
+
+async def run_refresher_tests():
+    print("🧪 Session Refresher Tests")
+    print("=" * 60)
+    await test_reloads_keep_one_plan()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_refresher_tests())
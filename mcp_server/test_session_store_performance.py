@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the session store backends.
+Measures raw store reads, AuthManager lookups that miss the per-worker
+cache, and cache hits, and checks that a second process sees the sessions.
+Runs offline; the Redis backend talks to a local stand-in unless
+SESSION_REDIS_URL is set.
+
+Usage:
+    python test_session_store_performance.py [sessions]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import multiprocessing
+from typing import Awaitable, Callable, List
+
+from utils.auth_manager import AuthManager, UserSession
+from utils.client_pool import hash_token
+from utils.convex_codec import dumps
+from utils.resp import LocalRespServer
+from utils.session_store import (
+    MemorySessionStore, SQLiteSessionStore, SharedMemorySessionStore, RespSessionStore,
+)
+
+SESSIONS = 10_000
+LOOKUPS = 2000
+
+
+def make_session(i: int) -> UserSession:
+    return UserSession(
+        user_id=f"user{i}",
+        email=f"user{i}@example.org",
+        name=f"User {i}",
+        roles=["author", "reviewer"],
+        auth_token=f"eyJhbGciOiJSUzI1NiJ9.{i:012d}.signature{i}",
+        expires_at=time.time() + 3600,
+    )
+
+
+async def time_lookups(lookup: Callable[[str], Awaitable[object]], keys: List[str]) -> float:
+    """Mean microseconds per lookup."""
+    start = time.perf_counter()
+    for key in keys:
+        await lookup(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def read_in_child(kind: str, location: str, token_hash: str, result):
+    """Open the same store from another process and read one session."""
+    store = SQLiteSessionStore(location) if kind == "sqlite" else SharedMemorySessionStore(location)
+    result.value = asyncio.run(store.get(token_hash)) is not None
+
+
+def seen_by_other_process(kind: str, location: str, token_hash: str) -> bool:
+    # Spawn, not fork: a forked child would inherit the backend executor's
+    # thread pool without its threads
+    ctx = multiprocessing.get_context("spawn")
+    result = ctx.Value("b", False)
+    child = ctx.Process(target=read_in_child, args=(kind, location, token_hash, result))
+    child.start()
+    child.join()
+    return bool(result.value)
+
+
+async def run_store_benchmark(count: int):
+    print("🧪 Session Store Benchmark")
+    print(f"📊 {count:,} sessions, {LOOKUPS} lookups")
+    print("=" * 78)
+    print(f"{'backend':>8} {'put (µs)':>10} {'store get (µs)':>16} {'cache miss (µs)':>17} {'cache hit (µs)':>16} {'2nd proc':>9}")
+
+    tmp = tempfile.mkdtemp()
+    shm_name = f"jcs_bench_{os.getpid()}"
+    resp_server = None
+    redis_url = os.getenv("SESSION_REDIS_URL")
+    if not redis_url:
+        resp_server = await LocalRespServer().start()
+        redis_url = resp_server.url
+
+    backends = [
+        ("memory", lambda: MemorySessionStore(), None),
+        ("sqlite", lambda: SQLiteSessionStore(os.path.join(tmp, "sessions.db")), os.path.join(tmp, "sessions.db")),
+        ("shm", lambda: SharedMemorySessionStore(shm_name, capacity=max(count * 2, 1024)), shm_name),
+        ("redis", lambda: RespSessionStore(redis_url, prefix=f"bench:{os.getpid()}:"), None),
+    ]
+    sessions = [make_session(i) for i in range(count)]
+    sample = [sessions[i % count].auth_token for i in range(0, LOOKUPS * 7, 7)]
+
+    for name, factory, location in backends:
+        store = factory()
+        start = time.perf_counter()
+        for session in sessions:
+            await store.put(hash_token(session.auth_token), session.email, session.expires_at, dumps(session.to_record()))
+        put = (time.perf_counter() - start) / count * 1e6
+
+        raw = await time_lookups(lambda t: store.get(hash_token(t)), sample)
+
+        # A fresh manager has nothing cached, so each first lookup reads the store
+        manager = AuthManager(store=store)
+        manager.cache_ttl = 3600
+        miss = await time_lookups(manager.get_session_by_token, sample)
+        hit = await time_lookups(manager.get_session_by_token, sample)
+
+        shared = "-"
+        if location is not None:
+            shared = "yes" if seen_by_other_process(name, location, hash_token(sample[0])) else "NO"
+        print(f"{name:>8} {put:>10.1f} {raw:>16.1f} {miss:>17.1f} {hit:>16.1f} {shared:>9}")
+
+        await manager.stop_sweeper()
+        if isinstance(store, SharedMemorySessionStore):
+            store.unlink()
+        await store.close()
+
+    if resp_server is not None:
+        await resp_server.stop()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else SESSIONS
+    asyncio.run(run_store_benchmark(count))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for rate limits shared between workers.
+Runs several limiter instances (one per simulated worker, each with its own
+connection) against one Redis-protocol store and checks that together they
+admit no more than the configured limit, where per-process limits admit it
+once per worker. Also measures the per-call cost with and without leasing.
+Runs offline against a local stand-in unless RATE_LIMIT_REDIS_URL is set.
+
+Usage:
+    python test_shared_rate_limit_performance.py [workers] [calls]
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+from utils.resp import LocalRespServer
+from utils.rate_lease import RespLeaseBackend, install_lease_script
+from utils.security import RateLimits, SecurityConfig, SharedRateLimits
+
+WORKERS = 4
+CALLS = 20_000
+
+
+def make_config(identity: int, tool: int = 0, global_: int = 0) -> SecurityConfig:
+    config = SecurityConfig()
+    config.rate_limit_requests = identity
+    config.rate_limit_tool_requests = tool
+    config.rate_limit_global_requests = global_
+    config.rate_limit_window = 60.0
+    return config
+
+
+async def admitted(limits, calls: int, identities: int) -> int:
+    count = 0
+    for i in range(calls):
+        if await limits.acquire(f"token:{i % identities}", "submit_manuscript") is None:
+            count += 1
+    return count
+
+
+async def run_accuracy(url: str, workers: int):
+    print(f"\n🔒 {workers} workers, 100 calls/min per identity, 1000 calls for one identity")
+    prefix = f"bench:{os.getpid()}:{time.monotonic_ns()}:"
+    local = [RateLimits(make_config(100)) for _ in range(workers)]
+    shared = [SharedRateLimits(make_config(100), RespLeaseBackend(url, prefix=prefix)) for _ in range(workers)]
+    for name, fleet in (("per process", local), ("shared", shared)):
+        # Round-robin the identity's calls over the workers, as a load balancer would
+        results = await asyncio.gather(*(admitted(limits, 1000 // workers, 1) for limits in fleet))
+        print(f"   {name:<12} admitted {sum(results):5d}   ({', '.join(map(str, results))})")
+    for limits in shared:
+        await limits.close()
+
+
+async def run_overhead(url: str, calls: int):
+    print(f"\n⏱️  Per-call cost, {calls:,} calls over 100 identities, global limit on")
+    print(f"{'limits':>22} {'µs/call':>9} {'backend calls':>14}")
+    prefix = f"bench:{os.getpid()}:{time.monotonic_ns()}:"
+    config = make_config(10**9, global_=10**9)
+    contenders = [
+        ("per process", RateLimits(config)),
+        ("shared, no leasing", SharedRateLimits(config, RespLeaseBackend(url, prefix=prefix + "a:"), lease_size=1)),
+        ("shared, leased", SharedRateLimits(config, RespLeaseBackend(url, prefix=prefix + "b:"))),
+    ]
+    for name, limits in contenders:
+        await admitted(limits, 200, 100)  # connect and warm up
+        start = time.perf_counter()
+        await admitted(limits, calls, 100)
+        per_call = (time.perf_counter() - start) / calls * 1e6
+        backend_calls = limits.get_stats().get("shared", {}).get("backend_calls", 0)
+        print(f"{name:>22} {per_call:>9.2f} {backend_calls:>14,}")
+        await limits.close()
+
+
+async def run_shared_rate_limit_benchmark(workers: int, calls: int):
+    print("🧪 Shared Rate Limit Benchmark")
+    print("=" * 50)
+    server = None
+    url = os.getenv("RATE_LIMIT_REDIS_URL")
+    if not url:
+        server = await LocalRespServer().start()
+        install_lease_script(server)
+        url = server.url
+    await run_accuracy(url, workers)
+    await run_overhead(url, calls)
+    if server is not None:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else WORKERS
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else CALLS
+    asyncio.run(run_shared_rate_limit_benchmark(workers, calls))
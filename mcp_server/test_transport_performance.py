@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Convex transports.
+Compares the to_thread wrapper against the native httpx transport at
+increasing levels of concurrency.
+
+Usage:
+    CONVEX_URL=https://your-deployment.convex.cloud python test_transport_performance.py
+"""
+
+import asyncio
+import os
+import time
+from statistics import mean, median
+from typing import List
+
+from dotenv import load_dotenv
+
+from utils.convex_client import ConvexClient
+
+load_dotenv()
+
+# Cheap public query: returns null when called without auth
+BENCH_FUNCTION = os.getenv("BENCH_FUNCTION", "auth:loggedInUser")
+CONCURRENCY_LEVELS = [10, 100, 500]
+
+
+class TransportBenchResult:
+    """Container for a single benchmark run."""
+
+    def __init__(self, transport: str, concurrency: int):
+        self.transport = transport
+        self.concurrency = concurrency
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.duration = 0.0
+
+    @property
+    def calls_per_second(self) -> float:
+        return len(self.latencies) / self.duration if self.duration > 0 else 0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run_transport(transport: str, concurrency: int) -> TransportBenchResult:
+    """Fire `concurrency` identical queries at once through one transport."""
+    result = TransportBenchResult(transport, concurrency)
+    client = ConvexClient(transport=transport)
+
+    # Warm up connections so the first measured call doesn't pay for the handshake
+    await client.async_client.query(BENCH_FUNCTION)
+
+    async def one_call():
+        start = time.perf_counter()
+        try:
+            await client.async_client.query(BENCH_FUNCTION)
+            result.latencies.append(time.perf_counter() - start)
+        except Exception:
+            result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - start
+
+    await client.close()
+    return result
+
+
+def print_result(result: TransportBenchResult):
+    """Print benchmark results for one transport and concurrency level."""
+    print(f"\n📊 {result.transport} @ {result.concurrency} concurrent calls")
+    print(f"   Completed: {len(result.latencies)}  Errors: {result.errors}")
+    print(f"   Wall time: {result.duration*1000:.1f}ms  Calls/sec: {result.calls_per_second:.1f}")
+    if result.latencies:
+        print(f"   Latency - Mean: {mean(result.latencies)*1000:.1f}ms")
+        print(f"   Latency - Median: {median(result.latencies)*1000:.1f}ms")
+        print(f"   Latency - p99: {result.percentile(0.99)*1000:.1f}ms")
+
+
+async def run_transport_benchmarks():
+    """Run both transports at every concurrency level."""
+    print("🧪 Convex Transport Benchmark")
+    print(f"🔗 {os.getenv('CONVEX_URL', 'http://localhost:3000')} → {BENCH_FUNCTION}")
+    print("=" * 50)
+
+    summary = []
+    for concurrency in CONCURRENCY_LEVELS:
+        for transport in ("thread", "httpx"):
+            result = await run_transport(transport, concurrency)
+            print_result(result)
+            summary.append(result)
+
+    print("\n" + "=" * 50)
+    print("🎯 Wall time per level (thread vs httpx)")
+    print("=" * 50)
+    for thread_result, native_result in zip(summary[::2], summary[1::2]):
+        speedup = thread_result.duration / native_result.duration if native_result.duration else 0
+        print(
+            f"   {thread_result.concurrency:>4} calls: "
+            f"{thread_result.duration*1000:8.1f}ms vs {native_result.duration*1000:8.1f}ms "
+            f"({speedup:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(run_transport_benchmarks())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark for manuscript upload memory.
+Compares peak Python memory on the server for a one-shot submit (the whole
+file arrives base64 encoded inside one JSON-RPC request), decoded in full
+before upload and decoded block by block into a streamed body, with a
+chunked upload session, against a fake Convex that consumes the uploaded
+body as a stream. Runs offline.
+
+Usage:
+    python test_upload_performance.py [size_mb ...]
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import asyncio
+import tracemalloc
+
+import httpx
+
+from utils.base64_stream import decoded_length, stream_base64
+from utils.convex_client import ConvexResponse, get_convex_client
+from utils.upload_session import UploadSessionManager
+
+SIZES_MB = [10, 100]
+UPLOAD_URL = "http://convex.invalid/api/storage/upload?token=bench"
+
+
+class SinkTransport(httpx.AsyncBaseTransport):
+    """Fake Convex: hands out an upload URL and counts uploaded bytes without keeping them."""
+
+    def __init__(self):
+        self.uploaded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/storage/upload":
+            self.uploaded = 0
+            async for chunk in request.stream:
+                self.uploaded += len(chunk)
+            return httpx.Response(200, json={"storageId": f"storage{self.uploaded}"})
+        await request.aread()
+        return httpx.Response(200, json={"status": "success", "value": UPLOAD_URL})
+
+
+def rpc_request(arguments: dict) -> str:
+    """The JSON-RPC text a tool call arrives as."""
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"arguments": arguments}})
+
+
+async def one_shot(client, request: str) -> ConvexResponse:
+    file_data = json.loads(request)["params"]["arguments"]["file_data"]
+    return await client.upload_file(UPLOAD_URL, base64.b64decode(file_data), "application/pdf")
+
+
+async def one_shot_streamed(client, request: str) -> ConvexResponse:
+    file_data = json.loads(request)["params"]["arguments"]["file_data"]
+    return await client.upload_stream(UPLOAD_URL, stream_base64(file_data), "application/pdf", decoded_length(file_data))
+
+
+async def chunked(manager: UploadSessionManager, file: bytes, chunk_bytes: int) -> str:
+    session = await manager.begin("bench", "paper.pdf", len(file), "application/pdf", "token")
+    for offset in range(0, len(file), chunk_bytes):
+        request = rpc_request({"chunk": base64.b64encode(file[offset:offset + chunk_bytes]).decode()})
+        await manager.append(session.upload_id, "bench", json.loads(request)["params"]["arguments"]["chunk"])
+        del request
+    return await manager.commit(session.upload_id, "bench")
+
+
+async def peak_mb(run) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2**20, elapsed
+
+
+async def run_upload_benchmark(sizes_mb):
+    print("🧪 Upload Memory Benchmark")
+    manager = UploadSessionManager(spool_dir="")
+    chunk_bytes = manager.max_chunk_size // 4 * 3
+    print(f"📊 chunked uploads send {chunk_bytes // 1024} KiB per append, {manager.queue_chunks} chunks queued")
+    print("=" * 70)
+    print(f"{'file':>8} {'decode+upload':>14} {'streamed':>10} {'chunked':>9}   (peak MB, seconds)")
+
+    client = get_convex_client()
+    sink = SinkTransport()
+    client.async_client._client = httpx.AsyncClient(base_url=client.base_url, transport=sink)
+
+    for size_mb in sizes_mb:
+        file = b"%PDF-1.7\n" + os.urandom(int(size_mb * 2**20) - 16) + b"\n%%EOF\n"
+        # The request text has already arrived; measure what the server adds to it
+        request = rpc_request({"file_data": base64.b64encode(file).decode()})
+        results = []
+        for run in (lambda: one_shot(client, request), lambda: one_shot_streamed(client, request),
+                    lambda: chunked(manager, file, chunk_bytes)):
+            results.append(await peak_mb(run))
+            assert sink.uploaded == len(file)
+        print(f"{size_mb:>6g}MB" + "".join(f" {peak:>7.1f} {seconds:>5.2f}s" for peak, seconds in results))
+        del request
+        print(f"{'':>8} {'':>14} {results[0][0] / results[1][0]:>9.1f}x {results[0][0] / results[2][0]:>8.0f}x   less memory")
+
+    print(f"\n📈 {manager.get_stats()}")
+    await client.close()
+
+
+if __name__ == "__main__":
+    sizes = [float(a) for a in sys.argv[1:]] or SIZES_MB
+    asyncio.run(run_upload_benchmark(sizes))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for upload validation.
+Submits a valid PDF, a file of another type labelled application/pdf and a
+truncated PDF, checked the old way (size estimated from the base64 length,
+type taken on trust, then decoded and uploaded) and with the streaming
+validator (exact size from padding, first and last bytes checked before
+anything is decoded in full). Reports time to accept or reject each file
+and the bytes sent to a fake Convex storage. Runs offline.
+
+Usage:
+    python test_upload_validation_performance.py [size_mb ...]
+"""
+
+import os
+import sys
+import time
+import base64
+import asyncio
+
+import httpx
+
+from utils.base64_stream import decoded_length, stream_base64
+from utils.convex_client import get_convex_client
+from utils.security import security_config, validate_file_upload, validate_upload_metadata
+
+SIZES_MB = [10, 100]
+UPLOAD_URL = "http://convex.invalid/api/storage/upload?token=bench"
+
+
+class SinkTransport(httpx.AsyncBaseTransport):
+    """Fake Convex storage that counts uploaded bytes without keeping them."""
+
+    def __init__(self):
+        self.uploaded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async for chunk in request.stream:
+            self.uploaded += len(chunk)
+        return httpx.Response(200, json={"storageId": "storage1"})
+
+
+def sample_files(size: int) -> dict:
+    body = os.urandom(size - 16)
+    return {
+        "valid pdf": b"%PDF-1.7\n" + body + b"\n%%EOF\n",
+        "zip as pdf": b"PK\x03\x04" + body + b"abc" + b"\n%%EOF\n",
+        "truncated pdf": b"%PDF-1.7\n" + body + b"\n%%EO",
+    }
+
+
+async def submit_legacy(client, file_data: str) -> str:
+    """Estimated size and trusted type; problems surface after the upload, if at all."""
+    try:
+        validate_upload_metadata(len(file_data) * 0.75, "paper.pdf", "application/pdf")
+    except ValueError:
+        return "rejected"
+    result = await client.upload_file(UPLOAD_URL, base64.b64decode(file_data), "application/pdf")
+    return "stored" if result.success else "failed"
+
+
+async def submit_validated(client, file_data: str) -> str:
+    try:
+        validate_file_upload(file_data, "paper.pdf", "application/pdf")
+    except ValueError:
+        return "rejected"
+    result = await client.upload_stream(UPLOAD_URL, stream_base64(file_data), "application/pdf", decoded_length(file_data))
+    return "stored" if result.success else "failed"
+
+
+async def run_validation_benchmark(sizes_mb):
+    print("🧪 Upload Validation Benchmark")
+    print("📊 legacy: estimated size, trusted type | validated: exact size, checked ends")
+    print("=" * 78)
+    print(f"{'file':>8} {'case':>14} {'legacy':>24} {'validated':>26}")
+
+    client = get_convex_client()
+    sink = SinkTransport()
+    client.async_client._client = httpx.AsyncClient(base_url=client.base_url, transport=sink)
+
+    for size_mb in sizes_mb:
+        # The valid PDF is exactly at the size limit
+        security_config.max_file_size = int(size_mb * 2**20)
+        for case, file in sample_files(int(size_mb * 2**20)).items():
+            file_data = base64.b64encode(file).decode()
+            cells = []
+            for submit in (submit_legacy, submit_validated):
+                sink.uploaded = 0
+                start = time.perf_counter()
+                outcome = await submit(client, file_data)
+                elapsed = time.perf_counter() - start
+                cells.append(f"{outcome:>8} {elapsed * 1000:7.1f}ms {sink.uploaded / 2**20:5.1f}MB")
+            print(f"{size_mb:>6g}MB {case:>14} {cells[0]:>24}   {cells[1]:>24}")
+            del file_data
+
+    await client.close()
+
+
+if __name__ == "__main__":
+    sizes = [float(a) for a in sys.argv[1:]] or SIZES_MB
+    asyncio.run(run_validation_benchmark(sizes))
@@ -3,7 +3,6 @@ Author tools for MCP server.
 Handles manuscript submission, tracking, and author workflows.
 """
 
-import base64
 from typing import Dict, Any, List, Optional
 import sys
 from pathlib import Path
@@ -12,8 +11,14 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from utils.auth_manager import require_author, UserSession
+from utils.auth_manager import require_author, role_mask, UserSession
+from utils.base64_stream import decoded_length, stream_base64, strip_whitespace
+from utils.content_index import get_content_index, sha256_base64
 from utils.convex_client import get_convex_client
+from utils.upload_session import UploadOffsetError, get_upload_manager
+
+# Roles that may read manuscripts they did not author
+_STAFF_ROLES = role_mask(["editor", "reviewer"])
 
 
 @require_author
@@ -51,56 +56,232 @@ async def submit_manuscript(
     convex_client = get_convex_client()
     
     try:
-        # Decode file data
-        file_bytes = base64.b64decode(file_data)
-        
-        # Generate upload URL
-        upload_response = await convex_client.generate_upload_url(auth_token)
-        if not upload_response.success:
-            raise ValueError(f"Failed to generate upload URL: {upload_response.error}")
-            
-        upload_url = upload_response.data.get("uploadUrl")
-        if not upload_url:
-            raise ValueError("No upload URL received")
-            
-        # Upload file
-        upload_result = await convex_client.upload_file(upload_url, file_bytes, content_type)
-        if not upload_result.success:
-            raise ValueError(f"Failed to upload file: {upload_result.error}")
+        # Size the decoded file without decoding it; it is decoded block by
+        # block as the upload body is sent
+        file_data = strip_whitespace(file_data)
+        file_size = decoded_length(file_data)
+        
+        # A retry of an upload that already went through reuses the stored file
+        content_index = get_content_index()
+        digest = sha256_base64(file_data)
+        storage_id = content_index.lookup(session.user_id, digest)
+        if storage_id is None:
+            # Generate upload URL
+            upload_response = await convex_client.generate_upload_url(auth_token)
+            if not upload_response.success:
+                raise ValueError(f"Failed to generate upload URL: {upload_response.error}")
+                
+            upload_url = upload_response.data.get("uploadUrl")
+            if not upload_url:
+                raise ValueError("No upload URL received")
+                
+            # Upload file
+            upload_result = await convex_client.upload_stream(upload_url, stream_base64(file_data), content_type, file_size)
+            if not upload_result.success:
+                raise ValueError(f"Failed to upload file: {upload_result.error}")
+                
+            storage_id = upload_result.data.get("storageId")
+            if not storage_id:
+                raise ValueError("No storage ID received after upload")
+            content_index.remember(session.user_id, digest, storage_id, file_size)
             
-        storage_id = upload_result.data.get("storageId")
-        if not storage_id:
-            raise ValueError("No storage ID received after upload")
-            
-        # Create manuscript record
-        manuscript_data = {
-            "title": title,
-            "abstract": abstract,
-            "keywords": keywords,
-            "language": language,
-            "fileId": storage_id
-        }
+        return await _record_submission(title, abstract, keywords, language, storage_id, file_name, auth_token)
         
-        create_response = await convex_client.create_manuscript(auth_token, manuscript_data)
-        if not create_response.success:
-            raise ValueError(f"Failed to create manuscript record: {create_response.error}")
-            
-        manuscript_id = create_response.data.get("manuscriptId")
+    except Exception as e:
+        raise ValueError(f"Manuscript submission failed: {str(e)}")
+
+
+async def _record_submission(
+    title: str,
+    abstract: str,
+    keywords: List[str],
+    language: str,
+    storage_id: str,
+    file_name: str,
+    auth_token: str,
+) -> Dict[str, Any]:
+    """Create the manuscript record for an uploaded file."""
+    create_response = await get_convex_client().manuscripts_submit_manuscript(
+        title=title,
+        abstract=abstract,
+        keywords=keywords,
+        language=language,
+        file_id=storage_id,
+        auth_token=auth_token
+    )
+    if not create_response.success:
+        raise ValueError(f"Failed to create manuscript record: {create_response.error}")
+        
+    return {
+        "success": True,
+        "message": "Manuscript submitted successfully",
+        "manuscript_id": create_response.data,
+        "title": title,
+        "status": "submitted",
+        "file_name": file_name,
+        "submission_date": __import__("time").time()
+    }
+
+
+@require_author
+async def begin_manuscript_upload(
+    file_name: str,
+    file_size: int,
+    content_type: str = "application/pdf",
+    sha256: Optional[str] = None,
+    auth_token: str = None,
+    session: UserSession = None
+) -> Dict[str, Any]:
+    """
+    Start a chunked manuscript upload.
+    
+    The file is sent in chunks, so it never has to fit in a single request.
+    If the caller recently uploaded a file with the given SHA-256, the
+    stored copy is reused and no chunks need to be sent.
+    
+    Args:
+        file_name: Original file name
+        file_size: Size of the decoded file in bytes
+        content_type: MIME type of the file
+        sha256: Hex SHA-256 of the file (optional; checked at commit)
+        auth_token: Authentication token (handled by decorator)
+        session: User session (injected by decorator)
         
-        return {
-            "success": True,
-            "message": "Manuscript submitted successfully",
-            "manuscript_id": manuscript_id,
-            "title": title,
-            "status": "submitted",
-            "file_name": file_name,
-            "submission_date": __import__("time").time()
-        }
+    Returns:
+        Dictionary with the upload_id, the largest chunk accepted, whether
+        the file is already stored and whether the upload can be resumed
+    """
+    manager = get_upload_manager()
+    upload = await manager.begin(session.user_id, file_name, file_size, content_type, auth_token, sha256)
+    return {
+        "success": True,
+        "upload_id": upload.upload_id,
+        "file_size": file_size,
+        "max_chunk_size": manager.max_chunk_size,
+        "already_uploaded": upload.storage_id is not None,
+        "resumable": upload.durable,
+    }
+
+
+@require_author
+async def append_manuscript_upload(
+    upload_id: str,
+    chunk: str,
+    offset: Optional[int] = None,
+    auth_token: str = None,
+    session: UserSession = None
+) -> Dict[str, Any]:
+    """
+    Append the next base64 chunk to an upload.
+    
+    Chunks are decoded in the order they are appended; a chunk may end
+    part way through a base64 group. With an offset, characters the upload
+    already holds are skipped, so resending a chunk whose reply was lost is
+    harmless; a chunk that would leave a gap is refused with the offset to
+    continue from.
+    
+    Args:
+        upload_id: Upload session ID from begin_manuscript_upload
+        chunk: Next piece of the base64 encoded file
+        offset: Position of the chunk in the base64 text (optional)
+        auth_token: Authentication token (handled by decorator)
+        session: User session (injected by decorator)
         
+    Returns:
+        Dictionary with the next offset and the bytes received so far and
+        still expected
+    """
+    manager = get_upload_manager()
+    try:
+        upload = await manager.append(upload_id, session.user_id, chunk, offset)
+    except UploadOffsetError as e:
+        return {"success": False, "upload_id": upload_id, "error": str(e), "offset": e.offset}
+    return {
+        "success": True,
+        "upload_id": upload_id,
+        "offset": upload.offset,
+        "received": upload.received,
+        "remaining": upload.file_size - upload.received,
+    }
+
+
+@require_author
+async def get_manuscript_upload_status(
+    upload_id: str,
+    auth_token: str = None,
+    session: UserSession = None
+) -> Dict[str, Any]:
+    """
+    Get how far an upload has got, to resume it after a dropped connection.
+    
+    Args:
+        upload_id: Upload session ID from begin_manuscript_upload
+        auth_token: Authentication token (handled by decorator)
+        session: User session (injected by decorator)
+        
+    Returns:
+        Dictionary with the offset to continue from and the bytes received
+        so far and still expected
+    """
+    status = await get_upload_manager().status(upload_id, session.user_id)
+    return {"success": True, **status}
+
+
+@require_author
+async def commit_manuscript_upload(
+    upload_id: str,
+    title: str,
+    abstract: str,
+    keywords: List[str],
+    language: str,
+    auth_token: str = None,
+    session: UserSession = None
+) -> Dict[str, Any]:
+    """
+    Finish an upload and submit the manuscript for peer review.
+    
+    Args:
+        upload_id: Upload session ID from begin_manuscript_upload
+        title: Manuscript title
+        abstract: Manuscript abstract
+        keywords: List of keywords
+        language: Manuscript language
+        auth_token: Authentication token (handled by decorator)
+        session: User session (injected by decorator)
+        
+    Returns:
+        Dictionary containing submission result
+    """
+    manager = get_upload_manager()
+    upload = await manager.get(upload_id, session.user_id)
+    try:
+        storage_id = await manager.commit(upload_id, session.user_id, auth_token)
+        return await _record_submission(title, abstract, keywords, language, storage_id, upload.file_name, auth_token)
     except Exception as e:
         raise ValueError(f"Manuscript submission failed: {str(e)}")
 
 
+@require_author
+async def abort_manuscript_upload(
+    upload_id: str,
+    auth_token: str = None,
+    session: UserSession = None
+) -> Dict[str, Any]:
+    """
+    Abandon an upload; nothing is stored.
+    
+    Args:
+        upload_id: Upload session ID from begin_manuscript_upload
+        auth_token: Authentication token (handled by decorator)
+        session: User session (injected by decorator)
+        
+    Returns:
+        Dictionary confirming the upload was aborted
+    """
+    await get_upload_manager().abort(upload_id, session.user_id)
+    return {"success": True, "upload_id": upload_id, "status": "aborted"}
+
+
 @require_author
 async def get_my_manuscripts(
     auth_token: str = None,
@@ -177,7 +358,7 @@ async def get_manuscript_details(
             
         # Check if user is author or has permission to view
         if session.user_id not in manuscript.get("authorIds", []):
-            if not any(role in session.roles for role in ["editor", "reviewer"]):
+            if not session.has_any_role(_STAFF_ROLES):
                 raise ValueError("Access denied: not authorized to view this manuscript")
         
         return {
@@ -252,12 +433,7 @@ async def update_manuscript(
             update_data["language"] = language
             
         # Update manuscript
-        response = await convex_client._make_request(
-            "PATCH",
-            f"/api/mcp/manuscripts/{manuscript_id}",
-            data=update_data,
-            auth_token=auth_token
-        )
+        response = await convex_client.update_manuscript(manuscript_id, update_data, auth_token)
         
         if not response.success:
             raise ValueError(f"Failed to update manuscript: {response.error}")
@@ -513,7 +689,7 @@ async def download_manuscript_file(
             
         # Check permissions
         if session.user_id not in manuscript.get("authorIds", []):
-            if not any(role in session.roles for role in ["editor", "reviewer"]):
+            if not session.has_any_role(_STAFF_ROLES):
                 raise ValueError("Access denied: not authorized to download this file")
         
         file_url = manuscript.get("fileUrl")
@@ -7,35 +7,40 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from typing import Dict, List, Any, Optional
-from utils.auth_manager import require_auth, require_editor
+from utils.auth_manager import require_auth, require_editor, UserSession
+from utils.base64_stream import decoded_length, stream_base64, strip_whitespace
+from utils.content_index import get_content_index, sha256_base64
 from utils.convex_client import ConvexClient
+from utils.table_mirror import MIRROR_ARTICLE_LIMIT, mirrored_query, mirrored_query_many
+from utils.security import validate_file_upload
 
 # Initialize client
 client = ConvexClient()
 
 @require_editor
-async def get_editor_dashboard(auth_token: str) -> Dict[str, Any]:
+async def get_editor_dashboard(auth_token: str = None, session: UserSession = None) -> Dict[str, Any]:
     """Get editor dashboard with manuscripts and review management"""
     try:
-        # Get current user data
-        user_response = await client.get_current_user_data(auth_token)
-        if not user_response.success:
-            return {"success": False, "error": user_response.error}
-        
-        # Get manuscripts for editor
-        manuscripts_response = await client.get_manuscripts_for_editor(auth_token)
-        if not manuscripts_response.success:
-            return {"success": False, "error": manuscripts_response.error}
-        
-        # Get reviews for editor
-        reviews_response = await client.get_reviews_for_editor(auth_token)
-        if not reviews_response.success:
-            return {"success": False, "error": reviews_response.error}
-        
-        # Get proofing tasks
-        proofing_response = await client.get_proofing_tasks(auth_token)
-        if not proofing_response.success:
-            return {"success": False, "error": proofing_response.error}
+        # Independent reads: fetch them concurrently, each with its own timeout
+        user_response, manuscripts_response, reviews_response, proofing_response = await mirrored_query_many(
+            client, session, auth_token,
+            [
+                (None, "userData:getCurrentUserData", None),
+                ("manuscripts", "manuscripts:getManuscriptsForEditor", None),
+                ("reviews", "reviews:getReviewsForEditor", None),
+                ("proofingTasks", "proofing:getProofingTasks", None),
+            ]
+        )
+        
+        sections = {
+            "user": user_response,
+            "manuscripts": manuscripts_response,
+            "reviews": reviews_response,
+            "proofing_tasks": proofing_response
+        }
+        errors = {name: r.error for name, r in sections.items() if not r.success}
+        if len(errors) == len(sections):
+            return {"success": False, "error": user_response.error, "errors": errors}
         
         manuscripts = manuscripts_response.data or []
         reviews = reviews_response.data or []
@@ -63,6 +68,8 @@ async def get_editor_dashboard(auth_token: str) -> Dict[str, Any]:
         
         return {
             "success": True,
+            "partial": bool(errors),
+            "errors": errors,
             "user": user_response.data,
             "stats": stats,
             "manuscripts": manuscripts,
@@ -74,10 +81,10 @@ async def get_editor_dashboard(auth_token: str) -> Dict[str, Any]:
         return {"success": False, "error": str(e)}
 
 @require_editor
-async def get_manuscripts_for_editor(auth_token: str) -> Dict[str, Any]:
+async def get_manuscripts_for_editor(auth_token: str = None, session: UserSession = None) -> Dict[str, Any]:
     """Get all manuscripts available for editorial review"""
     try:
-        response = await client.get_manuscripts_for_editor(auth_token)
+        response = await mirrored_query(client, "manuscripts", "manuscripts:getManuscriptsForEditor", session, auth_token)
         if not response.success:
             return {"success": False, "error": response.error}
         
@@ -181,10 +188,10 @@ async def make_editorial_decision(
         return {"success": False, "error": str(e)}
 
 @require_editor
-async def get_reviews_for_editor(auth_token: str) -> Dict[str, Any]:
+async def get_reviews_for_editor(auth_token: str = None, session: UserSession = None) -> Dict[str, Any]:
     """Get all reviews for editorial oversight"""
     try:
-        response = await client.get_reviews_for_editor(auth_token)
+        response = await mirrored_query(client, "reviews", "reviews:getReviewsForEditor", session, auth_token)
         if not response.success:
             return {"success": False, "error": response.error}
         
@@ -197,10 +204,10 @@ async def get_reviews_for_editor(auth_token: str) -> Dict[str, Any]:
         return {"success": False, "error": str(e)}
 
 @require_editor
-async def get_proofing_tasks(auth_token: str) -> Dict[str, Any]:
+async def get_proofing_tasks(auth_token: str = None, session: UserSession = None) -> Dict[str, Any]:
     """Get all proofing tasks for editorial management"""
     try:
-        response = await client.get_proofing_tasks(auth_token)
+        response = await mirrored_query(client, "proofingTasks", "proofing:getProofingTasks", session, auth_token)
         if not response.success:
             return {"success": False, "error": response.error}
         
@@ -235,34 +242,43 @@ async def upload_proofed_file(
     file_name: str,
     proofing_notes: Optional[str] = None,
     auth_token: str = None,
-    content_type: str = "application/pdf"
+    content_type: str = "application/pdf",
+    session: UserSession = None
 ) -> Dict[str, Any]:
     """Upload a proofed manuscript file"""
     try:
-        # Get upload URL
-        upload_response = await client.generate_proofed_file_upload_url(auth_token)
-        if not upload_response.success:
-            return {"success": False, "error": upload_response.error}
-        
-        upload_url = upload_response.data.get("uploadUrl")
-        if not upload_url:
-            return {"success": False, "error": "Failed to get upload URL"}
-        
-        # Decode base64 file data
-        import base64
+        # Size the decoded file and check its ends before decoding the rest;
+        # it is decoded block by block as it is sent
         try:
-            file_bytes = base64.b64decode(file_data)
-        except Exception as e:
-            return {"success": False, "error": f"Invalid file data encoding: {str(e)}"}
-        
-        # Upload file
-        file_response = await client.upload_file(upload_url, file_bytes, content_type)
-        if not file_response.success:
-            return {"success": False, "error": file_response.error}
-        
-        file_id = file_response.data.get("storageId")
-        if not file_id:
-            return {"success": False, "error": "Failed to get file ID after upload"}
+            file_data = strip_whitespace(file_data)
+            validate_file_upload(file_data, file_name, content_type)
+            file_size = decoded_length(file_data)
+            digest = sha256_base64(file_data)
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid file: {str(e)}"}
+        
+        # A retry of an upload that already went through reuses the stored file
+        content_index = get_content_index()
+        file_id = content_index.lookup(session.user_id, digest)
+        if file_id is None:
+            # Get upload URL
+            upload_response = await client.generate_proofed_file_upload_url(auth_token)
+            if not upload_response.success:
+                return {"success": False, "error": upload_response.error}
+            
+            upload_url = upload_response.data.get("uploadUrl")
+            if not upload_url:
+                return {"success": False, "error": "Failed to get upload URL"}
+            
+            # Upload file
+            file_response = await client.upload_stream(upload_url, stream_base64(file_data), content_type, file_size)
+            if not file_response.success:
+                return {"success": False, "error": file_response.error}
+            
+            file_id = file_response.data.get("storageId")
+            if not file_id:
+                return {"success": False, "error": "Failed to get file ID after upload"}
+            content_index.remember(session.user_id, digest, file_id, file_size)
         
         # Complete proofing task
         complete_response = await client.upload_proofed_file(
@@ -319,11 +335,17 @@ async def publish_article(
 @require_editor
 async def get_published_articles(
     limit: int = 20,
-    auth_token: str = None
+    auth_token: str = None,
+    session: UserSession = None
 ) -> Dict[str, Any]:
     """Get list of published articles"""
     try:
-        response = await client.get_published_articles(limit, auth_token)
+        # The mirror holds the newest MIRROR_ARTICLE_LIMIT articles
+        response = await mirrored_query(
+            client, "articles", "articles:getPublishedArticles", session, auth_token,
+            arguments={"limit": float(limit)},
+            select=lambda rows: rows[:limit] if limit <= MIRROR_ARTICLE_LIMIT else None
+        )
         if not response.success:
             return {"success": False, "error": response.error}
         
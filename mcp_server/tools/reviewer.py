@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 from pathlib import Path
 
 # Add project root to path for imports
@@ -7,25 +8,32 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from typing import Dict, List, Any, Optional
-from utils.auth_manager import require_auth, require_reviewer
+from utils.auth_manager import require_auth, require_reviewer, UserSession
 from utils.convex_client import ConvexClient
 
 # Initialize client
 client = ConvexClient()
 
 @require_reviewer
-async def get_reviewer_dashboard(auth_token: str) -> Dict[str, Any]:
+async def get_reviewer_dashboard(auth_token: str = None, session: UserSession = None) -> Dict[str, Any]:
     """Get reviewer dashboard with assigned reviews and statistics"""
     try:
-        # Get current user data
-        user_response = await client.get_current_user_data(auth_token)
-        if not user_response.success:
-            return {"success": False, "error": user_response.error}
+        # Independent reads: fetch them concurrently, each with its own timeout
+        user_response, reviews_response = await client.query_many(
+            [
+                ("userData:getCurrentUserData", None),
+                ("reviews:getAssignedReviews", None),
+            ],
+            auth_token=auth_token
+        )
         
-        # Get assigned reviews
-        reviews_response = await client.get_assigned_reviews(auth_token)
-        if not reviews_response.success:
-            return {"success": False, "error": reviews_response.error}
+        errors = {
+            name: r.error
+            for name, r in (("user", user_response), ("reviews", reviews_response))
+            if not r.success
+        }
+        if len(errors) == 2:
+            return {"success": False, "error": reviews_response.error, "errors": errors}
         
         assigned_reviews = reviews_response.data or []
         
@@ -34,12 +42,14 @@ async def get_reviewer_dashboard(auth_token: str) -> Dict[str, Any]:
         pending_reviews = [r for r in assigned_reviews if r.get('status') == 'pending']
         completed_reviews = [r for r in assigned_reviews if r.get('status') == 'submitted']
         
-        # Find overdue reviews
-        current_time = client.get_current_time()
+        # Find overdue reviews (deadlines are stored in milliseconds)
+        current_time = time.time() * 1000
         overdue_reviews = [r for r in pending_reviews if r.get('deadline', 0) < current_time]
         
         return {
             "success": True,
+            "partial": bool(errors),
+            "errors": errors,
             "user": user_response.data,
             "stats": {
                 "total_assigned": total_reviews,
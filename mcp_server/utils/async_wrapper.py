@@ -1,39 +1,69 @@
-import asyncio
 from functools import wraps
 from typing import Any, Callable, TypeVar
 
+from convex.values import json_to_convex
+
+from .client_pool import AuthenticatedClientPool
+from .convex_codec import EncodedArgs
+from .executor import get_backend_executor
+
 T = TypeVar('T')
 
+def _plain_args(arguments: dict = None) -> dict:
+    """The Python client encodes arguments itself, so undo precompiled encoding."""
+    if isinstance(arguments, EncodedArgs):
+        return json_to_convex(dict(arguments))
+    return arguments or {}
+
 def sync_to_async(func: Callable[..., T]) -> Callable[..., T]:
     """
     Decorator to safely convert synchronous functions to async.
-    Uses asyncio.to_thread() to avoid blocking the event loop.
+    Runs on the dedicated backend executor to avoid blocking the event loop
+    without competing for the loop's default thread pool.
     """
     @wraps(func)
     async def wrapper(*args, **kwargs) -> T:
-        # Use asyncio.to_thread for Python 3.9+
-        return await asyncio.to_thread(func, *args, **kwargs)
+        return await get_backend_executor().run(func, *args, **kwargs)
     return wrapper
 
 class AsyncConvexClient:
-    def __init__(self, client):
+    def __init__(self, client, client_factory: Callable[[], Any] = None):
         self.client = client
-    
+        # Authenticated calls get their own client so users never share auth state
+        self.auth_pool = AuthenticatedClientPool(self._create_authenticated_client)
+        self.client_factory = client_factory
+
+    def _create_authenticated_client(self, auth_token: str):
+        client = self.client_factory()
+        client.set_auth(auth_token)
+        return client
+
+    def _client_for(self, auth_token: str = None):
+        if auth_token and self.client_factory is not None:
+            return self.auth_pool.acquire(auth_token)
+        return self.client
+
     @sync_to_async
-    def query(self, function_name: str, arguments: dict = None):
-        return self.client.query(function_name, arguments or {})
-    
+    def query(self, function_name: str, arguments: dict = None, auth_token: str = None):
+        return self._client_for(auth_token).query(function_name, _plain_args(arguments))
+
     @sync_to_async
-    def mutation(self, function_name: str, arguments: dict = None):
-        return self.client.mutation(function_name, arguments or {})
-    
+    def mutation(self, function_name: str, arguments: dict = None, auth_token: str = None):
+        return self._client_for(auth_token).mutation(function_name, _plain_args(arguments))
+
     @sync_to_async
-    def action(self, function_name: str, arguments: dict = None):
+    def action(self, function_name: str, arguments: dict = None, auth_token: str = None):
         """
         Call a Convex action function asynchronously.
         """
-        return self.client.action(function_name, arguments or {})
-    
+        return self._client_for(auth_token).action(function_name, _plain_args(arguments))
+
     @sync_to_async
     def set_auth(self, token: str):
-        return self.client.set_auth(token)
\ No newline at end of file
+        return self.client.set_auth(token)
+
+    def get_stats(self) -> dict:
+        return {
+            "auth_pool": self.auth_pool.get_stats(),
+            "executor": get_backend_executor().get_stats(),
+        }
@@ -5,9 +5,14 @@ Handles session management and token validation.
 
 import os
 import time
-from typing import Optional, Dict, Any, List
+import heapq
+import asyncio
+import inspect
+import itertools
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 import json
-from pydantic import BaseModel
 import sys
 from pathlib import Path
 
@@ -15,25 +20,173 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from utils.convex_client import ConvexClient, get_convex_client
+from utils.convex_client import ConvexClient, get_convex_client, table_write_generation
+from utils.client_pool import hash_token
+from utils.convex_codec import dumps, loads
+from utils.session_store import SessionStore, create_session_store
+from utils.session_refresher import SessionRefresher
+from utils.token_verifier import TokenVerifier, create_token_verifier, token_user_id, unverified_claims
+
+
+# Bit per role name. Fixed: role names also arrive from callers (see
+# check_permissions), so unknown ones must not grow it
+ROLE_BITS: Dict[str, int] = {"author": 1, "reviewer": 2, "editor": 4, "admin": 8}
+
+
+def role_mask(roles: Iterable[str]) -> int:
+    """Bitmask for a set of role names; unknown names add no bit, so checks for them fail."""
+    mask = 0
+    for role in roles:
+        mask |= ROLE_BITS.get(role, 0)
+    return mask
+
+
+class UserSession:
+    """
+    User session data.
+
+    Slotted to keep the per-session footprint small. Roles keep their
+    order for display and are mirrored in `role_mask`, so permission checks
+    are a single AND against a mask compiled ahead of time.
+    """
+
+    __slots__ = (
+        "user_id", "email", "name", "_roles", "role_mask", "auth_token",
+        "expires_at", "validated_at", "roles_generation", "last_used",
+    )
+
+    def __init__(
+        self,
+        user_id: str,
+        email: str,
+        name: str,
+        roles: Iterable[str],
+        auth_token: str,
+        expires_at: float,
+        validated_at: float = 0.0,
+        roles_generation: int = 0,
+        last_used: float = 0.0,
+    ):
+        self.user_id = user_id
+        self.email = email
+        self.name = name
+        self.roles = roles
+        self.auth_token = auth_token
+        self.expires_at = expires_at
+        # When Convex last confirmed the token, and the userData write
+        # generation the roles were read at
+        self.validated_at = validated_at
+        self.roles_generation = roles_generation
+        # Last successful validation; idle sessions are not refreshed
+        self.last_used = last_used
+
+    @property
+    def roles(self) -> tuple:
+        return self._roles
+
+    @roles.setter
+    def roles(self, roles: Iterable[str]):
+        self._roles = tuple(roles)
+        self.role_mask = role_mask(self._roles)
+
+    def has_any_role(self, mask: int) -> bool:
+        """Whether the session holds any role in `mask` (see role_mask)."""
+        return bool(self.role_mask & mask)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain fields, as accepted by the constructor."""
+        return {
+            "user_id": self.user_id,
+            "email": self.email,
+            "name": self.name,
+            "roles": list(self._roles),
+            "auth_token": self.auth_token,
+            "expires_at": self.expires_at,
+            "validated_at": self.validated_at,
+            "roles_generation": self.roles_generation,
+            "last_used": self.last_used,
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """Fields for a session store: the token's hash in place of the token."""
+        record = self.to_dict()
+        record["token_hash"] = hash_token(record.pop("auth_token"))
+        return record
+
+    def __repr__(self) -> str:
+        return f"UserSession(user_id={self.user_id!r}, email={self.email!r}, roles={list(self._roles)!r})"
 
 
-class UserSession(BaseModel):
-    """User session data."""
-    user_id: str
-    email: str
-    name: str
-    roles: List[str]
-    auth_token: str
-    expires_at: float
-    
 
 class AuthManager:
-    """Manages authentication sessions for MCP tools."""
+    """
+    Manages authentication sessions for MCP tools.
+
+    Sessions are indexed by token hash and by email so lookups on the
+    require_auth path stay O(1) however many sessions are active. All
+    changes go through _add_session/_remove_session to keep the indexes
+    consistent.
+
+    Expiry is tracked in a heap ordered by expires_at. A background task,
+    started on the server's loop with the first session, pops expired
+    entries (O(log n) each) instead of scanning every session, and the
+    soonest-expiring sessions are evicted when MCP_MAX_SESSIONS is reached.
+    A second task refreshes sessions that are still in use shortly before
+    they expire (see SessionRefresher).
+
+    When CONVEX_AUTH_JWKS is configured, tokens are verified locally
+    against the deployment's signing keys and Convex is only asked again
+    once CONVEX_AUTH_REVALIDATE_SECONDS have passed since it last
+    confirmed the token, or when roles may have changed.
+
+    With a SESSION_STORE backend, sessions are written through to it and
+    the indexes above act as this worker's read cache. A cached session is
+    re-read from a shared store once SESSION_CACHE_TTL seconds old, so a
+    logout or role refresh on another worker is seen within that window.
+
+    Logins take one round trip when the user's name and roles are already
+    known: the user id comes from the new token's claims, and the profile
+    from a short-lived cache of loggedInUser results or from the user's
+    most recent session, including one in a shared store.
+    """
     
-    def __init__(self):
+    def __init__(self, store: Optional[SessionStore] = None):
         self.sessions: Dict[str, UserSession] = {}
+        # token hash -> session key
+        self._token_index: Dict[str, str] = {}
+        # email -> session keys (dict used as an insertion-ordered set)
+        self._email_index: Dict[str, Dict[str, None]] = {}
+        # (expires_at, seq, session_key, session); entries whose session was
+        # removed or replaced are skipped when popped
+        self._expiry_heap: List[tuple] = []
+        self._expiry_seq = itertools.count()
+        self.max_sessions = int(os.getenv("MCP_MAX_SESSIONS", "100000"))
+        self.sweep_interval = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+        self._sweeper: Optional[asyncio.Task] = None
+        self.refresher = SessionRefresher(self.refresh_session, self.sessions.get)
+        self.sessions_expired = 0
+        self.sessions_evicted = 0
+        self.eviction_rate = 0.0
+        self._rate_window_start = time.monotonic()
+        self._rate_window_removed = 0
+        self.store: Optional[SessionStore] = store if store is not None else create_session_store()
+        self.cache_ttl = float(os.getenv("SESSION_CACHE_TTL", "5"))
+        # session key -> when it was last read from or written to the store
+        self._cached_at: Dict[str, float] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.store_error: Optional[str] = None
         self.convex_client: Optional[ConvexClient] = None
+        self.verifier: Optional[TokenVerifier] = create_token_verifier()
+        self.revalidate_after = float(os.getenv("CONVEX_AUTH_REVALIDATE_SECONDS", "300"))
+        self.local_validations = 0
+        self.remote_validations = 0
+        # user id -> (fetched_at, userData write generation, name, roles)
+        self._user_cache: "OrderedDict[str, Tuple[float, int, str, tuple]]" = OrderedDict()
+        self.user_cache_ttl = float(os.getenv("USER_DATA_CACHE_TTL", "300"))
+        self.user_cache_size = int(os.getenv("USER_DATA_CACHE_SIZE", "10000"))
+        self.logins_single_trip = 0
+        self.logins_two_trips = 0
         
     async def get_client(self) -> ConvexClient:
         """Get or create Convex client."""
@@ -43,7 +196,125 @@ class AuthManager:
     
     def _generate_session_key(self, email: str, auth_token: str) -> str:
         """Generate session key."""
-        return f"{email}:{auth_token[:16]}"
+        # Token prefixes are shared by every JWT from the same issuer, so use the full hash
+        return f"{email}:{hash_token(auth_token)}"
+
+    def _add_session(self, session: UserSession):
+        """Store a session and index it."""
+        token_hash = hash_token(session.auth_token)
+        session_key = f"{session.email}:{token_hash}"
+        existing = self.sessions.get(session_key)
+        if existing is not None:
+            self._remove_session(existing)
+        self.sessions[session_key] = session
+        self._token_index[token_hash] = session_key
+        self._email_index.setdefault(session.email, {})[session_key] = None
+        heapq.heappush(self._expiry_heap, (session.expires_at, next(self._expiry_seq), session_key, session))
+        self.refresher.schedule(session_key, session)
+        if len(self.sessions) > self.max_sessions:
+            self._evict_for_capacity()
+        self._start_sweeper()
+
+    def _pop_live_entry(self) -> Optional[tuple]:
+        """Pop the earliest heap entry that still belongs to a stored session."""
+        heap = self._expiry_heap
+        while heap:
+            entry = heapq.heappop(heap)
+            expires_at, _, session_key, session = entry
+            if self.sessions.get(session_key) is not session:
+                continue
+            if session.expires_at > expires_at:
+                # Extended by refresh_session; requeue at the new expiry
+                heapq.heappush(heap, (session.expires_at, next(self._expiry_seq), session_key, session))
+                continue
+            return entry
+        return None
+
+    def _expire_due(self, now: Optional[float] = None) -> int:
+        """Remove every session whose expiry has passed."""
+        now = time.time() if now is None else now
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            entry = self._pop_live_entry()
+            if entry is None:
+                break
+            if entry[0] > now:
+                heapq.heappush(self._expiry_heap, entry)
+                break
+            self._remove_session(entry[3])
+            removed += 1
+        self.sessions_expired += removed
+        self._record_removals(removed)
+        # Logouts and replaced sessions leave stale entries behind
+        if len(self._expiry_heap) > 2 * len(self.sessions) + 1024:
+            self._expiry_heap = [e for e in self._expiry_heap if self.sessions.get(e[2]) is e[3]]
+            heapq.heapify(self._expiry_heap)
+        return removed
+
+    def _evict_for_capacity(self):
+        """Drop the soonest-expiring sessions until under max_sessions."""
+        removed = 0
+        while len(self.sessions) > self.max_sessions:
+            entry = self._pop_live_entry()
+            if entry is None:
+                break
+            self._remove_session(entry[3])
+            removed += 1
+        self.sessions_evicted += removed
+        self._record_removals(removed)
+
+    def _record_removals(self, count: int):
+        """Track removals per second over sweep-interval windows."""
+        self._rate_window_removed += count
+        elapsed = time.monotonic() - self._rate_window_start
+        if elapsed >= self.sweep_interval:
+            self.eviction_rate = self._rate_window_removed / elapsed
+            self._rate_window_start += elapsed
+            self._rate_window_removed = 0
+
+    def _start_sweeper(self):
+        """Start the expiry sweeper and refresher on the running loop, once."""
+        self.refresher.start()
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._sweeper = loop.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        while True:
+            now = time.time()
+            self._expire_due(now)
+            if self.store is not None:
+                try:
+                    await self.store.expire(now)
+                    self.store_error = None
+                except Exception as e:
+                    self.store_error = str(e)
+            delay = self.sweep_interval
+            if self._expiry_heap:
+                # Batch expiries that fall close together
+                delay = min(delay, max(self._expiry_heap[0][0] - now, 1.0))
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        """Stop the sweeper and close the session store."""
+        await self.stop_sweeper()
+        if self.store is not None:
+            await self.store.close()
+
+    async def stop_sweeper(self):
+        """Cancel the background sweeper and refresher."""
+        await self.refresher.stop()
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
     
     async def authenticate_user(self, email: str, password: str) -> Optional[UserSession]:
         """Authenticate user and create session."""
@@ -59,90 +330,247 @@ class AuthManager:
             return None
             
         auth_token = auth_data["tokens"]["token"]
-        
-        # Get user details
-        user_response = await client.get_current_user(auth_token)
-        if not user_response.success:
-            return None
-            
-        user_data = user_response.data
-        if not user_data:
-            return None
+        generation = table_write_generation("userData")
+
+        # The token names the user; skip the profile query if it is cached
+        claims = unverified_claims(auth_token)
+        user_id = token_user_id(claims) if claims else None
+        profile = await self._cached_profile(user_id, email) if user_id else None
+        now = time.time()
+        if profile is not None:
+            self.logins_single_trip += 1
+            # The roles are only as fresh as the cached profile
+            validated_at, name, roles = profile
+        else:
+            # Get user details
+            user_response = await client.get_current_user(auth_token)
+            if not user_response.success:
+                return None
+                
+            user_data = user_response.data
+            if not user_data:
+                return None
+            self.logins_two_trips += 1
+            self._remember_profile(user_data, generation)
+            user_id = user_data.get("_id", "")
+            email = user_data.get("email", email)
+            name = user_data.get("name", "")
+            roles = user_data.get("userData", {}).get("roles", ["author"])
+            validated_at = now
             
-        # Create session
+        # Create session; logging in counts as use, so the refresher
+        # keeps it warm until it actually goes idle
         session = UserSession(
-            user_id=user_data.get("_id", ""),
-            email=user_data.get("email", email),
-            name=user_data.get("name", ""),
-            roles=user_data.get("userData", {}).get("roles", ["author"]),
+            user_id=user_id,
+            email=email,
+            name=name,
+            roles=roles,
             auth_token=auth_token,
-            expires_at=time.time() + 24 * 3600  # 24 hours
+            expires_at=now + 24 * 3600,  # 24 hours
+            validated_at=validated_at,
+            roles_generation=generation,
+            last_used=now,
         )
         
-        session_key = self._generate_session_key(email, auth_token)
-        self.sessions[session_key] = session
+        self._add_session(session)
+        await self._save(session)
         
         return session
+
+    def _remember_profile(self, user_data: Dict[str, Any], generation: int):
+        """Cache name and roles from a loggedInUser result."""
+        user_id = user_data.get("_id")
+        if not user_id:
+            return
+        roles = tuple(user_data.get("userData", {}).get("roles", ["author"]))
+        self._user_cache[user_id] = (time.time(), generation, user_data.get("name", ""), roles)
+        self._user_cache.move_to_end(user_id)
+        while len(self._user_cache) > self.user_cache_size:
+            self._user_cache.popitem(last=False)
+
+    async def _cached_profile(self, user_id: str, email: str) -> Optional[Tuple[float, str, tuple]]:
+        """
+        When they were fetched, name and roles for a user, if known recently
+        enough to skip loggedInUser.
+
+        Entries older than USER_DATA_CACHE_TTL, or read before a userData
+        write went through this process, are not used.
+        """
+        now = time.time()
+        generation = table_write_generation("userData")
+        entry = self._user_cache.get(user_id)
+        if entry is not None and now - entry[0] <= self.user_cache_ttl and entry[1] == generation:
+            return entry[0], entry[2], entry[3]
+        session = await self.get_session_by_email(email)
+        if (
+            session is not None
+            and session.user_id == user_id
+            and now - session.validated_at <= self.user_cache_ttl
+            and session.roles_generation == generation
+        ):
+            return session.validated_at, session.name, session.roles
+        return None
+
+    async def _save(self, session: UserSession):
+        """Write a session through to the store."""
+        if self.store is None:
+            return
+        record = session.to_record()
+        await self.store.put(record["token_hash"], session.email, session.expires_at, dumps(record))
+        self._cached_at[f"{session.email}:{record['token_hash']}"] = time.monotonic()
+
+    def _load(self, record: bytes, auth_token: Optional[str] = None) -> Optional[UserSession]:
+        """
+        Session from a store record.
+
+        Stores only hold the token's hash. Given the token the record was
+        looked up by, the session is checked against it and cached; None if
+        the record is for another token. Without it, the session is only
+        good for its profile: it carries no token and is not cached.
+        """
+        fields = loads(record)
+        token_hash = fields.pop("token_hash", None)
+        # Records written before tokens were left out of the store
+        fields.pop("auth_token", None)
+        if auth_token is not None and hash_token(auth_token) != token_hash:
+            return None
+        session = UserSession(auth_token=auth_token or "", **fields)
+        # Write generations are per process; only changes seen here matter
+        session.roles_generation = table_write_generation("userData")
+        if auth_token is not None:
+            self._add_session(session)
+            self._cached_at[f"{session.email}:{token_hash}"] = time.monotonic()
+        return session
+
+    def _is_fresh(self, session_key: str) -> bool:
+        """Whether a cached session can be used without re-reading the store."""
+        if self.store is None or not self.store.shared:
+            return True
+        return time.monotonic() - self._cached_at.get(session_key, 0.0) < self.cache_ttl
     
     async def get_session_by_token(self, auth_token: str) -> Optional[UserSession]:
         """Get session by auth token."""
-        for session in self.sessions.values():
-            if session.auth_token == auth_token:
-                # Check if session is still valid
-                if session.expires_at > time.time():
+        token_hash = hash_token(auth_token)
+        session_key = self._token_index.get(token_hash)
+        if session_key is not None:
+            session = self.sessions[session_key]
+            # Check if session is still valid
+            if session.expires_at > time.time():
+                if self._is_fresh(session_key):
+                    self.cache_hits += 1
                     return session
-                else:
-                    # Remove expired session
-                    self._remove_session(session)
-                    break
-        return None
+            else:
+                # Remove expired session
+                self._remove_session(session)
+                self.sessions_expired += 1
+                self._record_removals(1)
+                if self.store is None or not self.store.shared:
+                    return None
+        if self.store is None:
+            return None
+        self.cache_misses += 1
+        record = await self.store.get(token_hash)
+        if record is None:
+            if session_key is not None and session_key in self.sessions:
+                # Logged out or expired elsewhere
+                self._remove_session(self.sessions[session_key])
+            return None
+        return self._load(record, auth_token)
     
     async def get_session_by_email(self, email: str) -> Optional[UserSession]:
-        """Get active session by email."""
-        for session in self.sessions.values():
-            if session.email == email and session.expires_at > time.time():
+        """Get active session by email; one read from the store has no auth_token (see _load)."""
+        now = time.time()
+        for session_key in self._email_index.get(email, ()):
+            session = self.sessions[session_key]
+            if session.expires_at > now and self._is_fresh(session_key):
                 return session
-        return None
+        if self.store is None:
+            return None
+        record = await self.store.get_by_email(email)
+        return self._load(record) if record is not None else None
     
     def _remove_session(self, session: UserSession):
-        """Remove session."""
-        session_key = self._generate_session_key(session.email, session.auth_token)
-        if session_key in self.sessions:
-            del self.sessions[session_key]
+        """Remove session and its index entries."""
+        token_hash = hash_token(session.auth_token)
+        session_key = f"{session.email}:{token_hash}"
+        if self.sessions.pop(session_key, None) is None:
+            return
+        self._cached_at.pop(session_key, None)
+        self._token_index.pop(token_hash, None)
+        keys = self._email_index.get(session.email)
+        if keys is not None:
+            keys.pop(session_key, None)
+            if not keys:
+                del self._email_index[session.email]
     
+    async def _discard(self, session: UserSession):
+        """Remove a session here and from the store."""
+        self._remove_session(session)
+        self.refresher.discard(f"{session.email}:{hash_token(session.auth_token)}")
+        if self.store is not None:
+            await self.store.delete(hash_token(session.auth_token), session.email)
+
     async def logout_user(self, auth_token: str) -> bool:
         """Logout user and remove session."""
         session = await self.get_session_by_token(auth_token)
         if session:
-            self._remove_session(session)
+            await self._discard(session)
+            client = await self.get_client()
+            client.release_auth(auth_token)
             return True
         return False
     
+    async def _validate_locally(self, session: UserSession) -> bool:
+        """Whether the session can be trusted without asking Convex."""
+        if self.verifier is None:
+            return False
+        if time.time() - session.validated_at > self.revalidate_after:
+            return False
+        if session.roles_generation != table_write_generation("userData"):
+            # A role change went through this server; re-read it
+            return False
+        claims = await self.verifier.verify(session.auth_token)
+        if claims is None:
+            return False
+        return token_user_id(claims) == session.user_id
+
     async def validate_token(self, auth_token: str) -> Optional[UserSession]:
         """Validate auth token and return session."""
         session = await self.get_session_by_token(auth_token)
         if session:
-            # Optionally refresh token with Convex
+            if await self._validate_locally(session):
+                self.local_validations += 1
+                session.last_used = time.time()
+                return session
+            self.remote_validations += 1
+            generation = table_write_generation("userData")
             client = await self.get_client()
             user_response = await client.get_current_user(auth_token)
-            if user_response.success:
+            if user_response.success and user_response.data:
+                user_data = user_response.data
+                self._remember_profile(user_data, generation)
+                session.roles = user_data.get("userData", {}).get("roles", session.roles)
+                session.validated_at = time.time()
+                session.roles_generation = generation
+                session.last_used = time.time()
+                await self._save(session)
                 return session
             else:
                 # Token invalid, remove session
-                self._remove_session(session)
+                await self._discard(session)
         return None
     
     def check_permission(self, session: UserSession, required_role: str) -> bool:
         """Check if user has required role."""
         if required_role == "any":
             return True
-        return required_role in session.roles
+        return session.has_any_role(role_mask([required_role]))
     
     def check_permissions(self, session: UserSession, required_roles: List[str]) -> bool:
         """Check if user has any of the required roles."""
         if "any" in required_roles:
             return True
-        return any(role in session.roles for role in required_roles)
+        return session.has_any_role(role_mask(required_roles))
     
     async def refresh_session(self, auth_token: str) -> Optional[UserSession]:
         """Refresh session data from Convex."""
@@ -150,39 +578,61 @@ class AuthManager:
         if not session:
             return None
             
+        generation = table_write_generation("userData")
         client = await self.get_client()
         user_response = await client.get_current_user(auth_token)
         if not user_response.success:
-            self._remove_session(session)
+            await self._discard(session)
             return None
             
         user_data = user_response.data
         if not user_data:
-            self._remove_session(session)
+            await self._discard(session)
             return None
+        self._remember_profile(user_data, generation)
             
         # Update session with fresh data
         session.name = user_data.get("name", session.name)
         session.roles = user_data.get("userData", {}).get("roles", session.roles)
         session.expires_at = time.time() + 24 * 3600  # Extend expiry
+        session.validated_at = time.time()
+        session.roles_generation = generation
+        # Re-queue at the new expiry and publish to other workers
+        self._add_session(session)
+        await self._save(session)
         
         return session
     
     def cleanup_expired_sessions(self):
         """Remove expired sessions."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, session in self.sessions.items()
-            if session.expires_at <= current_time
-        ]
-        for key in expired_keys:
-            del self.sessions[key]
+        self._expire_due()
     
     def get_session_count(self) -> int:
         """Get number of active sessions."""
-        self.cleanup_expired_sessions()
+        self._expire_due()
         return len(self.sessions)
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Session count and how tokens were validated."""
+        return {
+            "sessions": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "sessions_expired": self.sessions_expired,
+            "sessions_evicted": self.sessions_evicted,
+            "eviction_rate": round(self.eviction_rate, 3),
+            "store": self.store.name if self.store else "memory",
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "store_error": self.store_error,
+            "local_validations": self.local_validations,
+            "remote_validations": self.remote_validations,
+            "logins_single_trip": self.logins_single_trip,
+            "logins_two_trips": self.logins_two_trips,
+            "profiles_cached": len(self._user_cache),
+            "refresher": self.refresher.get_stats(),
+            "verifier": self.verifier.get_stats() if self.verifier else None,
+        }
+
 
 # Global auth manager instance
 _auth_manager: Optional[AuthManager] = None
@@ -196,16 +646,36 @@ def get_auth_manager() -> AuthManager:
     return _auth_manager
 
 
+async def cleanup_auth_manager():
+    """Stop the global auth manager's sweeper and close its store."""
+    if _auth_manager is not None:
+        await _auth_manager.close()
+
+
 # Decorator for tools that require authentication
 def require_auth(required_roles: List[str] = None):
     """Decorator to require authentication for MCP tools."""
     if required_roles is None:
         required_roles = ["any"]
+    # Compiled once per decorated tool rather than on every call
+    allow_any = "any" in required_roles
+    required_mask = role_mask(r for r in required_roles if r != "any")
+    denied_message = f"Insufficient permissions: requires one of {list(required_roles)}"
         
     def decorator(func):
+        # Resolved once: tools take auth_token positionally or by keyword,
+        # and not all of them accept an injected session
+        parameters = list(inspect.signature(func).parameters)
+        token_position = parameters.index("auth_token") if "auth_token" in parameters else None
+        accepts_session = "session" in parameters
+
+        @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Extract auth_token from kwargs
+            # Extract auth_token wherever it was passed; the tool call's
+            # deadline travels with the context into the validation below
             auth_token = kwargs.get("auth_token")
+            if auth_token is None and token_position is not None and token_position < len(args):
+                auth_token = args[token_position]
             if not auth_token:
                 raise ValueError("Authentication required: auth_token parameter missing")
             
@@ -216,11 +686,12 @@ def require_auth(required_roles: List[str] = None):
                 raise ValueError("Authentication failed: invalid or expired token")
                 
             # Check permissions
-            if not auth_manager.check_permissions(session, required_roles):
-                raise ValueError(f"Insufficient permissions: requires one of {required_roles}")
+            if not allow_any and not session.role_mask & required_mask:
+                raise ValueError(denied_message)
             
             # Add session to kwargs
-            kwargs["session"] = session
+            if accepts_session:
+                kwargs["session"] = session
             
             # Call original function
             return await func(*args, **kwargs)
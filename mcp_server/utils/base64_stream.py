@@ -0,0 +1,73 @@
+"""
+Incremental base64 decoding for MCP server.
+Turns base64 text into bounded blocks of bytes instead of one full copy.
+"""
+
+import os
+import binascii
+from typing import AsyncIterator, Iterator
+
+# Decoded bytes per block handed to the upload body
+BLOCK_SIZE = int(os.getenv("UPLOAD_BLOCK_SIZE", "262144"))
+
+_WHITESPACE = " \t\r\n"
+_DROP_WHITESPACE = {ord(c): None for c in _WHITESPACE}
+
+
+def strip_whitespace(text: str) -> str:
+    """Drop line breaks and spaces (as in MIME-wrapped base64); no copy if there are none."""
+    if any(c in text for c in _WHITESPACE):
+        return text.translate(_DROP_WHITESPACE)
+    return text
+
+
+def decoded_length(text: str) -> int:
+    """Exact number of bytes whitespace-free, padded base64 `text` decodes to."""
+    if len(text) % 4:
+        raise ValueError("Invalid base64 data: length is not a multiple of 4")
+    padding = 2 if text.endswith("==") else 1 if text.endswith("=") else 0
+    return len(text) // 4 * 3 - padding
+
+
+class Base64Decoder:
+    """
+    Decodes base64 text fed in pieces of any length.
+
+    Output comes in blocks of at most `block_size` bytes, each decoded from
+    a slice of the input, so the decoded data never exists as one copy.
+    Characters that do not complete a 4-character group are kept for the
+    next piece. Decoding is strict: characters outside the base64 alphabet
+    raise binascii.Error, as does anything after a padded group, which can
+    only be the last one.
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self.step = max(block_size // 3, 1) * 4
+        self.carry = ""
+        self.padded = False
+
+    def feed(self, text: str) -> Iterator[bytes]:
+        text = self.carry + strip_whitespace(text)
+        whole = len(text) - len(text) % 4
+        self.carry = text[whole:]
+        if self.padded and text:
+            raise binascii.Error("Excess data after padding")
+        for start in range(0, whole, self.step):
+            end = min(start + self.step, whole)
+            if self.padded:
+                raise binascii.Error("Excess data after padding")
+            yield binascii.a2b_base64(text[start:end], strict_mode=True)
+            self.padded = text[end - 1] == "="
+
+    def close(self):
+        """Raise if the input stopped part way through a group."""
+        if self.carry:
+            raise ValueError("Invalid base64 data: ends in the middle of a group")
+
+
+async def stream_base64(text: str, block_size: int = BLOCK_SIZE) -> AsyncIterator[bytes]:
+    """Decoded blocks of `text`, as an async request body."""
+    decoder = Base64Decoder(block_size)
+    for block in decoder.feed(text):
+        yield block
+    decoder.close()
@@ -0,0 +1,135 @@
+"""
+Authenticated client pool for MCP server.
+Keeps one backend client per auth token so concurrent users never share auth state.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+def close_client(client: Any):
+    """Close a client that has a close(); others release their connection when dropped."""
+    close = getattr(client, "close", None)
+    if close is not None:
+        close()
+
+
+def hash_token(auth_token: str) -> str:
+    """Stable, non-reversible key for an auth token."""
+    return hashlib.sha256(auth_token.encode()).hexdigest()
+
+
+class AuthenticatedClientPool:
+    """
+    Bounded LRU pool of authenticated clients keyed by token.
+
+    Clients idle for longer than `idle_ttl` seconds are evicted on the next
+    acquire. Every client the pool lets go is passed to `close`, outside
+    the lock. Safe to use from worker threads.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        max_size: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        close: Callable[[Any], None] = close_client,
+    ):
+        self.factory = factory
+        self.close = close
+        self.max_size = max_size or int(os.getenv("CONVEX_AUTH_POOL_SIZE", "256"))
+        self.idle_ttl = idle_ttl or float(os.getenv("CONVEX_AUTH_POOL_IDLE_TTL", "300"))
+        self._clients: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, auth_token: str) -> Any:
+        """Return the client authenticated as `auth_token`, creating it if needed."""
+        key = hash_token(auth_token)
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                self.hits += 1
+                entry[1] = now
+                self._clients.move_to_end(key)
+                client = entry[0]
+            else:
+                self.misses += 1
+                client = None
+        self._close_all(evicted)
+        if client is not None:
+            return client
+
+        # Build outside the lock: creating a client may touch the network
+        client = self.factory(auth_token)
+        evicted = []
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                # Another thread won the race; keep its client
+                entry[1] = now
+                self._clients.move_to_end(key)
+                evicted.append(client)
+                client = entry[0]
+            else:
+                self._clients[key] = [client, now]
+                while len(self._clients) > self.max_size:
+                    evicted.append(self._clients.popitem(last=False)[1][0])
+                    self.evictions += 1
+        self._close_all(evicted)
+        return client
+
+    def _evict_idle(self, now: float) -> List[Any]:
+        """Drop clients unused for longer than idle_ttl (oldest first); returns them."""
+        evicted = []
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self.idle_ttl:
+                break
+            del self._clients[key]
+            evicted.append(client)
+            self.evictions += 1
+        return evicted
+
+    def _close_all(self, clients: List[Any]):
+        for client in clients:
+            try:
+                self.close(client)
+            except Exception:
+                # A client that fails to close is gone from the pool either way
+                pass
+
+    def discard(self, auth_token: str):
+        """Remove and close the client for a token, e.g. after logout."""
+        with self._lock:
+            entry = self._clients.pop(hash_token(auth_token), None)
+        if entry is not None:
+            self._close_all([entry[0]])
+
+    def clear(self):
+        """Drop and close every pooled client."""
+        with self._lock:
+            clients = [entry[0] for entry in self._clients.values()]
+            self._clients.clear()
+        self._close_all(clients)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and hit/miss/eviction counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
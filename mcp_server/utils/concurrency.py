@@ -0,0 +1,226 @@
+"""
+Adaptive concurrency limits for MCP server.
+Caps in-flight tool calls per tool and in total, queues a few and sheds the rest.
+"""
+
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from mcp import McpError
+from mcp.types import CallToolRequestParams, CallToolResult, ErrorData
+
+from .deadline import DeadlineExceededError, track_expiry
+
+
+class OverloadedError(McpError):
+    """Returned instead of running a tool call the server has no room for."""
+
+    def __init__(self, message: str):
+        super().__init__(ErrorData(code=-32000, message=message))
+
+
+class ConcurrencyLimit:
+    """
+    In-flight slots with a bounded FIFO of waiters.
+
+    A call that finds no free slot waits in the queue for at most
+    `queue_timeout` seconds; one that finds the queue full is refused at
+    once. Freed slots go straight to the oldest waiter, and `limit` can be
+    changed at any time.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot; False if the call should be shed."""
+        if self.inflight < self.limit and not self.waiters:
+            self.inflight += 1
+            self.admitted += 1
+            return True
+        if len(self.waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+            self.timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the caller gave up
+                self.release()
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.inflight -= 1
+        self._wake()
+
+    def set_limit(self, limit: int):
+        self.limit = limit
+        self._wake()
+
+    def _wake(self):
+        while self.waiters and self.inflight < self.limit:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "inflight": self.inflight,
+            "queue": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+            "queue_timeouts": self.timed_out,
+        }
+
+
+class GradientLimit:
+    """
+    Concurrency limit that follows latency.
+
+    Compares a short moving average of call latency (about 10 calls) with
+    the best latency seen recently, which is allowed to creep up by 0.1%
+    per call so the baseline recovers if the backend really gets slower.
+    While calls take less than `tolerance` times the baseline the limit
+    grows by about the square root of itself; beyond that it shrinks in
+    proportion, by at most half per update. Updates are smoothed, a call
+    that is cancelled or times out cuts the limit by a tenth, and the limit
+    only grows while at least half of it is in use.
+    """
+
+    def __init__(self, initial: float, min_limit: float, max_limit: float, tolerance: float = 2.0, smoothing: float = 0.2):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.short_latency = 0.0
+        self.min_latency = 0.0
+
+    def update(self, latency: float, inflight: int, dropped: bool = False) -> float:
+        if dropped:
+            self.limit = max(self.min_limit, self.limit * 0.9)
+            return self.limit
+        if not self.min_latency:
+            self.short_latency = self.min_latency = latency
+        else:
+            self.short_latency += (latency - self.short_latency) * 0.1
+            self.min_latency = min(self.min_latency * 1.001, latency)
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.min_latency / max(self.short_latency, 1e-9)))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        if target > self.limit and inflight < self.limit / 2:
+            return self.limit
+        limit = self.limit * (1 - self.smoothing) + target * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+        return self.limit
+
+
+class ConcurrencyLimitMiddleware(Middleware):
+    """
+    Admission control for tool calls.
+
+    Every tool has its own adaptive limit (see GradientLimit), and all
+    tools together share a fixed `max_inflight`. A call first takes a slot
+    for its tool, then a total slot, queueing briefly for either; when a
+    queue is full or the wait times out the call fails immediately with
+    OverloadedError instead of adding to the backlog.
+    """
+
+    def __init__(
+        self,
+        max_inflight: Optional[int] = None,
+        initial: Optional[int] = None,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        tolerance: Optional[float] = None,
+    ):
+        self.initial = initial or int(os.getenv("MCP_TOOL_CONCURRENCY_INITIAL", "16"))
+        self.min_limit = min_limit or int(os.getenv("MCP_TOOL_CONCURRENCY_MIN", "2"))
+        self.max_limit = max_limit or int(os.getenv("MCP_TOOL_CONCURRENCY_MAX", "128"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("MCP_QUEUE_SIZE", "64"))
+        self.queue_timeout = queue_timeout if queue_timeout is not None else float(os.getenv("MCP_QUEUE_TIMEOUT", "1.0"))
+        self.tolerance = tolerance or float(os.getenv("MCP_LATENCY_TOLERANCE", "2.0"))
+        self.total = ConcurrencyLimit(
+            max_inflight or int(os.getenv("MCP_MAX_INFLIGHT", "256")), self.max_queue, self.queue_timeout
+        )
+        self.tools: Dict[str, Tuple[ConcurrencyLimit, GradientLimit]] = {}
+
+    def _tool(self, name: str) -> Tuple[ConcurrencyLimit, GradientLimit]:
+        entry = self.tools.get(name)
+        if entry is None:
+            entry = (
+                ConcurrencyLimit(self.initial, self.max_queue, self.queue_timeout),
+                GradientLimit(self.initial, self.min_limit, self.max_limit, self.tolerance),
+            )
+            self.tools[name] = entry
+        return entry
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[CallToolRequestParams],
+        call_next: CallNext[CallToolRequestParams, CallToolResult],
+    ) -> CallToolResult:
+        name = context.message.name
+        slots, gradient = self._tool(name)
+        if not await slots.acquire():
+            raise OverloadedError(f"Server overloaded: {name} is at its limit of {slots.limit} concurrent calls; retry shortly")
+        try:
+            if not await self.total.acquire():
+                raise OverloadedError(f"Server overloaded: {self.total.limit} calls in progress; retry shortly")
+            start = time.monotonic()
+            dropped = True
+            try:
+                with track_expiry() as expiry:
+                    result = await call_next(context)
+                # An expired tool returns an error result; it still counts as a drop
+                dropped = expiry.expired
+                return result
+            except (asyncio.CancelledError, asyncio.TimeoutError, DeadlineExceededError):
+                raise
+            except Exception:
+                # Tool errors (bad arguments, auth) say nothing about load
+                dropped = False
+                raise
+            finally:
+                self.total.release()
+                gradient.update(time.monotonic() - start, slots.inflight, dropped)
+                slots.set_limit(max(int(gradient.limit), 1))
+        finally:
+            slots.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total": self.total.get_stats(),
+            "tools": {name: slots.get_stats() for name, (slots, _) in self.tools.items()},
+        }
@@ -0,0 +1,87 @@
+"""
+Content-addressed upload index for MCP server.
+Remembers which stored file holds which bytes, so a repeated upload is skipped.
+"""
+
+import os
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .base64_stream import Base64Decoder
+
+
+def sha256_blocks(blocks: Iterable[bytes]) -> str:
+    """Hex SHA-256 of data arriving in blocks."""
+    hasher = hashlib.sha256()
+    for block in blocks:
+        hasher.update(block)
+    return hasher.hexdigest()
+
+
+def sha256_base64(text: str) -> str:
+    """Hex SHA-256 of the bytes base64 `text` decodes to, decoded block by block."""
+    decoder = Base64Decoder()
+    digest = sha256_blocks(decoder.feed(text))
+    decoder.close()
+    return digest
+
+
+class ContentIndex:
+    """
+    storageId by (uploader, SHA-256 of the file), most recent first.
+
+    Entries are scoped to the user who uploaded the file, so a hash can
+    never be used to attach someone else's file. They are kept for `ttl`
+    seconds, and beyond `max_entries` the least recently used go first.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv("UPLOAD_DEDUP_TTL", "3600"))
+        self.max_entries = max_entries or int(os.getenv("UPLOAD_DEDUP_SIZE", "10000"))
+        # (owner, digest) -> (stored_at, storage_id, size)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def lookup(self, owner: str, digest: str) -> Optional[str]:
+        """storageId of an earlier upload of the same bytes by `owner`, counting the bytes saved."""
+        key = (owner, digest)
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.bytes_saved += entry[2]
+        return entry[1]
+
+    def remember(self, owner: str, digest: str, storage_id: str, size: int):
+        key = (owner, digest)
+        self._entries[key] = (time.time(), storage_id, size)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+# Global content index
+_content_index: Optional[ContentIndex] = None
+
+
+def get_content_index() -> ContentIndex:
+    """Get global content index."""
+    global _content_index
+    if _content_index is None:
+        _content_index = ContentIndex()
+    return _content_index
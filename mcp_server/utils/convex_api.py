@@ -0,0 +1,1046 @@
+"""
+Typed Convex API for MCP server.
+Generated by scripts/generate_convex_api.py from convex/_generated/api.d.ts,
+convex/*.ts and convex/schema.ts. Do not edit by hand.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, TypedDict, Union
+
+from convex.values import convex_to_json
+
+from .convex_codec import EncodedArgs
+
+if TYPE_CHECKING:
+    from .convex_client import ConvexResponse
+
+MODULES = ("admin", "articles", "auth", "crons", "http", "manuscripts", "mcp", "proofing", "reviews", "roleRequests", "router", "seed", "userData", "users")
+
+
+def _check(name: str, value: Any, allowed: tuple) -> Any:
+    if value not in allowed:
+        raise ValueError(f"{name} must be one of {', '.join(map(str, allowed))}, got {value!r}")
+    return value
+
+
+# --- Documents (convex/schema.ts) ---
+
+
+class UserDataDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    userId: str
+    roles: List[Literal["author", "editor", "reviewer"]]
+    role: Literal["author", "editor", "reviewer"]
+    name: str
+    orcid: str
+
+
+class RoleRequestsDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    userId: str
+    requestedRole: Literal["editor", "reviewer"]
+    currentRoles: List[Literal["author", "editor", "reviewer"]]
+    reason: str
+    status: Literal["pending", "approved", "rejected"]
+    requestedAt: float
+    reviewedAt: float
+    reviewedBy: str
+    adminNotes: str
+
+
+class ManuscriptsDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    title: str
+    authorIds: List[str]
+    abstract: str
+    keywords: List[str]
+    language: str
+    fileId: str
+    status: Literal["submitted", "inReview", "accepted", "rejected", "published", "majorRevisions", "minorRevisions", "proofing"]
+    slug: str
+
+
+class ManuscriptAuthorsDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    manuscriptId: str
+    authorId: str
+
+
+class ArticlesDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    title: str
+    abstract: str
+    keywords: List[str]
+    language: str
+    finalFileId: str
+    originalManuscriptId: str
+    slug: str
+    publishedAt: float
+    publishedBy: str
+    doi: str
+    volume: str
+    issue: str
+    pageNumbers: str
+
+
+class ReviewsDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    manuscriptId: str
+    reviewerId: str
+    deadline: float
+    status: Literal["pending", "submitted"]
+    score: float
+    commentsMd: str
+    recommendation: Literal["accept", "minor", "major", "reject"]
+
+
+class EditorialDecisionsDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    manuscriptId: str
+    editorId: str
+    decision: Literal["proofing", "minorRevisions", "majorRevisions", "reject"]
+    comments: str
+    decidedAt: float
+
+
+class ProofingTasksDoc(TypedDict, total=False):
+    _id: str
+    _creationTime: float
+    manuscriptId: str
+    editorId: str
+    status: Literal["pending", "completed", "published"]
+    proofedFileId: str
+    proofingNotes: str
+    createdAt: float
+    completedAt: float
+    publishedAt: float
+
+
+# --- Argument encoders ---
+
+
+def encode_admin_get_admin_stats() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_admin_get_all_users() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_admin_update_user_roles(target_user_id: str, roles: List[Literal["author", "editor", "reviewer"]]) -> EncodedArgs:
+    args = EncodedArgs({
+        "targetUserId": target_user_id,
+        "roles": list(roles),
+    })
+    return args
+
+
+def encode_admin_delete_user(target_user_id: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "targetUserId": target_user_id,
+    })
+    return args
+
+
+def encode_admin_create_user(email: str, name: str, roles: List[Literal["author", "editor", "reviewer"]], orcid: Optional[str] = None) -> EncodedArgs:
+    args = EncodedArgs({
+        "email": email,
+        "name": name,
+        "roles": list(roles),
+    })
+    if orcid is not None:
+        args["orcid"] = orcid
+    return args
+
+
+def encode_admin_initialize_super_admin() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_admin_create_super_admin_directly(email: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "email": email,
+    })
+    return args
+
+
+def encode_admin_migrate_to_manuscript_authors() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_articles_get_published_articles(limit: Optional[float] = None) -> EncodedArgs:
+    args = EncodedArgs()
+    if limit is not None:
+        args["limit"] = float(limit)
+    return args
+
+
+def encode_articles_get_article_by_slug(slug: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "slug": slug,
+    })
+    return args
+
+
+def encode_articles_publish_article(proofing_task_id: str, doi: Optional[str] = None, volume: Optional[str] = None, issue: Optional[str] = None, page_numbers: Optional[str] = None) -> EncodedArgs:
+    args = EncodedArgs({
+        "proofingTaskId": proofing_task_id,
+    })
+    if doi is not None:
+        args["doi"] = doi
+    if volume is not None:
+        args["volume"] = volume
+    if issue is not None:
+        args["issue"] = issue
+    if page_numbers is not None:
+        args["pageNumbers"] = page_numbers
+    return args
+
+
+def encode_auth_logged_in_user() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_auth_ensure_user_data() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_manuscripts_create_manuscript(title: str, abstract: str, keywords: List[str], language: str, file_id: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "title": title,
+        "abstract": abstract,
+        "keywords": list(keywords),
+        "language": language,
+        "fileId": file_id,
+    })
+    return args
+
+
+def encode_manuscripts_submit_manuscript(title: str, abstract: str, keywords: List[str], language: str, file_id: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "title": title,
+        "abstract": abstract,
+        "keywords": list(keywords),
+        "language": language,
+        "fileId": file_id,
+    })
+    return args
+
+
+def encode_manuscripts_get_manuscripts_for_author() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_manuscripts_get_manuscripts_for_editor() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_manuscripts_make_editorial_decision(manuscript_id: str, decision: Literal["proofing", "minorRevisions", "majorRevisions", "reject"], comments: Optional[str] = None) -> EncodedArgs:
+    _check("decision", decision, ("proofing", "minorRevisions", "majorRevisions", "reject"))
+    args = EncodedArgs({
+        "manuscriptId": manuscript_id,
+        "decision": decision,
+    })
+    if comments is not None:
+        args["comments"] = comments
+    return args
+
+
+def encode_manuscripts_generate_upload_url() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_manuscripts_get_manuscript_by_slug(slug: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "slug": slug,
+    })
+    return args
+
+
+def encode_manuscripts_get_published_manuscripts(limit: Optional[float] = None) -> EncodedArgs:
+    args = EncodedArgs()
+    if limit is not None:
+        args["limit"] = float(limit)
+    return args
+
+
+def encode_manuscripts_get_all_manuscripts() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_manuscripts_update_manuscript_status(manuscript_id: str, status: Literal["submitted", "inReview", "accepted", "rejected", "published", "majorRevisions", "minorRevisions", "proofing"]) -> EncodedArgs:
+    _check("status", status, ("submitted", "inReview", "accepted", "rejected", "published", "majorRevisions", "minorRevisions", "proofing"))
+    args = EncodedArgs({
+        "manuscriptId": manuscript_id,
+        "status": status,
+    })
+    return args
+
+
+def encode_proofing_get_proofing_tasks() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_proofing_generate_proofed_file_upload_url() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_proofing_upload_proofed_file(proofing_task_id: str, file_id: str, proofing_notes: Optional[str] = None) -> EncodedArgs:
+    args = EncodedArgs({
+        "proofingTaskId": proofing_task_id,
+        "fileId": file_id,
+    })
+    if proofing_notes is not None:
+        args["proofingNotes"] = proofing_notes
+    return args
+
+
+def encode_proofing_get_proofing_task(task_id: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "taskId": task_id,
+    })
+    return args
+
+
+def encode_reviews_assign_reviewer(manuscript_id: str, reviewer_id: str, deadline: float) -> EncodedArgs:
+    args = EncodedArgs({
+        "manuscriptId": manuscript_id,
+        "reviewerId": reviewer_id,
+        "deadline": float(deadline),
+    })
+    return args
+
+
+def encode_reviews_remove_reviewer(review_id: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "reviewId": review_id,
+    })
+    return args
+
+
+def encode_reviews_get_assigned_reviews() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_reviews_get_review(review_id: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "reviewId": review_id,
+    })
+    return args
+
+
+def encode_reviews_submit_review(review_id: str, score: float, comments_md: str, recommendation: Literal["accept", "minor", "major", "reject"]) -> EncodedArgs:
+    _check("recommendation", recommendation, ("accept", "minor", "major", "reject"))
+    args = EncodedArgs({
+        "reviewId": review_id,
+        "score": float(score),
+        "commentsMd": comments_md,
+        "recommendation": recommendation,
+    })
+    return args
+
+
+def encode_reviews_get_reviews_for_editor() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_roleRequests_request_role(requested_role: Literal["editor", "reviewer"], reason: str) -> EncodedArgs:
+    _check("requestedRole", requested_role, ("editor", "reviewer"))
+    args = EncodedArgs({
+        "requestedRole": requested_role,
+        "reason": reason,
+    })
+    return args
+
+
+def encode_roleRequests_get_user_role_requests() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_roleRequests_get_all_role_requests() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_roleRequests_review_role_request(request_id: str, action: Literal["approve", "reject"], admin_notes: Optional[str] = None) -> EncodedArgs:
+    _check("action", action, ("approve", "reject"))
+    args = EncodedArgs({
+        "requestId": request_id,
+        "action": action,
+    })
+    if admin_notes is not None:
+        args["adminNotes"] = admin_notes
+    return args
+
+
+def encode_roleRequests_get_pending_requests_count() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_userData_get_current_user_data() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_userData_update_profile(name: str, orcid: Optional[str] = None) -> EncodedArgs:
+    args = EncodedArgs({
+        "name": name,
+    })
+    if orcid is not None:
+        args["orcid"] = orcid
+    return args
+
+
+def encode_userData_get_user_by_id(user_id: str) -> EncodedArgs:
+    args = EncodedArgs({
+        "userId": user_id,
+    })
+    return args
+
+
+def encode_userData_get_all_users() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_userData_get_reviewers() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_users_get_current_user() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+def encode_users_get_users() -> EncodedArgs:
+    args = EncodedArgs()
+    return args
+
+
+class ConvexApi:
+    """
+    One typed method per public Convex function.
+
+    Mixed into ConvexClient, which provides `_call(kind, name, args,
+    auth_token)` and `_invalid_arguments(name, error)`.
+    """
+
+    async def admin_get_admin_stats(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:getAdminStats (query)"""
+        try:
+            args = encode_admin_get_admin_stats()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:getAdminStats", e)
+        return await self._call("query", "admin:getAdminStats", args, auth_token)
+
+    async def admin_get_all_users(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:getAllUsers (query)"""
+        try:
+            args = encode_admin_get_all_users()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:getAllUsers", e)
+        return await self._call("query", "admin:getAllUsers", args, auth_token)
+
+    async def admin_update_user_roles(
+        self,
+        target_user_id: str,
+        roles: List[Literal["author", "editor", "reviewer"]],
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:updateUserRoles (mutation)"""
+        try:
+            args = encode_admin_update_user_roles(target_user_id=target_user_id, roles=roles)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:updateUserRoles", e)
+        return await self._call("mutation", "admin:updateUserRoles", args, auth_token)
+
+    async def admin_delete_user(
+        self,
+        target_user_id: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:deleteUser (mutation)"""
+        try:
+            args = encode_admin_delete_user(target_user_id=target_user_id)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:deleteUser", e)
+        return await self._call("mutation", "admin:deleteUser", args, auth_token)
+
+    async def admin_create_user(
+        self,
+        email: str,
+        name: str,
+        roles: List[Literal["author", "editor", "reviewer"]],
+        orcid: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:createUser (mutation)"""
+        try:
+            args = encode_admin_create_user(email=email, name=name, roles=roles, orcid=orcid)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:createUser", e)
+        return await self._call("mutation", "admin:createUser", args, auth_token)
+
+    async def admin_initialize_super_admin(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:initializeSuperAdmin (mutation)"""
+        try:
+            args = encode_admin_initialize_super_admin()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:initializeSuperAdmin", e)
+        return await self._call("mutation", "admin:initializeSuperAdmin", args, auth_token)
+
+    async def admin_create_super_admin_directly(
+        self,
+        email: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:createSuperAdminDirectly (mutation)"""
+        try:
+            args = encode_admin_create_super_admin_directly(email=email)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:createSuperAdminDirectly", e)
+        return await self._call("mutation", "admin:createSuperAdminDirectly", args, auth_token)
+
+    async def admin_migrate_to_manuscript_authors(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """admin:migrateToManuscriptAuthors (mutation)"""
+        try:
+            args = encode_admin_migrate_to_manuscript_authors()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("admin:migrateToManuscriptAuthors", e)
+        return await self._call("mutation", "admin:migrateToManuscriptAuthors", args, auth_token)
+
+    async def articles_get_published_articles(
+        self,
+        limit: Optional[float] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """articles:getPublishedArticles (query)"""
+        try:
+            args = encode_articles_get_published_articles(limit=limit)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("articles:getPublishedArticles", e)
+        return await self._call("query", "articles:getPublishedArticles", args, auth_token)
+
+    async def articles_get_article_by_slug(
+        self,
+        slug: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """articles:getArticleBySlug (query)"""
+        try:
+            args = encode_articles_get_article_by_slug(slug=slug)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("articles:getArticleBySlug", e)
+        return await self._call("query", "articles:getArticleBySlug", args, auth_token)
+
+    async def articles_publish_article(
+        self,
+        proofing_task_id: str,
+        doi: Optional[str] = None,
+        volume: Optional[str] = None,
+        issue: Optional[str] = None,
+        page_numbers: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """articles:publishArticle (mutation)"""
+        try:
+            args = encode_articles_publish_article(proofing_task_id=proofing_task_id, doi=doi, volume=volume, issue=issue, page_numbers=page_numbers)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("articles:publishArticle", e)
+        return await self._call("mutation", "articles:publishArticle", args, auth_token)
+
+    async def auth_logged_in_user(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """auth:loggedInUser (query)"""
+        try:
+            args = encode_auth_logged_in_user()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("auth:loggedInUser", e)
+        return await self._call("query", "auth:loggedInUser", args, auth_token)
+
+    async def auth_ensure_user_data(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """auth:ensureUserData (mutation)"""
+        try:
+            args = encode_auth_ensure_user_data()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("auth:ensureUserData", e)
+        return await self._call("mutation", "auth:ensureUserData", args, auth_token)
+
+    async def manuscripts_create_manuscript(
+        self,
+        title: str,
+        abstract: str,
+        keywords: List[str],
+        language: str,
+        file_id: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:createManuscript (mutation)"""
+        try:
+            args = encode_manuscripts_create_manuscript(title=title, abstract=abstract, keywords=keywords, language=language, file_id=file_id)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:createManuscript", e)
+        return await self._call("mutation", "manuscripts:createManuscript", args, auth_token)
+
+    async def manuscripts_submit_manuscript(
+        self,
+        title: str,
+        abstract: str,
+        keywords: List[str],
+        language: str,
+        file_id: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:submitManuscript (mutation)"""
+        try:
+            args = encode_manuscripts_submit_manuscript(title=title, abstract=abstract, keywords=keywords, language=language, file_id=file_id)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:submitManuscript", e)
+        return await self._call("mutation", "manuscripts:submitManuscript", args, auth_token)
+
+    async def manuscripts_get_manuscripts_for_author(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:getManuscriptsForAuthor (query)"""
+        try:
+            args = encode_manuscripts_get_manuscripts_for_author()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:getManuscriptsForAuthor", e)
+        return await self._call("query", "manuscripts:getManuscriptsForAuthor", args, auth_token)
+
+    async def manuscripts_get_manuscripts_for_editor(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:getManuscriptsForEditor (query)"""
+        try:
+            args = encode_manuscripts_get_manuscripts_for_editor()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:getManuscriptsForEditor", e)
+        return await self._call("query", "manuscripts:getManuscriptsForEditor", args, auth_token)
+
+    async def manuscripts_make_editorial_decision(
+        self,
+        manuscript_id: str,
+        decision: Literal["proofing", "minorRevisions", "majorRevisions", "reject"],
+        comments: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:makeEditorialDecision (mutation)"""
+        try:
+            args = encode_manuscripts_make_editorial_decision(manuscript_id=manuscript_id, decision=decision, comments=comments)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:makeEditorialDecision", e)
+        return await self._call("mutation", "manuscripts:makeEditorialDecision", args, auth_token)
+
+    async def manuscripts_generate_upload_url(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:generateUploadUrl (mutation)"""
+        try:
+            args = encode_manuscripts_generate_upload_url()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:generateUploadUrl", e)
+        return await self._call("mutation", "manuscripts:generateUploadUrl", args, auth_token)
+
+    async def manuscripts_get_manuscript_by_slug(
+        self,
+        slug: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:getManuscriptBySlug (query)"""
+        try:
+            args = encode_manuscripts_get_manuscript_by_slug(slug=slug)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:getManuscriptBySlug", e)
+        return await self._call("query", "manuscripts:getManuscriptBySlug", args, auth_token)
+
+    async def manuscripts_get_published_manuscripts(
+        self,
+        limit: Optional[float] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:getPublishedManuscripts (query)"""
+        try:
+            args = encode_manuscripts_get_published_manuscripts(limit=limit)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:getPublishedManuscripts", e)
+        return await self._call("query", "manuscripts:getPublishedManuscripts", args, auth_token)
+
+    async def manuscripts_get_all_manuscripts(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:getAllManuscripts (query)"""
+        try:
+            args = encode_manuscripts_get_all_manuscripts()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:getAllManuscripts", e)
+        return await self._call("query", "manuscripts:getAllManuscripts", args, auth_token)
+
+    async def manuscripts_update_manuscript_status(
+        self,
+        manuscript_id: str,
+        status: Literal["submitted", "inReview", "accepted", "rejected", "published", "majorRevisions", "minorRevisions", "proofing"],
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """manuscripts:updateManuscriptStatus (mutation)"""
+        try:
+            args = encode_manuscripts_update_manuscript_status(manuscript_id=manuscript_id, status=status)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("manuscripts:updateManuscriptStatus", e)
+        return await self._call("mutation", "manuscripts:updateManuscriptStatus", args, auth_token)
+
+    async def proofing_get_proofing_tasks(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """proofing:getProofingTasks (query)"""
+        try:
+            args = encode_proofing_get_proofing_tasks()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("proofing:getProofingTasks", e)
+        return await self._call("query", "proofing:getProofingTasks", args, auth_token)
+
+    async def proofing_generate_proofed_file_upload_url(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """proofing:generateProofedFileUploadUrl (mutation)"""
+        try:
+            args = encode_proofing_generate_proofed_file_upload_url()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("proofing:generateProofedFileUploadUrl", e)
+        return await self._call("mutation", "proofing:generateProofedFileUploadUrl", args, auth_token)
+
+    async def proofing_upload_proofed_file(
+        self,
+        proofing_task_id: str,
+        file_id: str,
+        proofing_notes: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """proofing:uploadProofedFile (mutation)"""
+        try:
+            args = encode_proofing_upload_proofed_file(proofing_task_id=proofing_task_id, file_id=file_id, proofing_notes=proofing_notes)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("proofing:uploadProofedFile", e)
+        return await self._call("mutation", "proofing:uploadProofedFile", args, auth_token)
+
+    async def proofing_get_proofing_task(
+        self,
+        task_id: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """proofing:getProofingTask (query)"""
+        try:
+            args = encode_proofing_get_proofing_task(task_id=task_id)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("proofing:getProofingTask", e)
+        return await self._call("query", "proofing:getProofingTask", args, auth_token)
+
+    async def reviews_assign_reviewer(
+        self,
+        manuscript_id: str,
+        reviewer_id: str,
+        deadline: float,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """reviews:assignReviewer (mutation)"""
+        try:
+            args = encode_reviews_assign_reviewer(manuscript_id=manuscript_id, reviewer_id=reviewer_id, deadline=deadline)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("reviews:assignReviewer", e)
+        return await self._call("mutation", "reviews:assignReviewer", args, auth_token)
+
+    async def reviews_remove_reviewer(
+        self,
+        review_id: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """reviews:removeReviewer (mutation)"""
+        try:
+            args = encode_reviews_remove_reviewer(review_id=review_id)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("reviews:removeReviewer", e)
+        return await self._call("mutation", "reviews:removeReviewer", args, auth_token)
+
+    async def reviews_get_assigned_reviews(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """reviews:getAssignedReviews (query)"""
+        try:
+            args = encode_reviews_get_assigned_reviews()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("reviews:getAssignedReviews", e)
+        return await self._call("query", "reviews:getAssignedReviews", args, auth_token)
+
+    async def reviews_get_review(
+        self,
+        review_id: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """reviews:getReview (query)"""
+        try:
+            args = encode_reviews_get_review(review_id=review_id)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("reviews:getReview", e)
+        return await self._call("query", "reviews:getReview", args, auth_token)
+
+    async def reviews_submit_review(
+        self,
+        review_id: str,
+        score: float,
+        comments_md: str,
+        recommendation: Literal["accept", "minor", "major", "reject"],
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """reviews:submitReview (mutation)"""
+        try:
+            args = encode_reviews_submit_review(review_id=review_id, score=score, comments_md=comments_md, recommendation=recommendation)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("reviews:submitReview", e)
+        return await self._call("mutation", "reviews:submitReview", args, auth_token)
+
+    async def reviews_get_reviews_for_editor(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """reviews:getReviewsForEditor (query)"""
+        try:
+            args = encode_reviews_get_reviews_for_editor()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("reviews:getReviewsForEditor", e)
+        return await self._call("query", "reviews:getReviewsForEditor", args, auth_token)
+
+    async def roleRequests_request_role(
+        self,
+        requested_role: Literal["editor", "reviewer"],
+        reason: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """roleRequests:requestRole (mutation)"""
+        try:
+            args = encode_roleRequests_request_role(requested_role=requested_role, reason=reason)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("roleRequests:requestRole", e)
+        return await self._call("mutation", "roleRequests:requestRole", args, auth_token)
+
+    async def roleRequests_get_user_role_requests(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """roleRequests:getUserRoleRequests (query)"""
+        try:
+            args = encode_roleRequests_get_user_role_requests()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("roleRequests:getUserRoleRequests", e)
+        return await self._call("query", "roleRequests:getUserRoleRequests", args, auth_token)
+
+    async def roleRequests_get_all_role_requests(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """roleRequests:getAllRoleRequests (query)"""
+        try:
+            args = encode_roleRequests_get_all_role_requests()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("roleRequests:getAllRoleRequests", e)
+        return await self._call("query", "roleRequests:getAllRoleRequests", args, auth_token)
+
+    async def roleRequests_review_role_request(
+        self,
+        request_id: str,
+        action: Literal["approve", "reject"],
+        admin_notes: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """roleRequests:reviewRoleRequest (mutation)"""
+        try:
+            args = encode_roleRequests_review_role_request(request_id=request_id, action=action, admin_notes=admin_notes)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("roleRequests:reviewRoleRequest", e)
+        return await self._call("mutation", "roleRequests:reviewRoleRequest", args, auth_token)
+
+    async def roleRequests_get_pending_requests_count(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """roleRequests:getPendingRequestsCount (query)"""
+        try:
+            args = encode_roleRequests_get_pending_requests_count()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("roleRequests:getPendingRequestsCount", e)
+        return await self._call("query", "roleRequests:getPendingRequestsCount", args, auth_token)
+
+    async def userData_get_current_user_data(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """userData:getCurrentUserData (query)"""
+        try:
+            args = encode_userData_get_current_user_data()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("userData:getCurrentUserData", e)
+        return await self._call("query", "userData:getCurrentUserData", args, auth_token)
+
+    async def userData_update_profile(
+        self,
+        name: str,
+        orcid: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """userData:updateProfile (mutation)"""
+        try:
+            args = encode_userData_update_profile(name=name, orcid=orcid)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("userData:updateProfile", e)
+        return await self._call("mutation", "userData:updateProfile", args, auth_token)
+
+    async def userData_get_user_by_id(
+        self,
+        user_id: str,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """userData:getUserById (query)"""
+        try:
+            args = encode_userData_get_user_by_id(user_id=user_id)
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("userData:getUserById", e)
+        return await self._call("query", "userData:getUserById", args, auth_token)
+
+    async def userData_get_all_users(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """userData:getAllUsers (query)"""
+        try:
+            args = encode_userData_get_all_users()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("userData:getAllUsers", e)
+        return await self._call("query", "userData:getAllUsers", args, auth_token)
+
+    async def userData_get_reviewers(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """userData:getReviewers (query)"""
+        try:
+            args = encode_userData_get_reviewers()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("userData:getReviewers", e)
+        return await self._call("query", "userData:getReviewers", args, auth_token)
+
+    async def users_get_current_user(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """users:getCurrentUser (query)"""
+        try:
+            args = encode_users_get_current_user()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("users:getCurrentUser", e)
+        return await self._call("query", "users:getCurrentUser", args, auth_token)
+
+    async def users_get_users(
+        self,
+        auth_token: Optional[str] = None,
+    ) -> "ConvexResponse":
+        """users:getUsers (query)"""
+        try:
+            args = encode_users_get_users()
+        except (TypeError, ValueError) as e:
+            return self._invalid_arguments("users:getUsers", e)
+        return await self._call("query", "users:getUsers", args, auth_token)
+
+
+FUNCTIONS: Dict[str, str] = {
+    "admin:getAdminStats": "query",
+    "admin:getAllUsers": "query",
+    "admin:updateUserRoles": "mutation",
+    "admin:deleteUser": "mutation",
+    "admin:createUser": "mutation",
+    "admin:initializeSuperAdmin": "mutation",
+    "admin:createSuperAdminDirectly": "mutation",
+    "admin:migrateToManuscriptAuthors": "mutation",
+    "articles:getPublishedArticles": "query",
+    "articles:getArticleBySlug": "query",
+    "articles:publishArticle": "mutation",
+    "auth:loggedInUser": "query",
+    "auth:ensureUserData": "mutation",
+    "manuscripts:createManuscript": "mutation",
+    "manuscripts:submitManuscript": "mutation",
+    "manuscripts:getManuscriptsForAuthor": "query",
+    "manuscripts:getManuscriptsForEditor": "query",
+    "manuscripts:makeEditorialDecision": "mutation",
+    "manuscripts:generateUploadUrl": "mutation",
+    "manuscripts:getManuscriptBySlug": "query",
+    "manuscripts:getPublishedManuscripts": "query",
+    "manuscripts:getAllManuscripts": "query",
+    "manuscripts:updateManuscriptStatus": "mutation",
+    "proofing:getProofingTasks": "query",
+    "proofing:generateProofedFileUploadUrl": "mutation",
+    "proofing:uploadProofedFile": "mutation",
+    "proofing:getProofingTask": "query",
+    "reviews:assignReviewer": "mutation",
+    "reviews:removeReviewer": "mutation",
+    "reviews:getAssignedReviews": "query",
+    "reviews:getReview": "query",
+    "reviews:submitReview": "mutation",
+    "reviews:getReviewsForEditor": "query",
+    "roleRequests:requestRole": "mutation",
+    "roleRequests:getUserRoleRequests": "query",
+    "roleRequests:getAllRoleRequests": "query",
+    "roleRequests:reviewRoleRequest": "mutation",
+    "roleRequests:getPendingRequestsCount": "query",
+    "userData:getCurrentUserData": "query",
+    "userData:updateProfile": "mutation",
+    "userData:getUserById": "query",
+    "userData:getAllUsers": "query",
+    "userData:getReviewers": "query",
+    "users:getCurrentUser": "query",
+    "users:getUsers": "query",
+}
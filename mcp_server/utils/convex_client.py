@@ -4,9 +4,34 @@ Handles communication with the existing Convex backend.
 """
 
 import os
-from typing import Optional, Any
+import time
+import asyncio
+from typing import Optional, Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
 from convex import ConvexClient as ConvexPyClient
 from .async_wrapper import AsyncConvexClient
+from .convex_transport import AsyncConvexTransport
+from .single_flight import SingleFlight, make_call_key
+from .query_cache import QueryCache, tables_written_by
+from .resilience import Resilience
+from .convex_api import ConvexApi
+from .deadline import run_with_deadline, stats as deadline_stats
+
+# Writes issued through this process, per table. Lets callers that keep
+# derived state (e.g. session roles) notice that it may be out of date.
+_table_writes: Dict[str, int] = {}
+
+
+def _note_writes(function_name: str):
+    for table in tables_written_by(function_name):
+        _table_writes[table] = _table_writes.get(table, 0) + 1
+
+
+def table_write_generation(table: str) -> int:
+    """Number of mutations/actions that may have written `table`."""
+    return _table_writes.get(table, 0)
+
 
 class ConvexResponse:
     """Response model for Convex API calls."""
@@ -15,18 +40,157 @@ class ConvexResponse:
         self.data = data
         self.error = error
 
-class ConvexClient:
-    """Client for communicating with Convex backend."""
+class ConvexClient(ConvexApi):
+    """
+    Client for communicating with Convex backend.
+
+    Typed per-function methods (e.g. `reviews_submit_review`) come from the
+    generated ConvexApi; the methods below adapt them to the shapes the tool
+    modules expect.
+    """
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, transport: Optional[str] = None):
         self.base_url = base_url or os.getenv("CONVEX_URL", "http://localhost:3000")
-        self.client = ConvexPyClient(self.base_url)
-        self.async_client = AsyncConvexClient(self.client)
+        self.transport = (transport or os.getenv("CONVEX_TRANSPORT", "httpx")).lower()
+        if self.transport == "thread":
+            # Legacy path: blocking WebSocket client run on worker threads
+            self.client = ConvexPyClient(self.base_url)
+            self.async_client = AsyncConvexClient(self.client, lambda: ConvexPyClient(self.base_url))
+        else:
+            self.client = None
+            self.async_client = AsyncConvexTransport(self.base_url)
+        self.single_flight_enabled = os.getenv("CONVEX_SINGLE_FLIGHT", "true").lower() == "true"
+        self.single_flight = SingleFlight()
+        self.resilience = Resilience()
+        # Opt-in: cached reads may be a few seconds stale w.r.t. other writers
+        self.cache: Optional[QueryCache] = None
+        if os.getenv("CONVEX_QUERY_CACHE", "false").lower() == "true":
+            self.cache = QueryCache()
+
+    async def _query(self, function_name: str, arguments: Optional[dict] = None, auth_token: Optional[str] = None) -> Any:
+        """Run a query, serving from cache or sharing identical concurrent calls."""
+        key = make_call_key(function_name, arguments, auth_token)
+        if self.cache is not None:
+            hit, value = self.cache.get(key)
+            if hit:
+                return value
+            generation = self.cache.generation(function_name)
+
+        # Retries happen inside the shared call, so coalesced callers retry once
+        call = lambda: self.resilience.call(
+            function_name,
+            lambda: self.async_client.query(function_name, arguments, auth_token=auth_token),
+            idempotent=True,
+        )
+        # The deadline applies per caller; shared work stops once all callers leave
+        if self.single_flight_enabled:
+            result = await run_with_deadline(self.single_flight.do(key, call), function_name)
+        else:
+            result = await run_with_deadline(call(), function_name)
+
+        if self.cache is not None:
+            self.cache.put(key, function_name, result, generation)
+        return result
+
+    async def _mutation(self, function_name: str, arguments: Optional[dict] = None, auth_token: Optional[str] = None) -> Any:
+        """Run a mutation. Writes are never coalesced or retried and invalidate cached reads."""
+        try:
+            return await run_with_deadline(
+                self.resilience.call(
+                    function_name,
+                    lambda: self.async_client.mutation(function_name, arguments, auth_token=auth_token),
+                ),
+                function_name,
+            )
+        finally:
+            _note_writes(function_name)
+            if self.cache is not None:
+                self.cache.invalidate_for(function_name)
+
+    async def _action(self, function_name: str, arguments: Optional[dict] = None, auth_token: Optional[str] = None) -> Any:
+        """Run an action. Actions may have side effects and are never coalesced or retried."""
+        try:
+            return await run_with_deadline(
+                self.resilience.call(
+                    function_name,
+                    lambda: self.async_client.action(function_name, arguments, auth_token=auth_token),
+                ),
+                function_name,
+            )
+        finally:
+            _note_writes(function_name)
+            if self.cache is not None:
+                self.cache.invalidate_for(function_name)
+
+    async def _call(self, kind: str, function_name: str, arguments: Optional[dict], auth_token: Optional[str] = None) -> ConvexResponse:
+        """Dispatch a generated API call and wrap the outcome."""
+        try:
+            if kind == "query":
+                result = await self._query(function_name, arguments, auth_token)
+            elif kind == "mutation":
+                result = await self._mutation(function_name, arguments, auth_token)
+            else:
+                result = await self._action(function_name, arguments, auth_token)
+            return ConvexResponse(success=True, data=result)
+        except Exception as e:
+            return ConvexResponse(success=False, error=str(e))
+
+    def _invalid_arguments(self, function_name: str, error: Exception) -> ConvexResponse:
+        return ConvexResponse(success=False, error=f"Invalid arguments for {function_name}: {error}")
+
+    async def query_many(
+        self,
+        calls: List[Tuple[str, Optional[dict]]],
+        auth_token: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[ConvexResponse]:
+        """
+        Run independent queries concurrently.
+
+        Each call gets its own timeout and its own ConvexResponse, in the same
+        order as `calls`, so one slow or failing query never hides the others.
+        """
+        if timeout is None:
+            timeout = float(os.getenv("CONVEX_QUERY_MANY_TIMEOUT", "10"))
+
+        async def run(function_name: str, arguments: Optional[dict]) -> ConvexResponse:
+            try:
+                result = await asyncio.wait_for(self._query(function_name, arguments, auth_token), timeout)
+                return ConvexResponse(success=True, data=result)
+            except asyncio.TimeoutError:
+                return ConvexResponse(success=False, error=f"{function_name} timed out after {timeout}s")
+            except Exception as e:
+                return ConvexResponse(success=False, error=str(e))
+
+        return list(await asyncio.gather(*(run(name, args) for name, args in calls)))
+
+    def release_auth(self, auth_token: str):
+        """Drop any pooled client authenticated with this token."""
+        if isinstance(self.async_client, AsyncConvexClient):
+            self.async_client.auth_pool.discard(auth_token)
+
+    def get_stats(self) -> dict:
+        """Transport metrics for monitoring."""
+        return {
+            "transport": self.transport,
+            **self.async_client.get_stats(),
+            "single_flight": self.single_flight.get_stats(),
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+            "resilience": self.resilience.get_stats(),
+            "deadlines": deadline_stats.get_stats(),
+        }
+
+    async def close(self):
+        """Release transport resources."""
+        if isinstance(self.async_client, AsyncConvexTransport):
+            await self.async_client.close()
+        elif isinstance(self.async_client, AsyncConvexClient):
+            self.async_client.auth_pool.clear()
 
     async def authenticate_user(self, email: str, password: str) -> ConvexResponse:
         """Authenticate user with email/password via Convex Auth Password provider."""
         try:
-            result = await self.async_client.action("auth:signIn", {"provider": "password", "params": {"email": email, "password": password, "flow": "signIn"}})
+            result = await self._action("auth:signIn", {"provider": "password", "params": {"email": email, "password": password, "flow": "signIn"}})
             return ConvexResponse(success=True, data=result)
         except Exception as e:
             return ConvexResponse(success=False, error=str(e))
@@ -34,8 +198,7 @@ class ConvexClient:
     async def get_current_user(self, auth_token: str) -> ConvexResponse:
         """Get current authenticated user data."""
         try:
-            await self.async_client.set_auth(auth_token)
-            result = await self.async_client.query("auth:loggedInUser")
+            result = await self._query("auth:loggedInUser", auth_token=auth_token)
             return ConvexResponse(success=True, data=result)
         except Exception as e:
             return ConvexResponse(success=False, error=str(e))
@@ -43,11 +206,176 @@ class ConvexClient:
     async def create_user_account(self, email: str, password: str) -> ConvexResponse:
         """Create a new user account using Convex Auth Password provider."""
         try:
-            result = await self.async_client.action("auth:signIn", {"provider": "password", "params": {"email": email, "password": password, "flow": "signUp"}})
+            result = await self._action("auth:signIn", {"provider": "password", "params": {"email": email, "password": password, "flow": "signUp"}})
             return ConvexResponse(success=True, data=result)
         except Exception as e:
             return ConvexResponse(success=False, error=str(e))
 
+    # Tool-facing helpers built on the generated API
+
+    @staticmethod
+    def _reshape(response: ConvexResponse, shape) -> ConvexResponse:
+        if response.success:
+            response.data = shape(response.data)
+        return response
+
+    def get_current_time(self) -> float:
+        """Current time in milliseconds, the unit Convex timestamps use."""
+        return time.time() * 1000
+
+    async def generate_upload_url(self, auth_token: str) -> ConvexResponse:
+        """Get a short-lived URL for uploading a manuscript file."""
+        response = await self.manuscripts_generate_upload_url(auth_token=auth_token)
+        return self._reshape(response, lambda url: {"uploadUrl": url})
+
+    async def generate_proofed_file_upload_url(self, auth_token: str) -> ConvexResponse:
+        """Get a short-lived URL for uploading a proofed file."""
+        response = await self.proofing_generate_proofed_file_upload_url(auth_token=auth_token)
+        return self._reshape(response, lambda url: {"uploadUrl": url})
+
+    async def upload_file(self, upload_url: str, file_bytes: bytes, content_type: str) -> ConvexResponse:
+        """POST file contents to a Convex upload URL; returns the storageId."""
+        try:
+            if isinstance(self.async_client, AsyncConvexTransport):
+                response = await self.async_client.upload(upload_url, file_bytes, content_type)
+            else:
+                async with httpx.AsyncClient(timeout=60.0) as http:
+                    response = await http.post(upload_url, content=file_bytes, headers={"Content-Type": content_type})
+            response.raise_for_status()
+            return ConvexResponse(success=True, data=response.json())
+        except Exception as e:
+            return ConvexResponse(success=False, error=str(e))
+
+    async def upload_stream(
+        self, upload_url: str, chunks: AsyncIterator[bytes], content_type: str, content_length: int
+    ) -> ConvexResponse:
+        """POST file contents to a Convex upload URL as they arrive; returns the storageId."""
+        try:
+            if isinstance(self.async_client, AsyncConvexTransport):
+                response = await self.async_client.upload(upload_url, chunks, content_type, content_length)
+            else:
+                async with httpx.AsyncClient(timeout=60.0) as http:
+                    response = await http.post(
+                        upload_url,
+                        content=chunks,
+                        headers={"Content-Type": content_type, "Content-Length": str(content_length)},
+                    )
+            response.raise_for_status()
+            return ConvexResponse(success=True, data=response.json())
+        except Exception as e:
+            return ConvexResponse(success=False, error=str(e))
+
+    async def get_manuscripts(self, auth_token: str, filters: Optional[Dict[str, Any]] = None) -> ConvexResponse:
+        """Manuscripts the caller authored (the backend scopes by identity, not filters)."""
+        response = await self.manuscripts_get_manuscripts_for_author(auth_token=auth_token)
+        return self._reshape(response, lambda manuscripts: {"manuscripts": manuscripts or []})
+
+    async def get_manuscript(self, manuscript_id: str, auth_token: str) -> ConvexResponse:
+        """
+        Look up one manuscript the caller may see.
+
+        The backend has no get-by-id query, so this searches the caller's own
+        manuscripts and, for editors, the editorial queue. Manuscripts found
+        among the caller's own list have the caller added to `authorIds`.
+        """
+        own, user, queue = await self.query_many(
+            [
+                ("manuscripts:getManuscriptsForAuthor", None),
+                ("auth:loggedInUser", None),
+                ("manuscripts:getManuscriptsForEditor", None),
+            ],
+            auth_token=auth_token,
+        )
+        if own.success:
+            for manuscript in own.data or []:
+                if manuscript.get("_id") == manuscript_id:
+                    author_ids = list(manuscript.get("authorIds") or [])
+                    if user.success and user.data and user.data.get("_id") not in author_ids:
+                        author_ids.append(user.data["_id"])
+                    return ConvexResponse(success=True, data={**manuscript, "authorIds": author_ids})
+        if queue.success:
+            for manuscript in queue.data or []:
+                if manuscript.get("_id") == manuscript_id:
+                    return ConvexResponse(success=True, data=manuscript)
+        if not own.success:
+            return own
+        return ConvexResponse(success=False, error="Manuscript not found")
+
+    async def update_manuscript(self, manuscript_id: str, update_data: Dict[str, Any], auth_token: str) -> ConvexResponse:
+        """Metadata edits have no backend mutation yet."""
+        return ConvexResponse(success=False, error="Updating manuscript metadata is not supported by the backend")
+
+    async def update_manuscript_status(self, manuscript_id: str, status: str, auth_token: str) -> ConvexResponse:
+        return await self.manuscripts_update_manuscript_status(
+            manuscript_id=manuscript_id, status=status, auth_token=auth_token
+        )
+
+    async def get_review(self, review_id: str, auth_token: str) -> ConvexResponse:
+        """A review assigned to the caller, with its manuscript."""
+        response = await self.reviews_get_review(review_id=review_id, auth_token=auth_token)
+        if response.success and response.data is None:
+            return ConvexResponse(success=False, error="Not authenticated")
+        return response
+
+    async def get_reviews_for_manuscript(self, manuscript_id: str, auth_token: str) -> ConvexResponse:
+        """All reviews of a manuscript (editor only)."""
+        response = await self.reviews_get_reviews_for_editor(auth_token=auth_token)
+        return self._reshape(
+            response, lambda reviews: [r for r in reviews or [] if r.get("manuscriptId") == manuscript_id]
+        )
+
+    async def get_reviews(self, manuscript_id: str, auth_token: str) -> ConvexResponse:
+        """Reviews of a manuscript, as {"reviews": [...]}."""
+        response = await self.get_reviews_for_manuscript(manuscript_id, auth_token)
+        return self._reshape(response, lambda reviews: {"reviews": reviews})
+
+    async def get_users(self, auth_token: str) -> ConvexResponse:
+        return await self.users_get_users(auth_token=auth_token)
+
+    async def assign_reviewer(self, manuscript_id: str, reviewer_id: str, deadline: float, auth_token: str) -> ConvexResponse:
+        return await self.reviews_assign_reviewer(
+            manuscript_id=manuscript_id, reviewer_id=reviewer_id, deadline=deadline, auth_token=auth_token
+        )
+
+    async def remove_reviewer(self, review_id: str, auth_token: str) -> ConvexResponse:
+        return await self.reviews_remove_reviewer(review_id=review_id, auth_token=auth_token)
+
+    async def submit_review(self, review_id: str, score: float, comments_md: str, recommendation: str, auth_token: str) -> ConvexResponse:
+        return await self.reviews_submit_review(
+            review_id=review_id, score=score, comments_md=comments_md,
+            recommendation=recommendation, auth_token=auth_token,
+        )
+
+    async def make_editorial_decision(self, manuscript_id: str, decision: str, comments: Optional[str], auth_token: str) -> ConvexResponse:
+        return await self.manuscripts_make_editorial_decision(
+            manuscript_id=manuscript_id, decision=decision, comments=comments, auth_token=auth_token
+        )
+
+    async def upload_proofed_file(self, proofing_task_id: str, file_id: str, proofing_notes: Optional[str], auth_token: str) -> ConvexResponse:
+        return await self.proofing_upload_proofed_file(
+            proofing_task_id=proofing_task_id, file_id=file_id,
+            proofing_notes=proofing_notes, auth_token=auth_token,
+        )
+
+    async def publish_article(
+        self,
+        proofing_task_id: str,
+        doi: Optional[str] = None,
+        volume: Optional[str] = None,
+        issue: Optional[str] = None,
+        page_numbers: Optional[str] = None,
+        auth_token: Optional[str] = None,
+    ) -> ConvexResponse:
+        return await self.articles_publish_article(
+            proofing_task_id=proofing_task_id, doi=doi, volume=volume,
+            issue=issue, page_numbers=page_numbers, auth_token=auth_token,
+        )
+
+    async def request_role_elevation(self, auth_token: str, requested_role: str, reason: str) -> ConvexResponse:
+        return await self.role_requests_request_role(
+            requested_role=requested_role, reason=reason, auth_token=auth_token
+        )
+
 # Global client instance
 _convex_client: Optional[ConvexClient] = None
 
@@ -62,5 +390,5 @@ async def cleanup_convex_client():
     """Clean up global Convex client instance."""
     global _convex_client
     if _convex_client is not None:
-        # Perform any necessary cleanup
+        await _convex_client.close()
         _convex_client = None
\ No newline at end of file
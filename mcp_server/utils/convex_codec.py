@@ -0,0 +1,89 @@
+"""
+JSON codec for Convex requests and responses.
+Uses orjson or msgspec when installed and the standard library otherwise.
+"""
+
+import json
+from typing import Any
+
+from convex.values import convex_to_json, json_to_convex
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class EncodedArgs(dict):
+    """Function arguments already in Convex JSON form (see utils.convex_api)."""
+
+
+if orjson is not None:
+    CODEC = "orjson"
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str)
+
+    def dumps_canonical(obj: Any) -> bytes:
+        """Deterministic encoding (sorted keys) for use in cache keys."""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS)
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+elif msgspec is not None:
+    CODEC = "msgspec"
+    _encoder = msgspec.json.Encoder(enc_hook=str)
+    _canonical_encoder = msgspec.json.Encoder(enc_hook=str, order="sorted")
+    _decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj)
+
+    def dumps_canonical(obj: Any) -> bytes:
+        """Deterministic encoding (sorted keys) for use in cache keys."""
+        return _canonical_encoder.encode(obj)
+
+    def loads(data: bytes) -> Any:
+        try:
+            return _decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+else:
+    CODEC = "json"
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
+    def dumps_canonical(obj: Any) -> bytes:
+        """Deterministic encoding (sorted keys) for use in cache keys."""
+        return json.dumps(obj, default=str, sort_keys=True, separators=(",", ":")).encode()
+
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+def encode_args(arguments: Any) -> Any:
+    """Arguments in Convex JSON form, skipping the generic walk if precompiled."""
+    if isinstance(arguments, EncodedArgs):
+        return arguments
+    return convex_to_json(arguments or {})
+
+
+def decode_value(value: Any, raw: bytes) -> Any:
+    """
+    Convert a Convex JSON value back to Python.
+
+    Special encodings ($integer, $bytes, $float) are the only values that
+    differ from plain JSON, so when the raw body has no `"$` the decoded JSON
+    is returned as-is instead of walking the whole tree.
+    """
+    if b'"$' not in raw:
+        return value
+    return json_to_convex(value)
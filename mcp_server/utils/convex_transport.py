@@ -0,0 +1,175 @@
+"""
+Native asyncio transport for Convex backend calls.
+Talks to the Convex HTTP API over a pooled httpx.AsyncClient.
+"""
+
+import os
+import importlib.util
+from typing import Optional, Any, AsyncIterator, Dict, Union
+
+import httpx
+from convex import ConvexError, __version__ as convex_version
+
+from .convex_codec import CODEC, dumps, loads, encode_args, decode_value
+
+
+class ConvexTransportError(Exception):
+    """Raised when Convex returns a response the transport cannot interpret."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    """Read a boolean flag from the environment."""
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+class AsyncConvexTransport:
+    """
+    Calls Convex query/mutation/action endpoints without blocking a thread.
+
+    Connections are kept alive and shared between concurrent calls, so the
+    number of in-flight requests is bounded by the pool limits rather than by
+    the size of a thread pool. Auth is sent per request, so calls made on
+    behalf of different users share connections but never auth state.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        http2: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+
+        if http2 is None:
+            http2 = _env_flag("CONVEX_HTTP2")
+        # HTTP/2 support in httpx needs the optional h2 package
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(os.getenv("CONVEX_MAX_CONNECTIONS", "200")),
+            max_keepalive_connections=max_keepalive_connections or int(os.getenv("CONVEX_MAX_KEEPALIVE", "50")),
+            keepalive_expiry=keepalive_expiry or float(os.getenv("CONVEX_KEEPALIVE_EXPIRY", "30")),
+        )
+        self.timeout = httpx.Timeout(timeout or float(os.getenv("CONVEX_TIMEOUT", "30")))
+        self.headers = {
+            "Convex-Client": f"python-{convex_version.replace('a', '-a')}",
+            "Content-Type": "application/json",
+        }
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._auth: Optional[str] = None
+        self.requests = 0
+        self.authenticated_requests = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client on first use, inside the running loop."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                headers=self.headers,
+            )
+        return self._client
+
+    async def _request(
+        self,
+        kind: str,
+        function_name: str,
+        arguments: Optional[Dict[str, Any]],
+        auth_token: Optional[str] = None,
+    ) -> Any:
+        """POST a function call to /api/{kind} and decode the result."""
+        payload = {
+            "path": function_name,
+            "format": "convex_encoded_json",
+            "args": encode_args(arguments),
+        }
+        headers = {}
+        if auth_token:
+            headers["Authorization"] = f"Bearer {auth_token}"
+            self.authenticated_requests += 1
+        elif self._auth is not None:
+            headers["Authorization"] = self._auth
+        self.requests += 1
+
+        response = await self._get_client().post(f"/api/{kind}", content=dumps(payload), headers=headers)
+
+        try:
+            body = loads(response.content)
+        except ValueError:
+            body = None
+
+        if not body:
+            # Not JSON: most likely an infrastructure or connectivity error
+            response.raise_for_status()
+            raise ConvexTransportError(f"Unexpected response format: {response.text}")
+
+        if response.is_error:
+            raise ConvexTransportError(
+                f"{response.status_code} {body.get('code')}: {body.get('message')}",
+                status_code=response.status_code,
+            )
+
+        status = body.get("status")
+        if status == "success":
+            return decode_value(body["value"], response.content)
+        if status == "error":
+            if "errorData" in body:
+                error_data = body["errorData"]
+                message = error_data if isinstance(error_data, str) else body.get("errorMessage", "Convex error")
+                raise ConvexError(message, error_data)
+            raise ConvexTransportError(body.get("errorMessage", "Convex function failed"))
+        raise ConvexTransportError("Received unexpected response from Convex server")
+
+    async def query(self, function_name: str, arguments: dict = None, auth_token: str = None):
+        return await self._request("query", function_name, arguments, auth_token)
+
+    async def mutation(self, function_name: str, arguments: dict = None, auth_token: str = None):
+        return await self._request("mutation", function_name, arguments, auth_token)
+
+    async def action(self, function_name: str, arguments: dict = None, auth_token: str = None):
+        """
+        Call a Convex action function asynchronously.
+        """
+        return await self._request("action", function_name, arguments, auth_token)
+
+    async def upload(
+        self,
+        url: str,
+        content: Union[bytes, AsyncIterator[bytes]],
+        content_type: str,
+        content_length: Optional[int] = None,
+    ) -> httpx.Response:
+        """POST raw file contents, whole or as a stream of chunks, to a Convex storage upload URL."""
+        headers = {"Content-Type": content_type}
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+        return await self._get_client().post(url, content=content, headers=headers)
+
+    async def set_auth(self, token: str):
+        self._auth = f"Bearer {token}" if token else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request counters for the pooled transport."""
+        return {
+            "requests": self.requests,
+            "authenticated_requests": self.authenticated_requests,
+            "http2": self.http2,
+            "codec": CODEC,
+            "max_connections": self.limits.max_connections,
+        }
+
+    async def close(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,142 @@
+"""
+Per-tool-call deadlines for MCP server.
+Carries an absolute deadline through the call via a context variable so
+backend calls can stop once the caller is no longer waiting.
+"""
+
+import os
+import time
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+# Absolute time.monotonic() deadline of the current tool call, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("tool_deadline", default=None)
+
+DEFAULT_TOOL_DEADLINE = float(os.getenv("MCP_TOOL_DEADLINE", "30"))
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a tool call runs past its deadline."""
+
+
+class DeadlineStats:
+    """Counters for expired and cancelled work."""
+
+    def __init__(self):
+        self.tool_calls_expired = 0
+        self.backend_calls_cancelled = 0
+        self.backend_calls_skipped = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tool_calls_expired": self.tool_calls_expired,
+            "backend_calls_cancelled": self.backend_calls_cancelled,
+            "backend_calls_skipped": self.backend_calls_skipped,
+        }
+
+
+stats = DeadlineStats()
+
+
+class ExpiryReport:
+    """Whether a tool call run under `track_expiry` hit its deadline."""
+
+    __slots__ = ("expired",)
+
+    def __init__(self):
+        self.expired = False
+
+
+# Shared by reference, so a tool run in a copied context still reports back
+_expiry_report: ContextVar[Optional[ExpiryReport]] = ContextVar("tool_expiry_report", default=None)
+
+
+@contextmanager
+def track_expiry() -> Iterator[ExpiryReport]:
+    """
+    Find out whether the tool call made inside the block expired.
+
+    `with_deadline` turns an expiry into an error result, so callers that
+    only see the result (such as the concurrency limiter) cannot tell.
+    """
+    report = ExpiryReport()
+    token = _expiry_report.set(report)
+    try:
+        yield report
+    finally:
+        _expiry_report.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(what: str = "Backend call"):
+    """Raise DeadlineExceededError (counting a skipped call) if already expired."""
+    left = remaining()
+    if left is not None and left <= 0:
+        stats.backend_calls_skipped += 1
+        raise DeadlineExceededError(f"{what} skipped: tool deadline already passed")
+
+
+async def run_with_deadline(awaitable: Awaitable[Any], what: str = "Backend call") -> Any:
+    """
+    Await a backend call within the current deadline.
+
+    On expiry or caller cancellation the call is cancelled, so an HTTP
+    request is dropped and queued executor work never starts.
+    """
+    check_deadline(what)
+    left = remaining()
+    try:
+        if left is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        stats.backend_calls_cancelled += 1
+        raise DeadlineExceededError(f"{what} cancelled: tool deadline exceeded")
+    except asyncio.CancelledError:
+        stats.backend_calls_cancelled += 1
+        raise
+
+
+def with_deadline(seconds: Optional[float] = None):
+    """
+    Decorator giving each call of a tool a deadline.
+
+    A nested deadline can only shorten an outer one. When the deadline
+    passes the tool call is cancelled and returns an error result, and the
+    expiry is recorded for `track_expiry`.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            timeout = seconds if seconds is not None else DEFAULT_TOOL_DEADLINE
+            deadline = time.monotonic() + timeout
+            outer = _deadline.get()
+            if outer is not None:
+                deadline = min(deadline, outer)
+            token = _deadline.set(deadline)
+            try:
+                return await asyncio.wait_for(func(*args, **kwargs), max(deadline - time.monotonic(), 0))
+            except (asyncio.TimeoutError, DeadlineExceededError):
+                stats.tool_calls_expired += 1
+                report = _expiry_report.get()
+                if report is not None:
+                    report.expired = True
+                return {"success": False, "error": f"{func.__name__} exceeded its {timeout:g}s deadline"}
+            finally:
+                _deadline.reset(token)
+        return wrapper
+    return decorator
@@ -0,0 +1,139 @@
+"""
+Dedicated executor for blocking backend I/O.
+Keeps Convex calls off the event loop's shared default thread pool.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Optional
+
+from .deadline import DeadlineExceededError, current_deadline
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when the backend executor queue is full."""
+
+
+class BackendExecutor:
+    """
+    Thread pool with a bounded wait queue and usage metrics.
+
+    Work that cannot start immediately waits in the queue; once `max_queue`
+    calls are waiting, new calls are rejected straight away instead of
+    piling up behind a slow backend.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("CONVEX_EXECUTOR_MAX_WORKERS", "32"))
+        self.max_queue = max_queue or int(os.getenv("CONVEX_EXECUTOR_MAX_QUEUE", "256"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="convex-io")
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.active = 0
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.rejected = 0
+        self.skipped_expired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent_waits: deque = deque(maxlen=1024)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function on the executor and await its result.
+
+        Work still queued when the caller's deadline passes is skipped
+        rather than started.
+        """
+        deadline = current_deadline()
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Backend executor saturated: {self.queued} calls waiting"
+                )
+            self.queued += 1
+            self.submitted += 1
+
+        enqueued_at = time.perf_counter()
+        started = threading.Event()
+
+        def task():
+            wait = time.perf_counter() - enqueued_at
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.started += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                self._recent_waits.append(wait)
+            started.set()
+            try:
+                if deadline is not None and time.monotonic() >= deadline:
+                    with self._lock:
+                        self.skipped_expired += 1
+                    raise DeadlineExceededError("Backend call skipped: deadline passed while queued")
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        def on_done(future: Future):
+            # Cancelled before a worker picked it up: it never left the queue
+            if future.cancelled() and not started.is_set():
+                with self._lock:
+                    self.queued -= 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, worker usage and wait-time metrics."""
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            p95 = waits[int(len(waits) * 0.95)] if waits else 0.0
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.queued,
+                "active_workers": self.active,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "skipped_expired": self.skipped_expired,
+                "avg_wait_ms": (self.total_wait / self.started * 1000) if self.started else 0.0,
+                "p95_wait_ms": p95 * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global executor instance
+_backend_executor: Optional[BackendExecutor] = None
+
+
+def get_backend_executor() -> BackendExecutor:
+    """Get or create global backend executor instance."""
+    global _backend_executor
+    if _backend_executor is None:
+        _backend_executor = BackendExecutor()
+    return _backend_executor
+
+
+def shutdown_backend_executor():
+    """Shut down global backend executor instance."""
+    global _backend_executor
+    if _backend_executor is not None:
+        _backend_executor.shutdown()
+        _backend_executor = None
@@ -0,0 +1,203 @@
+"""
+Read cache for Convex query results.
+Entries expire after a per-function TTL and are invalidated by local mutations.
+"""
+
+import os
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from convex.values import convex_to_json
+
+from .convex_codec import decode_value, dumps, loads
+
+ALL_TABLES = frozenset({
+    "users", "userData", "roleRequests", "manuscripts", "manuscriptAuthors",
+    "articles", "reviews", "editorialDecisions", "proofingTasks",
+})
+
+# Tables read by queries; defaults come from the module name
+MODULE_TABLES: Dict[str, Set[str]] = {
+    "manuscripts": {"manuscripts", "manuscriptAuthors", "userData"},
+    "reviews": {"reviews", "manuscripts", "userData"},
+    "proofing": {"proofingTasks", "manuscripts", "manuscriptAuthors", "userData"},
+    "articles": {"articles", "manuscriptAuthors", "userData"},
+    "userData": {"userData"},
+    "users": {"users", "userData"},
+    "auth": {"users", "userData"},
+    "roleRequests": {"roleRequests", "userData"},
+}
+
+# Tables written by mutations and actions (see convex/*.ts)
+WRITE_TABLES: Dict[str, Set[str]] = {
+    "manuscripts:createManuscript": {"manuscripts", "manuscriptAuthors"},
+    "manuscripts:submitManuscript": {"manuscripts", "manuscriptAuthors"},
+    "manuscripts:makeEditorialDecision": {"manuscripts", "editorialDecisions", "proofingTasks"},
+    "manuscripts:updateManuscriptStatus": {"manuscripts"},
+    "manuscripts:generateUploadUrl": set(),
+    "reviews:assignReviewer": {"reviews", "manuscripts"},
+    "reviews:removeReviewer": {"reviews", "manuscripts"},
+    "reviews:submitReview": {"reviews"},
+    "proofing:generateProofedFileUploadUrl": set(),
+    "proofing:uploadProofedFile": {"proofingTasks"},
+    "articles:publishArticle": {"articles", "proofingTasks", "manuscripts"},
+    "userData:updateProfile": {"userData"},
+    "roleRequests:requestRole": {"roleRequests", "userData"},
+    "roleRequests:reviewRoleRequest": {"roleRequests", "userData"},
+    "auth:ensureUserData": {"userData"},
+    # Sign-in only touches Convex Auth's own tables
+    "auth:signIn": set(),
+}
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "auth:loggedInUser": 10.0,
+    "userData:getCurrentUserData": 30.0,
+    "articles:getPublishedArticles": 60.0,
+}
+
+
+def tables_read_by(function_name: str) -> Set[str]:
+    """Tables a query depends on."""
+    module = function_name.split(":", 1)[0]
+    return MODULE_TABLES.get(module, set(ALL_TABLES))
+
+
+def tables_written_by(function_name: str) -> Set[str]:
+    """Tables a mutation or action may change (all tables if unknown)."""
+    return WRITE_TABLES.get(function_name, set(ALL_TABLES))
+
+
+def _parse_ttls(value: str) -> Dict[str, float]:
+    """Parse 'module:fn=seconds,module:fn=seconds'."""
+    ttls = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, seconds = item.rsplit("=", 1)
+            ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+class QueryCache:
+    """
+    LRU cache of query results with per-function TTLs and a memory cap.
+
+    Keys carry the caller identity, so users never see each other's results.
+    Invalidation is by table: a mutation drops every cached query that reads
+    a table the mutation writes, for all identities.
+
+    Results are held encoded and decoded on every hit, so each caller gets
+    its own copy and cannot change what later callers see.
+    """
+
+    def __init__(
+        self,
+        default_ttl: Optional[float] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.default_ttl = default_ttl if default_ttl is not None else float(os.getenv("CONVEX_CACHE_DEFAULT_TTL", "5"))
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(_parse_ttls(os.getenv("CONVEX_CACHE_TTLS", "")))
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = max_bytes or int(os.getenv("CONVEX_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+        # key -> (encoded value, expires_at, size, tables)
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, float, int, Set[str]]]" = OrderedDict()
+        self._keys_by_table: Dict[str, Set[Hashable]] = defaultdict(set)
+        # Bumped on every invalidation so in-flight reads can detect staleness
+        self._generations: Dict[str, int] = defaultdict(int)
+        self.bytes_used = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def ttl_for(self, function_name: str) -> float:
+        return self.ttls.get(function_name, self.default_ttl)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if entry[1] <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        raw = entry[0]
+        return True, decode_value(loads(raw), raw)
+
+    def generation(self, function_name: str) -> Tuple[int, ...]:
+        """Snapshot of invalidation state for the tables a query reads."""
+        return tuple(self._generations[table] for table in sorted(tables_read_by(function_name)))
+
+    def put(self, key: Hashable, function_name: str, value: Any, generation: Tuple[int, ...]):
+        """Store a result unless a mutation invalidated its tables meanwhile."""
+        ttl = self.ttl_for(function_name)
+        if ttl <= 0 or generation != self.generation(function_name):
+            return
+        # Convex JSON keeps ints, bytes and special floats intact
+        try:
+            raw = dumps(convex_to_json(value))
+        except (TypeError, ValueError):
+            return
+        size = len(raw)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        tables = tables_read_by(function_name)
+        self._entries[key] = (raw, time.monotonic() + ttl, size, tables)
+        for table in tables:
+            self._keys_by_table[table].add(key)
+        self.bytes_used += size
+
+        while self.bytes_used > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_for(self, function_name: str):
+        """Drop entries that depend on tables written by a mutation or action."""
+        tables = tables_written_by(function_name)
+        for table in tables:
+            self._generations[table] += 1
+            for key in list(self._keys_by_table.get(table, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes_used -= entry[2]
+        for table in entry[3]:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_table.clear()
+        self.bytes_used = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss, size and invalidation counters."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
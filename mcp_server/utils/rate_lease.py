@@ -0,0 +1,90 @@
+"""
+Shared rate limit backend for MCP server.
+Leases batches of GCRA tokens from a Redis-protocol store in one atomic script.
+"""
+
+import os
+import time
+import hashlib
+from typing import List, Optional, Tuple
+
+from .resp import LocalRespServer, RespClient, RespError
+
+# GCRA over a shared TAT in integer microseconds of server time.
+# KEYS[1] = TAT key; ARGV = interval, window, tokens wanted, tokens refunded.
+# Returns {tokens granted, microseconds until one would be}.
+LEASE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000000 + tonumber(now[2])
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now) - refund * interval
+if tat < now then tat = now end
+local granted = math.min(want, math.floor((now + window - tat) / interval))
+if granted < 1 then
+  if refund > 0 then
+    redis.call('SET', KEYS[1], string.format('%d', tat), 'PX', math.ceil((tat - now) / 1000) + 1)
+  end
+  return {0, tat + interval - window - now}
+end
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], string.format('%d', tat), 'PX', math.ceil((tat - now) / 1000) + 1)
+return {granted, 0}
+"""
+
+LEASE_SCRIPT_SHA = hashlib.sha1(LEASE_SCRIPT.encode()).hexdigest()
+
+
+def lease_tokens(stored: Optional[int], now: int, interval: int, window: int, want: int, refund: int) -> Tuple[int, int, int]:
+    """Python twin of LEASE_SCRIPT: (new TAT, tokens granted, microseconds to wait)."""
+    tat = max((stored if stored is not None else now) - refund * interval, now)
+    granted = min(want, (now + window - tat) // interval)
+    if granted < 1:
+        return tat, 0, tat + interval - window - now
+    return tat + granted * interval, granted, 0
+
+
+def install_lease_script(server: LocalRespServer):
+    """Serve LEASE_SCRIPT from the local stand-in."""
+    def run(server: LocalRespServer, keys: List[bytes], args: List[bytes]) -> List[int]:
+        now = int(time.time() * 1_000_000)
+        interval, window, want, refund = (int(a) for a in args)
+        stored = server._get(keys[0])
+        tat, granted, retry = lease_tokens(int(stored) if stored is not None else None, now, interval, window, want, refund)
+        if granted or refund:
+            server.data[keys[0]] = (str(tat).encode(), time.monotonic() + (tat - now) / 1_000_000 + 0.001)
+        return [granted, retry]
+
+    server.register_script(LEASE_SCRIPT, run)
+
+
+class RespLeaseBackend:
+    """
+    Rate limit state in Redis, or anything speaking its protocol.
+
+    One key per limited key holds its TAT; a lease is a single EVALSHA, so
+    workers never race on read-modify-write. The script is sent in full
+    only when the server does not have it cached yet.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, prefix: str = "mcp:ratelimit:"):
+        self.client = RespClient(url or os.getenv("RATE_LIMIT_REDIS_URL") or os.getenv("SESSION_REDIS_URL", "redis://127.0.0.1:6379/0"))
+        self.prefix = prefix
+
+    async def lease(self, key: str, interval: float, window: float, want: int, refund: int = 0) -> Tuple[int, float]:
+        """Take up to `want` tokens, returning `refund` unused ones; (granted, seconds to wait if none)."""
+        args = (1, self.prefix + key, max(int(interval * 1_000_000), 1), int(window * 1_000_000), want, refund)
+        reply = (await self.client.pipeline([("EVALSHA", LEASE_SCRIPT_SHA) + args]))[0]
+        if isinstance(reply, RespError) and str(reply).startswith("NOSCRIPT"):
+            reply = (await self.client.pipeline([("EVAL", LEASE_SCRIPT) + args]))[0]
+        if isinstance(reply, RespError):
+            raise reply
+        granted, retry = reply
+        return granted, retry / 1_000_000
+
+    async def close(self):
+        await self.client.close()
@@ -0,0 +1,196 @@
+"""
+Retry and circuit breaking for Convex backend calls.
+Transient failures of reads are retried with jittered backoff; functions that
+keep failing are short-circuited until the backend recovers.
+"""
+
+import os
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from .convex_transport import ConvexTransportError
+from .executor import ExecutorSaturatedError
+from .deadline import DeadlineExceededError, remaining
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a function whose circuit is open."""
+
+    def __init__(self, function_name: str, retry_in: float):
+        super().__init__(f"{function_name} is temporarily unavailable (circuit open, retry in {retry_in:.1f}s)")
+        self.function_name = function_name
+        self.retry_in = retry_in
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a failure is worth retrying and should count against the circuit.
+
+    Network errors, timeouts and 5xx/429 responses are transient. Errors
+    raised by the Convex function itself (ConvexError, validation failures)
+    mean the backend is healthy and are not.
+    """
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    if isinstance(error, ConvexTransportError) and error.status_code is not None:
+        return error.status_code >= 500 or error.status_code == 429
+    return False
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one backend function.
+
+    Opens after `failure_threshold` consecutive transient failures. While
+    open, calls fail fast; after `reset_timeout` a single probe is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._probe_in_flight = False
+
+    def before_call(self, function_name: str):
+        """Raise CircuitOpenError if the call must not reach the backend."""
+        if self.state == self.CLOSED:
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == self.OPEN and elapsed >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.short_circuited += 1
+        raise CircuitOpenError(function_name, max(self.reset_timeout - elapsed, 0.0))
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release(self):
+        """End a call whose outcome says nothing about backend health."""
+        self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+class Resilience:
+    """
+    Applies retries and per-function circuit breakers to backend calls.
+
+    Only idempotent calls (queries) are retried. Delays use full jitter,
+    capped by `max_delay`, so that a blip does not turn into synchronized
+    retry waves; the attempt cap keeps worst-case latency bounded.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ):
+        self.max_attempts = max(1, max_attempts or int(os.getenv("CONVEX_RETRY_ATTEMPTS", "3")))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("CONVEX_RETRY_BASE_DELAY", "0.05"))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("CONVEX_RETRY_MAX_DELAY", "1.0"))
+        self.failure_threshold = failure_threshold or int(os.getenv("CONVEX_BREAKER_FAILURES", "5"))
+        self.reset_timeout = reset_timeout if reset_timeout is not None else float(os.getenv("CONVEX_BREAKER_RESET_TIMEOUT", "30"))
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+        self.retries = 0
+        self.retries_exhausted = 0
+        self.transient_failures = 0
+
+    def breaker_for(self, function_name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(function_name)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self.breakers[function_name] = breaker
+        return breaker
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def call(self, function_name: str, func: Callable[[], Awaitable[Any]], idempotent: bool = False) -> Any:
+        """Run `func` behind the function's breaker, retrying if idempotent."""
+        breaker = self.breaker_for(function_name)
+        attempt = 0
+        while True:
+            breaker.before_call(function_name)
+            try:
+                result = await func()
+            except (ExecutorSaturatedError, DeadlineExceededError):
+                # Local overload or an expired caller, not a backend failure
+                breaker.release()
+                raise
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                if not is_transient(e):
+                    breaker.record_success()
+                    raise
+                self.transient_failures += 1
+                breaker.record_failure()
+                delay = self.backoff(attempt)
+                left = remaining()
+                if not idempotent or attempt + 1 >= self.max_attempts or (left is not None and delay >= left):
+                    if idempotent:
+                        self.retries_exhausted += 1
+                    raise
+                self.retries += 1
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            breaker.record_success()
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retry counters and the state of every breaker that is not closed."""
+        return {
+            "retries": self.retries,
+            "retries_exhausted": self.retries_exhausted,
+            "transient_failures": self.transient_failures,
+            "breakers_open": sum(1 for b in self.breakers.values() if b.state != CircuitBreaker.CLOSED),
+            "short_circuited": sum(b.short_circuited for b in self.breakers.values()),
+            "breakers": {
+                name: b.get_stats()
+                for name, b in self.breakers.items()
+                if b.state != CircuitBreaker.CLOSED or b.times_opened
+            },
+        }
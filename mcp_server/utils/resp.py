@@ -0,0 +1,291 @@
+"""
+Minimal Redis-protocol (RESP2) client for MCP server.
+Also provides a small in-process stand-in server for local runs and benchmarks.
+"""
+
+import time
+import asyncio
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+
+class RespError(Exception):
+    """Raised for an error reply from the server."""
+
+
+def _encode_command(args: Sequence[Any]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode()
+        else:
+            data = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("RESP connection closed")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RespError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(rest)
+        if count < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(count)]
+    raise ConnectionError(f"Unexpected RESP reply: {line!r}")
+
+
+class RespClient:
+    """
+    One pipelined connection to a Redis-protocol server.
+
+    Commands are written and their replies read under a lock, so concurrent
+    callers share the connection safely. `pipeline` sends several commands
+    in one write and reads all replies back.
+    """
+
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", timeout: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for reply in await self._roundtrip(setup):
+                if isinstance(reply, RespError):
+                    raise reply
+
+    async def _roundtrip(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        self._writer.write(b"".join(_encode_command(c) for c in commands))
+        await self._writer.drain()
+        return [await asyncio.wait_for(_read_reply(self._reader), self.timeout) for _ in commands]
+
+    async def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Send commands in one write; error replies are returned, not raised."""
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._roundtrip(commands)
+            except BaseException:
+                # Replies may still be in flight (a timeout, or the caller was
+                # cancelled mid-read); the next caller would read them as its
+                # own, so start over on a fresh connection
+                self._close_writer()
+                raise
+
+    async def execute(self, *args: Any) -> Any:
+        reply = (await self.pipeline([args]))[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self):
+        self._close_writer()
+
+
+class LocalRespServer:
+    """
+    In-process stand-in for a Redis server.
+
+    Implements the handful of commands the session store and rate limiter
+    use (strings with millisecond expiry, counters, key deletion), so those
+    backends can run and be benchmarked without a real Redis. It cannot run
+    Lua: scripts are served by Python handlers registered for their exact
+    source with `register_script`, and EVAL/EVALSHA/SCRIPT LOAD behave as on
+    Redis for those scripts (including NOSCRIPT until a script is loaded).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        # key -> (value, expires_at monotonic or None)
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        # sha1 -> handler(server, keys, args); loaded = sha1s EVALSHA accepts
+        self.scripts: Dict[bytes, Callable[["LocalRespServer", List[bytes], List[bytes]], Any]] = {}
+        self.loaded: set = set()
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> "LocalRespServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def register_script(self, source: str, handler: Callable[["LocalRespServer", List[bytes], List[bytes]], Any]):
+        """Run `handler` for EVAL of `source`; it returns an int, bytes, None or a list of those."""
+        self.scripts[hashlib.sha1(source.encode()).hexdigest().encode()] = handler
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                command = await _read_reply(reader)
+                writer.write(self._dispatch(command))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away, or the stand-in is shutting down
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, command: List[bytes]) -> bytes:
+        name = command[0].upper()
+        args = command[1:]
+        handler = getattr(self, "_cmd_" + name.decode().lower(), None)
+        if handler is None:
+            return b"-ERR unknown command '%s'\r\n" % name
+        try:
+            return handler(*args)
+        except (TypeError, ValueError):
+            return b"-ERR wrong number or type of arguments for '%s'\r\n" % name
+
+    @staticmethod
+    def _bulk(value: Optional[bytes]) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    @classmethod
+    def _reply(cls, value: Any) -> bytes:
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(cls._reply(v) for v in value)
+        return cls._bulk(value)
+
+    def _cmd_ping(self, *args):
+        return b"+PONG\r\n"
+
+    def _cmd_select(self, db):
+        return b"+OK\r\n"
+
+    def _cmd_get(self, key):
+        return self._bulk(self._get(key))
+
+    def _cmd_set(self, key, value, *options):
+        expires_at = None
+        nx = False
+        options = [o.upper() for o in options]
+        i = 0
+        while i < len(options):
+            if options[i] == b"PX":
+                expires_at = time.monotonic() + int(options[i + 1]) / 1000
+                i += 2
+            elif options[i] == b"EX":
+                expires_at = time.monotonic() + int(options[i + 1])
+                i += 2
+            elif options[i] == b"NX":
+                nx = True
+                i += 1
+            else:
+                raise ValueError(options[i])
+        if nx and self._get(key) is not None:
+            return b"$-1\r\n"
+        self.data[key] = (value, expires_at)
+        return b"+OK\r\n"
+
+    def _cmd_del(self, *keys):
+        removed = sum(1 for key in keys if self._get(key) is not None and self.data.pop(key, None))
+        return b":%d\r\n" % removed
+
+    def _cmd_incrby(self, key, amount):
+        value = int(self._get(key) or 0) + int(amount)
+        expires_at = self.data[key][1] if key in self.data else None
+        self.data[key] = (str(value).encode(), expires_at)
+        return b":%d\r\n" % value
+
+    def _cmd_pexpire(self, key, ms):
+        value = self._get(key)
+        if value is None:
+            return b":0\r\n"
+        self.data[key] = (value, time.monotonic() + int(ms) / 1000)
+        return b":1\r\n"
+
+    def _cmd_dbsize(self):
+        return b":%d\r\n" % len(self.data)
+
+    def _cmd_flushdb(self):
+        self.data.clear()
+        return b"+OK\r\n"
+
+    def _run_script(self, sha: bytes, numkeys, *rest):
+        numkeys = int(numkeys)
+        handler = self.scripts[sha]
+        return self._reply(handler(self, list(rest[:numkeys]), list(rest[numkeys:])))
+
+    def _cmd_eval(self, source, numkeys, *rest):
+        sha = hashlib.sha1(source).hexdigest().encode()
+        if sha not in self.scripts:
+            return b"-ERR the stand-in only runs registered scripts\r\n"
+        self.loaded.add(sha)
+        return self._run_script(sha, numkeys, *rest)
+
+    def _cmd_evalsha(self, sha, numkeys, *rest):
+        sha = sha.lower()
+        if sha not in self.loaded:
+            return b"-NOSCRIPT No matching script. Please use EVAL.\r\n"
+        return self._run_script(sha, numkeys, *rest)
+
+    def _cmd_script(self, subcommand, *args):
+        if subcommand.upper() != b"LOAD":
+            raise ValueError(subcommand)
+        sha = hashlib.sha1(args[0]).hexdigest().encode()
+        if sha not in self.scripts:
+            return b"-ERR the stand-in only runs registered scripts\r\n"
+        self.loaded.add(sha)
+        return self._bulk(sha)
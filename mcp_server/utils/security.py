@@ -4,10 +4,17 @@ Handles CORS, rate limiting, and other security settings.
 """
 
 import os
-from typing import List, Dict, Any
+import re
+import asyncio
+import binascii
+import hashlib
+import inspect
+from typing import List, Dict, Any, Optional, Tuple
 from functools import wraps
 import time
-from collections import defaultdict, deque
+
+from .rate_lease import RespLeaseBackend
+from .base64_stream import decoded_length, strip_whitespace
 
 class SecurityConfig:
     """Security configuration settings."""
@@ -18,8 +25,15 @@ class SecurityConfig:
         self.cors_headers = self._parse_list(os.getenv("CORS_HEADERS", "Content-Type,Accept"))
         self.rate_limit_requests = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
         self.rate_limit_window = int(os.getenv("RATE_LIMIT_WINDOW", "60000")) / 1000  # Convert to seconds
+        self.rate_limit_tool_requests = int(os.getenv("RATE_LIMIT_TOOL_REQUESTS", "0"))
+        self.rate_limit_global_requests = int(os.getenv("RATE_LIMIT_GLOBAL_REQUESTS", "0"))
+        self.rate_limit_max_keys = int(os.getenv("RATE_LIMIT_MAX_KEYS", "1000000"))
+        self.rate_limit_backend = os.getenv("RATE_LIMIT_BACKEND", "local").strip().lower()
+        self.rate_limit_lease_size = int(os.getenv("RATE_LIMIT_LEASE_SIZE", "64"))
+        self.rate_limit_lease_ttl = float(os.getenv("RATE_LIMIT_LEASE_TTL", "1.0"))
         self.max_file_size = int(os.getenv("MAX_FILE_SIZE", "10485760"))
         self.allowed_file_types = self._parse_list(os.getenv("ALLOWED_FILE_TYPES", "application/pdf"))
+        self.max_pdf_pages = int(os.getenv("MAX_PDF_PAGES", "0"))
     
     def _parse_list(self, value: str) -> List[str]:
         """Parse comma-separated string into list."""
@@ -40,71 +54,423 @@ class SecurityConfig:
         }
 
 class RateLimiter:
-    """Simple in-memory rate limiter."""
+    """
+    GCRA rate limiter with constant memory per client.
+
+    Each key stores one float, its theoretical arrival time (TAT): requests
+    are spaced `window_seconds / max_requests` apart, and up to
+    `max_requests` may arrive back to back. Keys live in two generations
+    that rotate every window; a key not touched for a whole generation has
+    a TAT in the past, which is the same as having no entry, so the older
+    generation is dropped wholesale on rotation. Reaching `max_keys` rotates
+    early, which at worst gives some clients a fresh bucket. The cap is per
+    generation, so up to 2 x `max_keys` keys can be held at once.
+    """
     
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(self, max_requests: int = 100, window_seconds: float = 60, max_keys: int = 1_000_000):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = defaultdict(deque)
+        self.interval = window_seconds / max_requests
+        self.max_keys = max_keys
+        # client id -> TAT (time.monotonic()), touched this / last generation
+        self.requests: Dict[str, float] = {}
+        self._previous: Dict[str, float] = {}
+        self._rotate_at = time.monotonic() + window_seconds
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def _rotate(self, now: float):
+        self.evicted += len(self._previous)
+        self._previous = self.requests
+        self.requests = {}
+        self._rotate_at = now + self.window_seconds
+
+    def check(self, client_id: str, now: float) -> Tuple[float, float]:
+        """(new TAT if this request is admitted, seconds until it would be allowed)."""
+        tat = self.requests.get(client_id)
+        if tat is None:
+            tat = self._previous.get(client_id, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + self.interval
+        return new_tat, max(new_tat - self.window_seconds - now, 0.0)
+
+    def commit(self, client_id: str, new_tat: float, now: float):
+        """Record an admitted request."""
+        if now >= self._rotate_at or len(self.requests) >= self.max_keys:
+            self._rotate(now)
+        self.requests[client_id] = new_tat
     
     def is_allowed(self, client_id: str) -> bool:
         """Check if request is allowed for client."""
-        now = time.time()
-        client_requests = self.requests[client_id]
-        
-        # Remove old requests outside the window
-        while client_requests and client_requests[0] < now - self.window_seconds:
-            client_requests.popleft()
-        
-        # Check if limit exceeded
-        if len(client_requests) >= self.max_requests:
+        # check() and commit() inlined: this runs on every rate-limited call
+        now = time.monotonic()
+        requests = self.requests
+        tat = requests.get(client_id)
+        if tat is None:
+            tat = self._previous.get(client_id, now)
+        if tat < now:
+            tat = now
+        tat += self.interval
+        if tat - now > self.window_seconds:
+            self.limited += 1
             return False
-        
-        # Record this request
-        client_requests.append(now)
+        if now >= self._rotate_at or len(requests) >= self.max_keys:
+            self._rotate(now)
+        self.requests[client_id] = tat
+        self.allowed += 1
         return True
     
     def get_reset_time(self, client_id: str) -> int:
-        """Get timestamp when rate limit resets for client."""
-        client_requests = self.requests[client_id]
-        if not client_requests:
-            return int(time.time())
-        
-        return int(client_requests[0] + self.window_seconds)
+        """Get timestamp when the client may make its next request."""
+        _, retry_after = self.check(client_id, time.monotonic())
+        return int(time.time() + retry_after)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self.requests) + len(self._previous),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
+
+
+class RateLimits:
+    """
+    Per-identity, per-tool and global limits checked together.
+
+    A call is admitted only if every configured limit has room, and only
+    then is it charged to each of them, so a rejected call does not use up
+    another scope's budget. Limits with a request count of 0 are off.
+    """
+
+    def __init__(self, config: "SecurityConfig"):
+        window = config.rate_limit_window
+        self.scopes: List[Tuple[str, RateLimiter]] = []
+        for scope, requests in (
+            ("identity", config.rate_limit_requests),
+            ("tool", config.rate_limit_tool_requests),
+            ("global", config.rate_limit_global_requests),
+        ):
+            if requests > 0:
+                self.scopes.append((scope, RateLimiter(requests, window, config.rate_limit_max_keys)))
+
+    async def acquire(self, identity: str, tool: str) -> Optional[Tuple[str, float]]:
+        """Admit a call, or return (scope, seconds to wait) for the limit it hit."""
+        return self.acquire_local(identity, tool)
+
+    def acquire_local(self, identity: str, tool: str) -> Optional[Tuple[str, float]]:
+        """`acquire` against this process's limiters only."""
+        now = time.monotonic()
+        keys = {"identity": identity, "tool": tool, "global": ""}
+        admitted = []
+        for scope, limiter in self.scopes:
+            key = keys[scope]
+            new_tat, retry_after = limiter.check(key, now)
+            if retry_after > 0:
+                limiter.limited += 1
+                return scope, retry_after
+            admitted.append((limiter, key, new_tat))
+        for limiter, key, new_tat in admitted:
+            limiter.commit(key, new_tat, now)
+            limiter.allowed += 1
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {scope: limiter.get_stats() for scope, limiter in self.scopes}
+
+    async def close(self):
+        pass
+
+
+class _Lease:
+    """Tokens a worker holds for one key, or a note that the key is limited."""
+
+    __slots__ = ("remaining", "expires_at", "size", "blocked_until", "retry_at")
+
+    def __init__(self, remaining: int, expires_at: float, size: int):
+        self.remaining = remaining
+        self.expires_at = expires_at
+        self.size = size
+        self.blocked_until = 0.0
+        self.retry_at = 0.0
+
+
+class SharedRateLimits(RateLimits):
+    """
+    RateLimits enforced across workers through a shared backend.
+
+    A worker leases tokens for a key in batches and admits calls from its
+    lease until the lease runs out or is `lease_ttl` old, so most calls cost
+    a dict lookup and only one call per batch waits on the backend; calls
+    for a key that arrive while its lease is being fetched wait for that
+    fetch instead of starting their own. A key's lease starts at one token
+    and doubles each time it is used up in time, up to `lease_size` and a
+    tenth of the limit's burst, so hot keys (a tool, the global limit)
+    rarely reach the backend while one-off identities do not strand tokens.
+    Tokens left in an expired lease are handed back with the next lease for
+    that key. A refusal is remembered for up to `lease_ttl`, so an
+    over-limit client is turned away locally. If the backend cannot be
+    reached, the per-process limits apply until it can.
+    """
+
+    def __init__(self, config: "SecurityConfig", backend: Any, lease_size: Optional[int] = None, lease_ttl: Optional[float] = None):
+        super().__init__(config)
+        self.backend = backend
+        self.lease_size = lease_size or config.rate_limit_lease_size
+        self.lease_ttl = lease_ttl if lease_ttl is not None else config.rate_limit_lease_ttl
+        self.max_keys = config.rate_limit_max_keys
+        # "<scope>:<key>" -> _Lease, two generations rotated every lease_ttl
+        # (a lease older than that is expired, so dropping it loses nothing)
+        self.leases: Dict[str, _Lease] = {}
+        self._previous: Dict[str, _Lease] = {}
+        self._rotate_at = time.monotonic() + self.lease_ttl
+        self._fetching: Dict[str, asyncio.Future] = {}
+        self._down_until = 0.0
+        self.allowed = 0
+        self.limited = 0
+        self.local_hits = 0
+        self.backend_calls = 0
+        self.backend_errors = 0
+        self.last_error: Optional[str] = None
+
+    async def acquire(self, identity: str, tool: str) -> Optional[Tuple[str, float]]:
+        if time.monotonic() < self._down_until:
+            return self.acquire_local(identity, tool)
+        keys = {"identity": identity, "tool": tool, "global": ""}
+        taken = []
+        try:
+            for scope, limiter in self.scopes:
+                name = scope + ":" + keys[scope]
+                retry_after = await self._take(name, limiter)
+                if retry_after > 0:
+                    self._give_back(taken)
+                    self.limited += 1
+                    return scope, retry_after
+                taken.append(name)
+        except Exception as e:
+            self._give_back(taken)
+            self.backend_errors += 1
+            self.last_error = str(e)
+            self._down_until = time.monotonic() + self.lease_ttl
+            return self.acquire_local(identity, tool)
+        self.allowed += 1
+        return None
+
+    def _give_back(self, names: List[str]):
+        for name in names:
+            lease = self.leases.get(name) or self._previous.get(name)
+            if lease is not None:
+                lease.remaining += 1
+
+    async def _take(self, name: str, limiter: RateLimiter) -> float:
+        """Take one token for `name`; returns 0, or seconds until one is available."""
+        while True:
+            now = time.monotonic()
+            lease = self.leases.get(name) or self._previous.get(name)
+            if lease is not None:
+                if lease.remaining > 0 and lease.expires_at > now:
+                    lease.remaining -= 1
+                    self.local_hits += 1
+                    return 0.0
+                if lease.blocked_until > now:
+                    return lease.retry_at - now
+            fetching = self._fetching.get(name)
+            if fetching is None:
+                return await self._fetch(name, limiter, lease, now)
+            await fetching
+
+    async def _fetch(self, name: str, limiter: RateLimiter, lease: Optional[_Lease], now: float) -> float:
+        refund = 0
+        if lease is None:
+            size = 1
+        elif lease.expires_at <= now and lease.remaining > 0:
+            # Outlived its lease: return the rest and ask for less next time
+            refund = lease.remaining
+            size = max(lease.size // 2, 1)
+        elif lease.remaining == 0 and lease.expires_at > now:
+            size = min(lease.size * 2, self.lease_size, max(limiter.max_requests // 10, 1))
+        else:
+            size = lease.size
+
+        fetching = asyncio.get_running_loop().create_future()
+        self._fetching[name] = fetching
+        try:
+            self.backend_calls += 1
+            granted, retry_after = await self.backend.lease(name, limiter.interval, limiter.window_seconds, size, refund)
+        finally:
+            del self._fetching[name]
+            fetching.set_result(None)
+
+        now = time.monotonic()
+        if now >= self._rotate_at or len(self.leases) >= self.max_keys:
+            self._previous = self.leases
+            self.leases = {}
+            self._rotate_at = now + self.lease_ttl
+        fresh = _Lease(max(granted - 1, 0), now + self.lease_ttl, size)
+        self.leases[name] = fresh
+        self._previous.pop(name, None)
+        if granted < 1:
+            fresh.blocked_until = now + min(retry_after, self.lease_ttl)
+            fresh.retry_at = now + retry_after
+            return max(retry_after, 1e-6)
+        return 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["shared"] = {
+            "backend": self.backend.name,
+            "leases": len(self.leases) + len(self._previous),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "local_hits": self.local_hits,
+            "backend_calls": self.backend_calls,
+            "backend_errors": self.backend_errors,
+            "last_error": self.last_error,
+        }
+        return stats
+
+    async def close(self):
+        await self.backend.close()
+
+
+RATE_LIMIT_BACKENDS = {
+    "redis": RespLeaseBackend,
+}
+
+
+def create_rate_limits(config: "SecurityConfig") -> RateLimits:
+    """
+    Build the limits for RATE_LIMIT_BACKEND.
+
+    "local" keeps limits per process; any other backend shares them
+    between all workers that point at it.
+    """
+    if config.rate_limit_backend == "local":
+        return RateLimits(config)
+    if config.rate_limit_backend not in RATE_LIMIT_BACKENDS:
+        raise ValueError(
+            f"Unknown RATE_LIMIT_BACKEND {config.rate_limit_backend!r}; expected local, {', '.join(RATE_LIMIT_BACKENDS)}"
+        )
+    return SharedRateLimits(config, RATE_LIMIT_BACKENDS[config.rate_limit_backend]())
+
 
 # Global instances
 security_config = SecurityConfig()
-rate_limiter = RateLimiter(
-    max_requests=security_config.rate_limit_requests,
-    window_seconds=int(security_config.rate_limit_window)
-)
+rate_limits = create_rate_limits(security_config)
+
+
+async def cleanup_rate_limits():
+    """Close the shared rate limit backend, if any."""
+    await rate_limits.close()
+
+
+def _default_client_id(func):
+    """Build an identity extractor for a tool: its auth token, else its email argument."""
+    parameters = list(inspect.signature(func).parameters)
+
+    def positional(name):
+        return parameters.index(name) if name in parameters else None
+
+    token_position = positional("auth_token")
+    email_position = positional("email")
+
+    def client_id(*args, **kwargs) -> str:
+        for name, position, prefix in (("auth_token", token_position, "token:"), ("email", email_position, "email:")):
+            value = kwargs.get(name)
+            if value is None and position is not None and position < len(args):
+                value = args[position]
+            if value:
+                # Hash tokens so the limiter never holds credentials
+                return prefix + (hashlib.sha256(value.encode()).hexdigest()[:32] if name == "auth_token" else str(value).lower())
+        return "anonymous"
+
+    return client_id
+
 
 def require_rate_limit(client_id_func=None):
     """Decorator to apply rate limiting to functions."""
     def decorator(func):
+        identify = client_id_func or _default_client_id(func)
+        tool = func.__name__
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Extract client ID (could be IP, auth token, etc.)
             client_id = "default"
-            if client_id_func:
-                try:
-                    client_id = client_id_func(*args, **kwargs)
-                except:
-                    pass
+            try:
+                client_id = identify(*args, **kwargs)
+            except Exception:
+                pass
             
-            if not rate_limiter.is_allowed(client_id):
-                reset_time = rate_limiter.get_reset_time(client_id)
-                raise Exception(f"Rate limit exceeded. Reset at: {reset_time}")
+            limited = await rate_limits.acquire(client_id, tool)
+            if limited is not None:
+                scope, retry_after = limited
+                reset_time = int(time.time() + retry_after)
+                raise Exception(f"Rate limit exceeded ({scope}). Reset at: {reset_time}")
             
             return await func(*args, **kwargs)
         return wrapper
     return decorator
 
+# Bytes at each end of a file that content checks look at
+FILE_CHECK_BYTES = 1024
+
+# Leading bytes of each file type that has a fixed signature
+FILE_SIGNATURES = {
+    "application/pdf": b"%PDF-",
+    "application/msword": b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": b"PK\x03\x04",
+}
+# Page count in the linearization dictionary at the start of a web-optimized PDF
+_PDF_LINEARIZED_PAGES = re.compile(rb"/Linearized\b[^>]*?/N\s+(\d+)")
+
 def validate_file_upload(file_data: str, file_name: str, content_type: str) -> None:
-    """Validate file upload security."""
-    # Check file size (base64 encoded, so actual size is ~75% of string length)
-    estimated_size = len(file_data) * 0.75
-    if estimated_size > security_config.max_file_size:
+    """
+    Validate a base64 encoded file before any of it is decoded or sent.
+
+    The exact size comes from the base64 length and padding, and only the
+    first and last FILE_CHECK_BYTES are decoded, to check the content
+    matches its type.
+    """
+    file_data = strip_whitespace(file_data)
+    file_size = decoded_length(file_data)
+    validate_upload_metadata(file_size, file_name, content_type)
+
+    # Whole 4-character groups covering each end
+    group_chars = -(-FILE_CHECK_BYTES // 3) * 4
+    try:
+        head = binascii.a2b_base64(file_data[:group_chars], strict_mode=True)[:FILE_CHECK_BYTES]
+        tail = binascii.a2b_base64(file_data[-group_chars:] if len(file_data) > group_chars else file_data,
+                                   strict_mode=True)[-FILE_CHECK_BYTES:]
+    except binascii.Error:
+        raise ValueError("File is not valid base64")
+    validate_file_content(content_type, head, tail)
+
+def validate_file_content(content_type: str, head: bytes, tail: Optional[bytes] = None) -> None:
+    """
+    Check a file's first bytes (and last, once known) against its declared type.
+
+    Files must start with the signature of their type. PDFs must also end
+    with an %%EOF marker. When MAX_PDF_PAGES is set, a linearized PDF
+    declares its page count up front and is refused if it has too many;
+    other PDFs are only held to the size limit, since counting their pages
+    means reading the whole file.
+    """
+    signature = FILE_SIGNATURES.get(content_type)
+    if signature is not None and not head.startswith(signature):
+        raise ValueError(f"File content does not match its type {content_type}")
+    if content_type == "application/pdf":
+        if tail is not None and b"%%EOF" not in tail:
+            raise ValueError("File is not a complete PDF: missing %%EOF marker")
+        pages = _PDF_LINEARIZED_PAGES.search(head)
+        if security_config.max_pdf_pages and pages and int(pages.group(1)) > security_config.max_pdf_pages:
+            raise ValueError(f"PDF has too many pages. Max pages: {security_config.max_pdf_pages}")
+
+def validate_upload_metadata(file_size: float, file_name: str, content_type: str) -> None:
+    """Validate the declared size, type and name of a file before any of it arrives."""
+    if file_size > security_config.max_file_size:
         raise ValueError(f"File too large. Max size: {security_config.max_file_size} bytes")
     
     # Check file type
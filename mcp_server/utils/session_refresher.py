@@ -0,0 +1,153 @@
+"""
+Background session refresh for MCP server.
+Renews sessions in rate-limited batches before they expire.
+"""
+
+import os
+import time
+import heapq
+import random
+import asyncio
+import itertools
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class SessionRefresher:
+    """
+    Refreshes sessions ahead of expiry so tool calls never wait on it.
+
+    Each session is scheduled for a refresh at a jittered point within the
+    last `refresh_ahead` seconds of its life, which spreads sessions created
+    together (a fleet logging in at once) over that window. A token bucket
+    caps refreshes at `rate` per second, drawn in batches of at most
+    `batch_size` that run concurrently; anything over the budget waits for
+    the next tick. Sessions that have not been used for `idle_after`
+    seconds are left to expire.
+
+    Each session key has at most one planned refresh. Scheduling a session
+    again for the same expiry, as every reload from a shared store does,
+    keeps the existing plan.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[Any], Awaitable[Any]],
+        lookup: Callable[[str], Optional[Any]],
+        refresh_ahead: Optional[float] = None,
+        rate: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        idle_after: Optional[float] = None,
+    ):
+        self.refresh = refresh
+        self.lookup = lookup
+        self.refresh_ahead = refresh_ahead if refresh_ahead is not None else float(os.getenv("SESSION_REFRESH_AHEAD", "3600"))
+        self.rate = rate if rate is not None else float(os.getenv("SESSION_REFRESH_RATE", "5"))
+        self.batch_size = batch_size or int(os.getenv("SESSION_REFRESH_BATCH", "20"))
+        self.idle_after = idle_after if idle_after is not None else float(os.getenv("SESSION_REFRESH_IDLE", "3600"))
+        # (refresh_at, seq, session_key, expires_at when scheduled); entries
+        # no longer in _planned are skipped when popped
+        self._heap: List[tuple] = []
+        # session key -> (refresh_at, expires_at) of its current plan
+        self._planned: Dict[str, Tuple[float, float]] = {}
+        self._seq = itertools.count()
+        self._allowance = float(self.batch_size)
+        self._last_tick = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+        self.refreshed = 0
+        self.failed = 0
+        self.skipped_idle = 0
+        self.deferred = 0
+
+    def schedule(self, session_key: str, session: Any):
+        """Plan the refresh of a session for its current expiry, unless already planned."""
+        planned = self._planned.get(session_key)
+        if planned is not None and planned[1] == session.expires_at:
+            return
+        refresh_at = session.expires_at - self.refresh_ahead * random.uniform(0.5, 1.0)
+        self._planned[session_key] = (refresh_at, session.expires_at)
+        heapq.heappush(self._heap, (refresh_at, next(self._seq), session_key, session.expires_at))
+        # Extended sessions leave their old entries behind
+        if len(self._heap) > 2 * len(self._planned) + 1024:
+            self._heap = [e for e in self._heap if self._planned.get(e[2]) == (e[0], e[3])]
+            heapq.heapify(self._heap)
+
+    def discard(self, session_key: str):
+        """Drop the plan for a session that is gone for good."""
+        self._planned.pop(session_key, None)
+
+    def _take_due(self, now: float, limit: int) -> List[Any]:
+        """Pop up to `limit` due sessions that still need refreshing."""
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < limit:
+            refresh_at, _, session_key, expires_at = heapq.heappop(self._heap)
+            # Superseded by a later plan or discarded
+            if self._planned.get(session_key) != (refresh_at, expires_at):
+                continue
+            del self._planned[session_key]
+            session = self.lookup(session_key)
+            # Removed, or extended without being rescheduled
+            if session is None or session.expires_at != expires_at:
+                continue
+            if now - session.last_used > self.idle_after:
+                self.skipped_idle += 1
+                continue
+            due.append(session)
+        return due
+
+    async def run_once(self) -> int:
+        """Refresh one rate-limited batch; returns how many were attempted."""
+        tick = time.monotonic()
+        self._allowance = min(float(self.batch_size), self._allowance + (tick - self._last_tick) * self.rate)
+        self._last_tick = tick
+        now = time.time()
+        batch = self._take_due(now, int(self._allowance))
+        if self._heap and self._heap[0][0] <= now and len(batch) == int(self._allowance):
+            self.deferred += 1
+        if not batch:
+            return 0
+        self._allowance -= len(batch)
+        results = await asyncio.gather(*(self.refresh(s.auth_token) for s in batch), return_exceptions=True)
+        for result in results:
+            if result is None or isinstance(result, BaseException):
+                self.failed += 1
+            else:
+                self.refreshed += 1
+        return len(batch)
+
+    async def _loop(self):
+        while True:
+            await self.run_once()
+            delay = min(60.0, self._heap[0][0] - time.time()) if self._heap else 60.0
+            if delay <= 0:
+                # Backlog: wait until a full batch fits in the budget
+                delay = (self.batch_size - self._allowance) / self.rate
+            await asyncio.sleep(max(delay, 0.05))
+
+    def start(self):
+        """Start on the running loop, once."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+        except RuntimeError:
+            pass
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "scheduled": len(self._planned),
+            "heap_entries": len(self._heap),
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "skipped_idle": self.skipped_idle,
+            "deferred_ticks": self.deferred,
+        }
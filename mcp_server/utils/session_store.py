@@ -0,0 +1,431 @@
+"""
+Session storage backends for MCP server.
+Lets several worker processes or hosts share authenticated sessions.
+"""
+
+import os
+import time
+import heapq
+import struct
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .executor import get_backend_executor
+from .resp import RespClient
+
+try:
+    import fcntl
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    fcntl = None
+
+
+class SessionStore(ABC):
+    """
+    Interface for session backends.
+
+    Sessions are opaque encoded records keyed by the token hash, with a
+    secondary lookup by email and an absolute expiry. Backends drop expired
+    records on their own; `expire` lets the sweeper reclaim space in the
+    ones that cannot expire keys natively. `shared` tells AuthManager
+    whether other processes may change the store behind its back, in which
+    case its local copies are only trusted for a short while.
+    """
+
+    name = "base"
+    shared = True
+
+    @abstractmethod
+    async def get(self, token_hash: str) -> Optional[bytes]:
+        """Record stored under a token hash, unless expired."""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[bytes]:
+        """Latest unexpired record for an email."""
+
+    @abstractmethod
+    async def put(self, token_hash: str, email: str, expires_at: float, record: bytes):
+        """Store or replace a record."""
+
+    @abstractmethod
+    async def delete(self, token_hash: str, email: str):
+        """Remove a record."""
+
+    async def expire(self, now: Optional[float] = None) -> int:
+        return 0
+
+    async def close(self):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sessions in this process only.
+
+    The reference implementation of the interface and the benchmark
+    baseline. AuthManager's own indexes already keep sessions in memory, so
+    SESSION_STORE=memory (the default) runs without a separate store.
+    """
+
+    name = "memory"
+    shared = False
+
+    def __init__(self):
+        self.records: Dict[str, Tuple[str, float, bytes]] = {}
+        self.by_email: Dict[str, str] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    async def get(self, token_hash: str) -> Optional[bytes]:
+        entry = self.records.get(token_hash)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[2]
+
+    async def get_by_email(self, email: str) -> Optional[bytes]:
+        token_hash = self.by_email.get(email)
+        return await self.get(token_hash) if token_hash else None
+
+    async def put(self, token_hash: str, email: str, expires_at: float, record: bytes):
+        self.records[token_hash] = (email, expires_at, record)
+        self.by_email[email] = token_hash
+        heapq.heappush(self._heap, (expires_at, token_hash))
+
+    async def delete(self, token_hash: str, email: str):
+        self.records.pop(token_hash, None)
+        if self.by_email.get(email) == token_hash:
+            del self.by_email[email]
+
+    async def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, token_hash = heapq.heappop(self._heap)
+            entry = self.records.get(token_hash)
+            if entry is not None and entry[1] <= now:
+                await self.delete(token_hash, entry[0])
+                removed += 1
+        return removed
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in a SQLite database in WAL mode.
+
+    WAL lets any number of worker processes read while one writes. Queries
+    are single primary-key or index reads on a local file, but a write may
+    wait up to the busy timeout for another process's lock, so they run on
+    the backend executor rather than on the event loop.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("SESSION_SQLITE_PATH", "sessions.db")
+        self._db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        # One connection shared by executor threads
+        self._db_lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " token_hash TEXT PRIMARY KEY, email TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, record BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_email ON sessions(email, expires_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions(expires_at)")
+
+    def _fetch_one(self, sql: str, params: tuple) -> Optional[bytes]:
+        with self._db_lock:
+            row = self._db.execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    def _write(self, sql: str, params: tuple) -> int:
+        with self._db_lock:
+            return self._db.execute(sql, params).rowcount
+
+    async def get(self, token_hash: str) -> Optional[bytes]:
+        return await get_backend_executor().run(
+            self._fetch_one,
+            "SELECT record FROM sessions WHERE token_hash = ? AND expires_at > ?",
+            (token_hash, time.time()),
+        )
+
+    async def get_by_email(self, email: str) -> Optional[bytes]:
+        return await get_backend_executor().run(
+            self._fetch_one,
+            "SELECT record FROM sessions WHERE email = ? AND expires_at > ? ORDER BY expires_at DESC LIMIT 1",
+            (email, time.time()),
+        )
+
+    async def put(self, token_hash: str, email: str, expires_at: float, record: bytes):
+        await get_backend_executor().run(
+            self._write,
+            "INSERT OR REPLACE INTO sessions (token_hash, email, expires_at, record) VALUES (?, ?, ?, ?)",
+            (token_hash, email, expires_at, record),
+        )
+
+    async def delete(self, token_hash: str, email: str):
+        await get_backend_executor().run(self._write, "DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+
+    async def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return await get_backend_executor().run(self._write, "DELETE FROM sessions WHERE expires_at <= ?", (now,))
+
+    async def close(self):
+        with self._db_lock:
+            self._db.close()
+
+
+class SharedMemorySessionStore(SessionStore):
+    """
+    Sessions in a named shared-memory segment, for workers on one host.
+
+    The segment holds two open-addressing hash tables with linear probing:
+    session slots keyed by token hash, and email slots mapping an email to
+    its latest token hash. Slots have a fixed size, so records longer than
+    SESSION_SHM_RECORD_SIZE are rejected. Access is serialized between
+    processes with flock on a companion lock file (shared for reads,
+    exclusive for writes); a lookup is a hash, a probe and two syscalls.
+    """
+
+    name = "shm"
+
+    _HEADER = struct.Struct("<8sII")
+    _MAGIC = b"JCSSESS1"
+    # state, expires_at, key, record length
+    _SESSION = struct.Struct("<B7xd32sI4x")
+    # state, expires_at, email key, token key
+    _EMAIL = struct.Struct("<B7xd32s32s")
+    EMPTY, USED, DELETED = 0, 1, 2
+
+    def __init__(self, name: Optional[str] = None, capacity: Optional[int] = None, record_size: Optional[int] = None):
+        if fcntl is None:
+            raise RuntimeError("The shared-memory session store needs a POSIX platform")
+        self.segment_name = name or os.getenv("SESSION_SHM_NAME", "jcs_sessions")
+        self.capacity = capacity or int(os.getenv("SESSION_SHM_CAPACITY", "16384"))
+        self.record_size = record_size or int(os.getenv("SESSION_SHM_RECORD_SIZE", "1024"))
+        size = self._layout()
+
+        lock_path = Path(os.getenv("SESSION_SHM_LOCK_DIR", "/tmp")) / f"{self.segment_name}.lock"
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            try:
+                self._shm = shared_memory.SharedMemory(self.segment_name, create=True, size=size)
+                self._HEADER.pack_into(self._shm.buf, 0, self._MAGIC, self.capacity, self.record_size)
+            except FileExistsError:
+                # Another worker created it; its layout wins
+                self._shm = shared_memory.SharedMemory(self.segment_name)
+                magic, self.capacity, self.record_size = self._HEADER.unpack_from(self._shm.buf, 0)
+                if magic != self._MAGIC:
+                    raise RuntimeError(f"Shared memory segment {self.segment_name} is not a session store")
+                self._layout()
+            # The segment outlives any one worker; the resource tracker would
+            # unlink it when the process that created it exits
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        self._buf = self._shm.buf
+
+    def _layout(self) -> int:
+        """Compute table offsets; returns the segment size."""
+        self.slot_size = self._SESSION.size + self.record_size
+        self._sessions_at = self._HEADER.size
+        self._emails_at = self._sessions_at + self.capacity * self.slot_size
+        return self._emails_at + self.capacity * self._EMAIL.size
+
+    @staticmethod
+    def _key(value: str) -> bytes:
+        return hashlib.sha256(value.encode()).digest()
+
+    def _find(self, key: bytes, base: int, layout: struct.Struct, stride: int, now: float) -> Tuple[int, int]:
+        """
+        Probe for `key`; returns (slot index or -1, first reusable slot or -1).
+
+        Expired entries count as reusable but do not end the probe.
+        """
+        start = int.from_bytes(key[:8], "little") % self.capacity
+        free = -1
+        for step in range(self.capacity):
+            index = (start + step) % self.capacity
+            state, expires_at, slot_key = layout.unpack_from(self._buf, base + index * stride)[:3]
+            if state == self.EMPTY:
+                return -1, free if free >= 0 else index
+            if state == self.USED and expires_at > now:
+                if slot_key == key:
+                    return index, free
+            elif free < 0:
+                free = index
+        return -1, free
+
+    def _read(self, token_key: bytes, now: float) -> Optional[bytes]:
+        index, _ = self._find(token_key, self._sessions_at, self._SESSION, self.slot_size, now)
+        if index < 0:
+            return None
+        offset = self._sessions_at + index * self.slot_size
+        length = self._SESSION.unpack_from(self._buf, offset)[3]
+        start = offset + self._SESSION.size
+        return bytes(self._buf[start:start + length])
+
+    async def get(self, token_hash: str) -> Optional[bytes]:
+        fcntl.flock(self._lock_fd, fcntl.LOCK_SH)
+        try:
+            return self._read(bytes.fromhex(token_hash), time.time())
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    async def get_by_email(self, email: str) -> Optional[bytes]:
+        now = time.time()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_SH)
+        try:
+            index, _ = self._find(self._key(email), self._emails_at, self._EMAIL, self._EMAIL.size, now)
+            if index < 0:
+                return None
+            token_key = self._EMAIL.unpack_from(self._buf, self._emails_at + index * self._EMAIL.size)[3]
+            return self._read(token_key, now)
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    async def put(self, token_hash: str, email: str, expires_at: float, record: bytes):
+        if len(record) > self.record_size:
+            raise ValueError(f"Session record of {len(record)} bytes exceeds SESSION_SHM_RECORD_SIZE")
+        token_key = bytes.fromhex(token_hash)
+        email_key = self._key(email)
+        now = time.time()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            index, free = self._find(token_key, self._sessions_at, self._SESSION, self.slot_size, now)
+            index = index if index >= 0 else free
+            if index < 0:
+                raise RuntimeError("Shared memory session store is full")
+            offset = self._sessions_at + index * self.slot_size
+            self._SESSION.pack_into(self._buf, offset, self.USED, expires_at, token_key, len(record))
+            start = offset + self._SESSION.size
+            self._buf[start:start + len(record)] = record
+
+            index, free = self._find(email_key, self._emails_at, self._EMAIL, self._EMAIL.size, now)
+            index = index if index >= 0 else free
+            if index >= 0:
+                self._EMAIL.pack_into(
+                    self._buf, self._emails_at + index * self._EMAIL.size,
+                    self.USED, expires_at, email_key, token_key,
+                )
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    async def delete(self, token_hash: str, email: str):
+        token_key = bytes.fromhex(token_hash)
+        now = time.time()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            index, _ = self._find(token_key, self._sessions_at, self._SESSION, self.slot_size, now)
+            if index >= 0:
+                self._buf[self._sessions_at + index * self.slot_size] = self.DELETED
+            index, _ = self._find(self._key(email), self._emails_at, self._EMAIL, self._EMAIL.size, now)
+            if index >= 0:
+                offset = self._emails_at + index * self._EMAIL.size
+                if self._EMAIL.unpack_from(self._buf, offset)[3] == token_key:
+                    self._buf[offset] = self.DELETED
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    async def expire(self, now: Optional[float] = None) -> int:
+        """Mark expired slots deleted so probes and inserts can reuse them."""
+        now = time.time() if now is None else now
+        removed = 0
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            for base, layout, stride in (
+                (self._sessions_at, self._SESSION, self.slot_size),
+                (self._emails_at, self._EMAIL, self._EMAIL.size),
+            ):
+                for index in range(self.capacity):
+                    offset = base + index * stride
+                    state, expires_at = layout.unpack_from(self._buf, offset)[:2]
+                    if state == self.USED and expires_at <= now:
+                        self._buf[offset] = self.DELETED
+                        removed += base == self._sessions_at
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        return removed
+
+    async def close(self):
+        self._buf = None
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self):
+        """Remove the segment; only for the last user of it."""
+        # unlink() unregisters from the resource tracker, which we already did
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+
+class RespSessionStore(SessionStore):
+    """
+    Sessions in Redis, or anything speaking its protocol.
+
+    Records are plain keys with a millisecond TTL, so the server expires
+    them without a sweep; a second key per email points at the latest
+    token hash. Reads and writes are one pipelined round trip.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, prefix: str = "mcp:session:"):
+        self.client = RespClient(url or os.getenv("SESSION_REDIS_URL", "redis://127.0.0.1:6379/0"))
+        self.prefix = prefix
+
+    @staticmethod
+    def _ttl_ms(expires_at: float) -> int:
+        return max(int((expires_at - time.time()) * 1000), 1)
+
+    async def get(self, token_hash: str) -> Optional[bytes]:
+        return await self.client.execute("GET", self.prefix + token_hash)
+
+    async def get_by_email(self, email: str) -> Optional[bytes]:
+        token_hash = await self.client.execute("GET", self.prefix + "email:" + email)
+        if token_hash is None:
+            return None
+        return await self.get(token_hash.decode())
+
+    async def put(self, token_hash: str, email: str, expires_at: float, record: bytes):
+        ttl = self._ttl_ms(expires_at)
+        for reply in await self.client.pipeline([
+            ("SET", self.prefix + token_hash, record, "PX", ttl),
+            ("SET", self.prefix + "email:" + email, token_hash, "PX", ttl),
+        ]):
+            if isinstance(reply, Exception):
+                raise reply
+
+    async def delete(self, token_hash: str, email: str):
+        await self.client.execute("DEL", self.prefix + token_hash)
+
+    async def close(self):
+        await self.client.close()
+
+
+SESSION_STORES = {
+    "sqlite": SQLiteSessionStore,
+    "shm": SharedMemorySessionStore,
+    "redis": RespSessionStore,
+}
+
+
+def create_session_store() -> Optional[SessionStore]:
+    """
+    Build the backend named by SESSION_STORE.
+
+    Returns None for "memory", in which case AuthManager keeps sessions in
+    its own indexes only.
+    """
+    kind = os.getenv("SESSION_STORE", "memory").strip().lower()
+    if kind == "memory":
+        return None
+    if kind not in SESSION_STORES:
+        raise ValueError(f"Unknown SESSION_STORE {kind!r}; expected memory, {', '.join(SESSION_STORES)}")
+    return SESSION_STORES[kind]()
@@ -0,0 +1,78 @@
+"""
+Request coalescing for Convex reads.
+Concurrent identical calls share a single in-flight backend request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .client_pool import hash_token
+from .convex_codec import dumps_canonical
+
+
+def make_call_key(function_name: str, arguments: Optional[dict], auth_token: Optional[str]) -> Tuple[str, bytes, Optional[str]]:
+    """Identify a call by function, canonical arguments and caller identity."""
+    canonical_args = dumps_canonical(arguments or {})
+    return (function_name, canonical_args, hash_token(auth_token) if auth_token else None)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller starts the work; callers that arrive while it is still
+    running await the same result instead of issuing their own request.
+    Cancelling one caller never cancels the shared work for the others, but
+    once every caller has gone the shared work is cancelled too.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.calls = 0
+        self.executed = 0
+        self.saved = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `func` for `key`, or join the call already in flight."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.saved += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            self.executed += 1
+
+            def on_done(finished: asyncio.Future):
+                if self._inflight.get(key) is finished:
+                    del self._inflight[key]
+                    self._waiters.pop(key, None)
+                # Mark the exception as retrieved even if every caller went away
+                if not finished.cancelled():
+                    finished.exception()
+
+            task.add_done_callback(on_done)
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    # Nobody is waiting any more: stop using backend capacity
+                    self.abandoned += 1
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing counters."""
+        return {
+            "calls": self.calls,
+            "backend_requests": self.executed,
+            "saved": self.saved,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._inflight),
+        }
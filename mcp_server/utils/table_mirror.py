@@ -0,0 +1,286 @@
+"""
+Live in-process mirror of journal tables.
+Kept current through Convex query subscriptions so read tools can answer from memory.
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from convex import ConvexClient as ConvexPyClient
+
+from .convex_client import ConvexClient, ConvexResponse, get_convex_client
+
+# Narrows mirrored rows to one view; returns None when the mirror cannot answer
+Selector = Callable[[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]
+
+MIRROR_ARTICLE_LIMIT = int(os.getenv("CONVEX_MIRROR_ARTICLE_LIMIT", "100"))
+
+# Table -> (query that lists it for an editor identity, arguments)
+MIRRORED_TABLES: Dict[str, Tuple[str, dict]] = {
+    "manuscripts": ("manuscripts:getManuscriptsForEditor", {}),
+    "reviews": ("reviews:getReviewsForEditor", {}),
+    "proofingTasks": ("proofing:getProofingTasks", {}),
+    "articles": ("articles:getPublishedArticles", {"limit": float(MIRROR_ARTICLE_LIMIT)}),
+}
+
+
+class MirroredTable:
+    """Latest snapshot of one subscribed query."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: List[Dict[str, Any]] = []
+        self.synced = False
+        self.updated_at = 0.0
+        self.updates = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def replace(self, rows: Optional[List[Dict[str, Any]]]):
+        self.rows = list(rows or [])
+        self.synced = True
+        self.updated_at = time.time()
+        self.updates += 1
+        self.last_error = None
+
+    def fail(self, error: Exception):
+        # The snapshot can no longer be trusted until the subscription recovers
+        self.synced = False
+        self.errors += 1
+        self.last_error = str(error)
+
+
+class TableMirror:
+    """
+    Subscribes to the journal's listing queries and keeps their results in memory.
+
+    Subscriptions run as a service editor identity (CONVEX_MIRROR_AUTH_TOKEN);
+    rows are filtered per caller in `visible_rows`. The editor queries return
+    nothing rather than failing for any other identity, so the mirror does
+    not start without a token and only subscribes once loggedInUser shows
+    the token belongs to an editor. A table that has not
+    synced, whose subscription failed, or (if CONVEX_MIRROR_MAX_STALENESS is
+    set) that has not updated within the window is treated as stale and
+    callers fall back to direct queries.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        auth_token: Optional[str] = None,
+        max_staleness: Optional[float] = None,
+    ):
+        self.base_url = base_url or os.getenv("CONVEX_URL", "http://localhost:3000")
+        self.auth_token = auth_token or os.getenv("CONVEX_MIRROR_AUTH_TOKEN", "")
+        self.max_staleness = max_staleness if max_staleness is not None else float(os.getenv("CONVEX_MIRROR_MAX_STALENESS", "0"))
+        self.tables: Dict[str, MirroredTable] = {name: MirroredTable(name) for name in MIRRORED_TABLES}
+        self.verified = False
+        self.last_error: Optional[str] = None
+        self.hits = 0
+        self.fallbacks = 0
+        self._client: Optional[ConvexPyClient] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def ensure_started(self):
+        """Start subscriptions in the running loop (no-op if already running)."""
+        if self._tasks:
+            return
+        if not self.auth_token:
+            self.last_error = "CONVEX_MIRROR_AUTH_TOKEN is not set"
+            return
+        self._tasks.append(asyncio.get_running_loop().create_task(self._run()))
+
+    async def _verify_identity(self) -> bool:
+        """Whether the mirror token belongs to an editor; raises if Convex cannot say."""
+        response = await get_convex_client().get_current_user(self.auth_token)
+        if not response.success:
+            raise RuntimeError(response.error or "loggedInUser failed")
+        if not response.data:
+            raise RuntimeError("CONVEX_MIRROR_AUTH_TOKEN is invalid or expired")
+        roles = (response.data.get("userData") or {}).get("roles") or []
+        return "editor" in roles
+
+    async def _run(self):
+        """Verify the service identity, then follow every mirrored table."""
+        backoff = 1.0
+        while True:
+            try:
+                if not await self._verify_identity():
+                    self.last_error = "CONVEX_MIRROR_AUTH_TOKEN does not belong to an editor"
+                    return
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"Could not verify mirror identity: {e}"
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+        self.verified = True
+        self.last_error = None
+        self._client = ConvexPyClient(self.base_url)
+        self._client.set_auth(self.auth_token)
+        await asyncio.gather(*(
+            self._follow(table, function_name, arguments)
+            for table, (function_name, arguments) in MIRRORED_TABLES.items()
+        ))
+
+    async def _follow(self, table: str, function_name: str, arguments: dict):
+        """Apply every result pushed by a subscription; resubscribe on failure."""
+        mirrored = self.tables[table]
+        backoff = 1.0
+        while True:
+            try:
+                subscription = self._client.subscribe(function_name, arguments)
+                async for rows in subscription:
+                    mirrored.replace(rows)
+                    backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                mirrored.fail(e)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+    def is_fresh(self, table: str) -> bool:
+        mirrored = self.tables[table]
+        if not self.verified or not mirrored.synced:
+            return False
+        if self.max_staleness > 0 and time.time() - mirrored.updated_at > self.max_staleness:
+            return False
+        return True
+
+    def visible_rows(self, table: str, session, select: Optional[Selector] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rows of `table` the caller may see, or None to fall back to a direct query.
+
+        Editors see every mirrored row and published articles are public.
+        Mirrored reviews carry the editor query's shape, not the reviewer
+        query's, and author views need manuscriptAuthors, which is not
+        mirrored, so both always fall back. `select` narrows the
+        visible rows further and may itself return None to force a fallback.
+        """
+        self.ensure_started()
+        rows = None
+        if self.is_fresh(table):
+            rows = self._filter(table, self.tables[table].rows, session)
+        if rows is not None and select is not None:
+            rows = select(rows)
+        if rows is None:
+            self.fallbacks += 1
+        else:
+            self.hits += 1
+        return rows
+
+    def _filter(self, table: str, rows: List[Dict[str, Any]], session) -> Optional[List[Dict[str, Any]]]:
+        if table == "articles":
+            return rows
+        if "editor" in session.roles:
+            return rows
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Mirror size, lag and hit/fallback counters."""
+        now = time.time()
+        return {
+            "verified": self.verified,
+            "last_error": self.last_error,
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "tables": {
+                name: {
+                    "rows": len(t.rows),
+                    "synced": t.synced,
+                    "fresh": self.is_fresh(name),
+                    "lag_seconds": now - t.updated_at if t.updated_at else None,
+                    "updates": t.updates,
+                    "errors": t.errors,
+                    "last_error": t.last_error,
+                }
+                for name, t in self.tables.items()
+            },
+        }
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._client = None
+
+
+async def mirrored_query_many(
+    client: ConvexClient,
+    session,
+    auth_token: str,
+    calls: List[Tuple[Optional[str], str, Optional[dict]]],
+) -> List[ConvexResponse]:
+    """
+    Like ConvexClient.query_many, but answers from the mirror where possible.
+
+    Each call is (table, function_name, arguments); calls whose table is None
+    or not fresh in the mirror are sent to Convex concurrently.
+    """
+    mirror = get_table_mirror()
+    responses: List[Optional[ConvexResponse]] = [None] * len(calls)
+    pending = []
+    for i, (table, _, _) in enumerate(calls):
+        rows = mirror.visible_rows(table, session) if mirror is not None and table else None
+        if rows is not None:
+            responses[i] = ConvexResponse(success=True, data=rows)
+        else:
+            pending.append(i)
+
+    if pending:
+        results = await client.query_many(
+            [(calls[i][1], calls[i][2]) for i in pending], auth_token=auth_token
+        )
+        for i, result in zip(pending, results):
+            responses[i] = result
+    return responses
+
+
+async def mirrored_query(
+    client: ConvexClient,
+    table: str,
+    function_name: str,
+    session,
+    auth_token: str,
+    arguments: Optional[dict] = None,
+    select: Optional[Selector] = None,
+) -> ConvexResponse:
+    """
+    Answer one listing read from the mirror when fresh, else query Convex.
+
+    `select` narrows mirrored rows to the view the direct query would return
+    (e.g. the requested number of articles); it is not applied to direct results.
+    """
+    mirror = get_table_mirror()
+    if mirror is not None:
+        rows = mirror.visible_rows(table, session, select)
+        if rows is not None:
+            return ConvexResponse(success=True, data=rows)
+    return (await client.query_many([(function_name, arguments)], auth_token=auth_token))[0]
+
+
+# Global mirror instance
+_table_mirror: Optional[TableMirror] = None
+
+
+def get_table_mirror() -> Optional[TableMirror]:
+    """Get global table mirror, or None when CONVEX_MIRROR_ENABLED is off."""
+    global _table_mirror
+    if os.getenv("CONVEX_MIRROR_ENABLED", "false").lower() != "true":
+        return None
+    if _table_mirror is None:
+        _table_mirror = TableMirror()
+    return _table_mirror
+
+
+async def cleanup_table_mirror():
+    """Stop global table mirror subscriptions."""
+    global _table_mirror
+    if _table_mirror is not None:
+        await _table_mirror.stop()
+        _table_mirror = None
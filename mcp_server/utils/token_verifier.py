@@ -0,0 +1,206 @@
+"""
+Local verification of Convex Auth tokens for MCP server.
+Checks RS256 JWT signatures against a cached JWKS instead of asking Convex.
+"""
+
+import os
+import json
+import time
+import base64
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .executor import get_backend_executor
+from .single_flight import SingleFlight
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa
+except ImportError:
+    rsa = None
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _b64url_int(data: str) -> int:
+    return int.from_bytes(_b64url_decode(data), "big")
+
+
+def unverified_claims(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a JWT's payload without checking its signature.
+
+    Only for tokens received directly from Convex (e.g. the signIn
+    response), never for tokens presented by a caller.
+    """
+    try:
+        claims = json.loads(_b64url_decode(token.split(".")[1]))
+    except (IndexError, ValueError):
+        return None
+    return claims if isinstance(claims, dict) else None
+
+
+def token_user_id(claims: Dict[str, Any]) -> Optional[str]:
+    """User id from Convex Auth claims, whose subject is "<userId>|<sessionId>"."""
+    subject = claims.get("sub")
+    if not isinstance(subject, str) or not subject:
+        return None
+    return subject.split("|")[0]
+
+
+class JWKSCache:
+    """
+    RSA public keys by key id, loaded from a JWKS file or URL.
+
+    Keys are reloaded after `ttl` seconds, or early when a token names an
+    unknown key id (at most once per `min_refresh_interval`). Concurrent
+    callers share one reload. After a reload fails or finds no keys, none
+    is tried for `min_refresh_interval` and lookups of missing keys return
+    None at once, so callers fall back to Convex instead of waiting.
+    """
+
+    def __init__(self, source: str, ttl: Optional[float] = None, min_refresh_interval: float = 30.0):
+        self.source = source
+        self.ttl = ttl if ttl is not None else float(os.getenv("CONVEX_AUTH_JWKS_TTL", "3600"))
+        self.min_refresh_interval = min_refresh_interval
+        self.keys: Dict[str, Any] = {}
+        self.loaded_at = 0.0
+        self.failed_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._refresh_flight = SingleFlight()
+
+    async def _fetch(self) -> Dict[str, Any]:
+        if self.source.startswith(("http://", "https://")):
+            async with httpx.AsyncClient(timeout=10.0) as http:
+                response = await http.get(self.source)
+                response.raise_for_status()
+                return response.json()
+        # A local file may sit on slow or network storage; keep the read off the loop
+        return json.loads(await get_backend_executor().run(Path(self.source).read_text))
+
+    def _failed(self, error: str):
+        self.failed_at = time.monotonic()
+        self.failures += 1
+        self.last_error = error
+
+    async def refresh(self):
+        try:
+            jwks = await self._fetch()
+            keys = {}
+            for jwk in jwks.get("keys", []):
+                if jwk.get("kty") == "RSA" and "n" in jwk and "e" in jwk:
+                    keys[jwk.get("kid", "")] = rsa.RSAPublicNumbers(_b64url_int(jwk["e"]), _b64url_int(jwk["n"])).public_key()
+        except Exception as e:
+            self._failed(str(e))
+            return
+        if not keys:
+            # Keep whatever keys we had
+            self._failed("JWKS has no RSA keys")
+            return
+        self.keys = keys
+        self.loaded_at = time.monotonic()
+        self.failed_at = None
+        self.refreshes += 1
+        self.last_error = None
+
+    async def get_key(self, kid: str):
+        now = time.monotonic()
+        age = now - self.loaded_at
+        due = not self.keys or age > self.ttl or (kid not in self.keys and age > self.min_refresh_interval)
+        backing_off = self.failed_at is not None and now - self.failed_at < self.min_refresh_interval
+        if due and not backing_off:
+            await self._refresh_flight.do("jwks", self.refresh)
+        return self.keys.get(kid)
+
+
+class TokenVerifier:
+    """
+    Verifies Convex Auth JWTs (RS256) locally.
+
+    `verify` returns the token's claims when the signature, expiry, issuer
+    and audience check out, and None otherwise. Callers treat None as
+    "cannot vouch for this token" and fall back to asking Convex.
+    """
+
+    def __init__(
+        self,
+        jwks_source: str,
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        leeway: Optional[float] = None,
+    ):
+        self.jwks = JWKSCache(jwks_source)
+        self.issuer = issuer if issuer is not None else os.getenv("CONVEX_AUTH_ISSUER", os.getenv("CONVEX_SITE_URL", ""))
+        self.audience = audience if audience is not None else os.getenv("CONVEX_AUTH_AUDIENCE", "convex")
+        self.leeway = leeway if leeway is not None else float(os.getenv("CONVEX_AUTH_LEEWAY", "30"))
+        self.verified = 0
+        self.rejected = 0
+
+    async def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        claims = await self._verify(token)
+        if claims is None:
+            self.rejected += 1
+        else:
+            self.verified += 1
+        return claims
+
+    async def _verify(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            header_b64, payload_b64, signature_b64 = token.split(".")
+            header = json.loads(_b64url_decode(header_b64))
+            claims = json.loads(_b64url_decode(payload_b64))
+            signature = _b64url_decode(signature_b64)
+        except ValueError:
+            return None
+        if not isinstance(header, dict) or not isinstance(claims, dict) or header.get("alg") != "RS256":
+            return None
+
+        key = await self.jwks.get_key(header.get("kid", ""))
+        if key is None:
+            return None
+        try:
+            key.verify(signature, f"{header_b64}.{payload_b64}".encode(), padding.PKCS1v15(), hashes.SHA256())
+        except InvalidSignature:
+            return None
+
+        now = time.time()
+        if claims.get("exp", 0) + self.leeway < now:
+            return None
+        if claims.get("nbf", 0) - self.leeway > now:
+            return None
+        if self.issuer and claims.get("iss", "").rstrip("/") != self.issuer.rstrip("/"):
+            return None
+        audience = claims.get("aud")
+        if self.audience and self.audience not in (audience if isinstance(audience, list) else [audience]):
+            return None
+        return claims
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "verified": self.verified,
+            "rejected": self.rejected,
+            "jwks_keys": len(self.jwks.keys),
+            "jwks_refreshes": self.jwks.refreshes,
+            "jwks_failures": self.jwks.failures,
+            "jwks_error": self.jwks.last_error,
+        }
+
+
+def create_token_verifier() -> Optional[TokenVerifier]:
+    """
+    Build a verifier from CONVEX_AUTH_JWKS (file path or URL).
+
+    Returns None when local verification is not configured or the optional
+    cryptography package is not installed.
+    """
+    source = os.getenv("CONVEX_AUTH_JWKS", "")
+    if not source or rsa is None:
+        return None
+    return TokenVerifier(source)
@@ -0,0 +1,715 @@
+"""
+Chunked upload sessions for MCP server.
+Streams manuscript files to Convex storage as clients send them, chunk by chunk,
+or spools them to local disk so an interrupted upload can resume.
+"""
+
+import os
+import json
+import time
+import asyncio
+import binascii
+import hashlib
+import secrets
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from .base64_stream import BLOCK_SIZE, Base64Decoder
+from .content_index import get_content_index
+from .convex_client import ConvexResponse, get_convex_client
+from .executor import get_backend_executor
+from .security import FILE_CHECK_BYTES, security_config, validate_file_content
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Spooled manuscripts are unpublished; keep them out of reach of other local users
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+_UPLOAD_ID_CHARS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+def spool_prefix(owner: str) -> str:
+    """File name prefix for an owner's spooled uploads, so they can be counted without reading them."""
+    return hashlib.sha256(owner.encode()).hexdigest()[:16] + "."
+
+
+def _open_private(path: str, flags: int, mode: str):
+    """Open a spool file readable and writable by this user only, never through a symlink."""
+    return os.fdopen(os.open(path, flags | _NOFOLLOW, 0o600), mode)
+
+
+def prepare_spool_dir(path: str):
+    """Create the spool directory, or check an existing one belongs to this user and is private."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not os.path.isdir(path) or os.path.islink(path):
+        raise RuntimeError(f"Upload spool {path} is not a directory")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise RuntimeError(f"Upload spool {path} belongs to another user")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+
+
+class UploadOffsetError(ValueError):
+    """A chunk or commit that does not line up with what the upload holds; the client resumes from `offset`."""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(message)
+        self.offset = offset
+
+
+class UploadStorageError(ValueError):
+    """The stream to Convex storage ended early; the upload cannot continue."""
+
+
+class UploadSession:
+    """
+    One file being streamed to a Convex upload URL.
+
+    The POST to the upload URL starts when the session begins and its body
+    is fed from a small queue: each appended chunk is decoded and queued,
+    and appending waits while the queue is full, so memory per session is
+    bounded by a few blocks however large the file is. Base64 chunks may be
+    split anywhere (see Base64Decoder). The file's SHA-256 is computed as
+    blocks pass through and, if the client declared one, checked before
+    the upload is completed. The first FILE_CHECK_BYTES of the file are
+    checked against its type before any of it is sent on, so the first
+    chunk must hold at least that much, and the last ones at commit. A
+    session for bytes already stored is created with their storage id and
+    never opens an upload.
+
+    `offset` counts the base64 characters accepted so far. A chunk sent
+    with an explicit offset that overlaps them (a retry whose reply was
+    lost) has the overlap skipped; one that would leave a gap is refused.
+    A refused chunk (bad base64, too many bytes, wrong file type) leaves
+    the session as it was, so the client can send a corrected one.
+    """
+
+    # Whether the session outlives the process and can be picked up again
+    durable = False
+
+    def __init__(
+        self,
+        upload_id: str,
+        owner: str,
+        file_name: str,
+        file_size: int,
+        content_type: str,
+        queue_chunks: int,
+        sha256: Optional[str] = None,
+        storage_id: Optional[str] = None,
+    ):
+        self.upload_id = upload_id
+        self.owner = owner
+        self.file_name = file_name
+        self.file_size = file_size
+        self.content_type = content_type
+        self.sha256 = sha256.lower() if sha256 else None
+        self.storage_id = storage_id
+        self.received = file_size if storage_id else 0
+        self.offset = 0
+        self.skipped = 0
+        self.attempts = 0
+        self._head = b""
+        self._tail = b""
+        self.last_active = time.monotonic()
+        self.lock = asyncio.Lock()
+        self._decoder = Base64Decoder()
+        self._hasher = hashlib.sha256()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_chunks)
+        self._upload: Optional[asyncio.Task] = None
+
+    async def _body(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self._queue.get()
+            if chunk is None:
+                return
+            yield chunk
+
+    def start(self, upload_url: str):
+        client = get_convex_client()
+        self._upload = asyncio.get_running_loop().create_task(
+            client.upload_stream(upload_url, self._body(), self.content_type, self.file_size)
+        )
+
+    def _upload_error(self) -> str:
+        result = self._upload.result() if not self._upload.cancelled() else None
+        return result.error if result is not None and not result.success else "upload stream closed early"
+
+    async def _put(self, item: Optional[bytes]):
+        """Queue body data, failing if the upload to Convex has already ended."""
+        if self._upload.done():
+            raise UploadStorageError(f"Upload to storage failed: {self._upload_error()}")
+        put = asyncio.ensure_future(self._queue.put(item))
+        await asyncio.wait({put, self._upload}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            raise UploadStorageError(f"Upload to storage failed: {self._upload_error()}")
+
+    def _unsent(self, chunk: str, offset: Optional[int]) -> str:
+        """The part of a chunk starting at `offset` that the session does not hold yet."""
+        if offset is None or offset == self.offset:
+            return chunk
+        if offset < 0 or offset > self.offset:
+            raise UploadOffsetError(
+                f"Chunk starts at offset {offset} but the upload continues at {self.offset}", self.offset
+            )
+        overlap = min(self.offset - offset, len(chunk))
+        self.skipped += overlap
+        return chunk[overlap:]
+
+    def _decode(self, chunk: str) -> list:
+        try:
+            blocks = list(self._decoder.feed(chunk))
+        except binascii.Error:
+            raise ValueError("Chunk is not valid base64")
+        size = sum(len(block) for block in blocks)
+        if self.received + size > self.file_size:
+            raise ValueError(f"Upload exceeds its declared size of {self.file_size} bytes")
+        self._inspect(blocks, size)
+        return blocks
+
+    def _inspect(self, blocks: list, size: int):
+        """Check the file's first bytes as they arrive, and keep its last ones."""
+        # Only when every byte so far passed through this session
+        if self.received == len(self._head) < FILE_CHECK_BYTES:
+            for block in blocks:
+                self._head += block[:FILE_CHECK_BYTES - len(self._head)]
+                if len(self._head) == FILE_CHECK_BYTES:
+                    break
+            if len(self._head) == FILE_CHECK_BYTES or self.received + size == self.file_size:
+                validate_file_content(self.content_type, self._head)
+            elif not self.durable:
+                raise ValueError(f"The first chunk must hold at least {FILE_CHECK_BYTES} bytes of the file")
+        for block in blocks[-2:]:
+            self._tail = (self._tail + block[-FILE_CHECK_BYTES:])[-FILE_CHECK_BYTES:]
+
+    async def append(self, chunk: str, offset: Optional[int] = None) -> int:
+        """Decode a base64 chunk and stream it on; returns total bytes received."""
+        self.last_active = time.monotonic()
+        if self.storage_id is not None:
+            # Already stored: nothing to send
+            return self.received
+        state = (self.skipped, self._head, self._tail, self._decoder.carry, self._decoder.padded)
+        try:
+            chunk = self._unsent(chunk, offset)
+            blocks = self._decode(chunk)
+        except ValueError:
+            self.skipped, self._head, self._tail, self._decoder.carry, self._decoder.padded = state
+            raise
+        self.offset += len(chunk)
+        for block in blocks:
+            self._hasher.update(block)
+            await self._put(block)
+            self.received += len(block)
+        self.last_active = time.monotonic()
+        return self.received
+
+    def digest(self) -> str:
+        return self.sha256 if self.storage_id is not None else self._hasher.hexdigest()
+
+    async def refresh(self):
+        """Catch up with appends made elsewhere; nothing to do for a session held in memory."""
+
+    def _check_complete(self):
+        if self.received != self.file_size or self._decoder.carry:
+            raise UploadOffsetError(
+                f"Upload incomplete: received {self.received} of {self.file_size} bytes", self.offset
+            )
+
+    async def finish(self, auth_token: Optional[str] = None) -> ConvexResponse:
+        """End the body and wait for Convex to store the file."""
+        if self.storage_id is not None:
+            return ConvexResponse(success=True, data={"storageId": self.storage_id})
+        self._check_complete()
+        if self.sha256 is not None and self._hasher.hexdigest() != self.sha256:
+            raise ValueError("Upload does not match its declared sha256")
+        validate_file_content(self.content_type, self._head, self._tail)
+        self.attempts += 1
+        await self._put(None)
+        return await self._upload
+
+    async def abort(self):
+        if self._upload is not None and not self._upload.done():
+            self._upload.cancel()
+            try:
+                await self._upload
+            except asyncio.CancelledError:
+                pass
+
+
+class SpooledUploadSession(UploadSession):
+    """
+    An upload kept in a local spool file until it is committed.
+
+    Decoded chunks are appended to `<owner>.<upload_id>.part` and fsynced,
+    then a checkpoint `<owner>.<upload_id>.json` (see spool_prefix) recording the offset, bytes received and
+    any base64 carry is atomically replaced, so a client whose connection
+    dropped can ask for the offset and continue from there, even after the
+    server restarted. Each append works from the checkpoint under a file
+    lock, so workers on the same host can take turns on one upload. The
+    spool is only sent to Convex at commit, with a fresh upload URL per
+    attempt; if storage fails the spool is kept and the commit can be
+    repeated without sending the file again.
+    """
+
+    durable = True
+
+    def __init__(self, upload_id: str, owner: str, file_name: str, file_size: int, content_type: str,
+                 spool_dir: str, commit_retries: int = 0, sha256: Optional[str] = None):
+        super().__init__(upload_id, owner, file_name, file_size, content_type, 1, sha256=sha256)
+        base = os.path.join(spool_dir, spool_prefix(owner) + upload_id)
+        self.part_path = f"{base}.part"
+        self.checkpoint_path = f"{base}.json"
+        self.commit_retries = commit_retries
+        self._digest: Optional[str] = None
+
+    def _save_checkpoint(self):
+        state = {
+            "upload_id": self.upload_id,
+            "owner": self.owner,
+            "file_name": self.file_name,
+            "file_size": self.file_size,
+            "content_type": self.content_type,
+            "sha256": self.sha256,
+            "offset": self.offset,
+            "received": self.received,
+            "carry": self._decoder.carry,
+            "padded": self._decoder.padded,
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with _open_private(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _restore(self):
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        self.offset = state["offset"]
+        self.received = state["received"]
+        self._decoder.carry = state["carry"]
+        self._decoder.padded = state.get("padded", False)
+
+    @classmethod
+    def load(
+        cls, spool_dir: str, upload_id: str, owner: str, commit_retries: int = 0
+    ) -> Optional["SpooledUploadSession"]:
+        """Pick up an owner's spooled upload from its checkpoint, or None if there is none."""
+        try:
+            with open(os.path.join(spool_dir, f"{spool_prefix(owner)}{upload_id}.json")) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        session = cls(
+            upload_id, state["owner"], state["file_name"], state["file_size"], state["content_type"],
+            spool_dir, commit_retries, sha256=state["sha256"],
+        )
+        session.offset = state["offset"]
+        session.received = state["received"]
+        session._decoder.carry = state["carry"]
+        session._decoder.padded = state.get("padded", False)
+        return session
+
+    def _lock(self, f):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def create(self):
+        """Start an empty spool file and its checkpoint."""
+        with _open_private(self.part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, "wb"):
+            pass
+        self._save_checkpoint()
+
+    def _append_locked(self, chunk: str, offset: Optional[int]) -> int:
+        with open(self.part_path, "r+b") as f:
+            self._lock(f)
+            # Another worker, or this one before a failed write, may have moved on
+            self._restore()
+            chunk = self._unsent(chunk, offset)
+            blocks = self._decode(chunk)
+            # Drop anything written after the last checkpoint
+            f.truncate(self.received)
+            f.seek(self.received)
+            for block in blocks:
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+            self.offset += len(chunk)
+            self.received += sum(len(block) for block in blocks)
+            self._save_checkpoint()
+        return self.received
+
+    async def _run(self, func, *args):
+        """Run file work on the backend executor."""
+        try:
+            return await get_backend_executor().run(func, *args)
+        except FileNotFoundError:
+            raise ValueError("Upload is no longer spooled; it was committed, aborted or expired")
+
+    async def append(self, chunk: str, offset: Optional[int] = None) -> int:
+        """Decode a base64 chunk into the spool file; returns total bytes received."""
+        self.last_active = time.monotonic()
+        received = await self._run(self._append_locked, chunk, offset)
+        self.last_active = time.monotonic()
+        return received
+
+    async def refresh(self):
+        await self._run(self._restore)
+
+    def _hash_spool(self) -> str:
+        """Hash the complete spool file, checking its content on the way."""
+        hasher = hashlib.sha256()
+        head = tail = b""
+        with open(self.part_path, "r+b") as f:
+            self._lock(f)
+            self._restore()
+            self._check_complete()
+            f.truncate(self.received)
+            while True:
+                block = f.read(BLOCK_SIZE)
+                if not block:
+                    break
+                head = head or block[:FILE_CHECK_BYTES]
+                tail = (tail + block[-FILE_CHECK_BYTES:])[-FILE_CHECK_BYTES:]
+                hasher.update(block)
+        validate_file_content(self.content_type, head, tail)
+        return hasher.hexdigest()
+
+    def digest(self) -> str:
+        return self._digest
+
+    async def _spool_body(self) -> AsyncIterator[bytes]:
+        executor = get_backend_executor()
+        with open(self.part_path, "rb") as f:
+            while True:
+                block = await executor.run(f.read, BLOCK_SIZE)
+                if not block:
+                    return
+                yield block
+
+    async def finish(self, auth_token: Optional[str] = None) -> ConvexResponse:
+        """Check the spool file, then send it to Convex storage, retrying with a fresh upload URL."""
+        self._digest = await self._run(self._hash_spool)
+        if self.sha256 is not None and self._digest != self.sha256:
+            raise ValueError("Upload does not match its declared sha256")
+
+        client = get_convex_client()
+        result = ConvexResponse(success=False, error="no upload attempted")
+        for _ in range(1 + self.commit_retries):
+            self.attempts += 1
+            upload_response = await client.generate_upload_url(auth_token)
+            upload_url = (upload_response.data or {}).get("uploadUrl") if upload_response.success else None
+            if not upload_url:
+                result = ConvexResponse(
+                    success=False, error=f"Failed to generate upload URL: {upload_response.error or 'no URL received'}"
+                )
+                continue
+            result = await client.upload_stream(upload_url, self._spool_body(), self.content_type, self.file_size)
+            if result.success:
+                break
+        self.last_active = time.monotonic()
+        return result
+
+    def _remove(self):
+        for path in (self.part_path, self.checkpoint_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def abort(self):
+        await get_backend_executor().run(self._remove)
+
+
+class UploadSessionManager:
+    """
+    Open upload sessions by id.
+
+    Sessions belong to the user who began them. Their number is capped
+    overall and per user, and sessions idle for longer than `idle_timeout`
+    are let go. With a `spool_dir` uploads are spooled to disk and are
+    resumable: an idle session is only dropped from memory and is loaded
+    back from its checkpoint when the client returns, and spool files are
+    removed once untouched for `spool_ttl`. The per-user cap then counts
+    the user's uploads on disk, and the sizes they declared may not add up
+    to more than `spool_quota`. Without one, each session holds a
+    connection to Convex storage open and an idle session is aborted.
+    A refused chunk or commit leaves the upload in place; it only ends when
+    committed, aborted, expired, or when its stream to storage breaks.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        max_chunk_size: Optional[int] = None,
+        queue_chunks: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        spool_ttl: Optional[float] = None,
+        commit_retries: Optional[int] = None,
+        spool_quota: Optional[int] = None,
+    ):
+        self.max_sessions = max_sessions or int(os.getenv("UPLOAD_MAX_SESSIONS", "32"))
+        self.max_per_user = max_per_user or int(os.getenv("UPLOAD_MAX_SESSIONS_PER_USER", "2"))
+        self.idle_timeout = idle_timeout or float(os.getenv("UPLOAD_SESSION_IDLE_TIMEOUT", "300"))
+        # Base64 characters per append
+        self.max_chunk_size = max_chunk_size or int(os.getenv("UPLOAD_MAX_CHUNK_SIZE", "1048576"))
+        self.queue_chunks = queue_chunks or int(os.getenv("UPLOAD_QUEUE_CHUNKS", "2"))
+        # Unset or empty: stream straight to storage, no resume
+        self.spool_dir = spool_dir if spool_dir is not None else os.getenv("UPLOAD_SPOOL_DIR", "")
+        self.spool_ttl = spool_ttl if spool_ttl is not None else float(os.getenv("UPLOAD_SPOOL_TTL", "86400"))
+        self.commit_retries = (
+            commit_retries if commit_retries is not None else int(os.getenv("UPLOAD_COMMIT_RETRIES", "2"))
+        )
+        # Bytes of spooled uploads per user
+        self.spool_quota = (
+            spool_quota
+            or int(os.getenv("UPLOAD_SPOOL_QUOTA_PER_USER") or 0)
+            or self.max_per_user * security_config.max_file_size
+        )
+        if self.spool_dir:
+            prepare_spool_dir(self.spool_dir)
+        self._spool_lock = asyncio.Lock()
+        self.sessions: Dict[str, UploadSession] = {}
+        self.begun = 0
+        self.committed = 0
+        self.aborted = 0
+        self.expired = 0
+        self.deduplicated = 0
+        self.resumed = 0
+        self.bytes_streamed = 0
+        self.chars_skipped = 0
+        self.commit_attempts = 0
+
+    def _sweep_spool(self) -> int:
+        """Remove spooled uploads untouched for longer than spool_ttl."""
+        cutoff = time.time() - self.spool_ttl
+        removed = 0
+        for name in os.listdir(self.spool_dir):
+            path = os.path.join(self.spool_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += name.endswith(".json")
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _spooled_by(self, owner: str) -> Tuple[int, int]:
+        """Number of an owner's spooled uploads and the bytes they declared."""
+        prefix = spool_prefix(owner)
+        count = reserved = 0
+        for name in os.listdir(self.spool_dir):
+            if not (name.startswith(prefix) and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.spool_dir, name)) as f:
+                    reserved += json.load(f)["file_size"]
+            except (OSError, ValueError, KeyError):
+                continue
+            count += 1
+        return count, reserved
+
+    async def _begin_spooled(
+        self, owner: str, file_name: str, file_size: int, content_type: str, sha256: Optional[str]
+    ) -> "SpooledUploadSession":
+        executor = get_backend_executor()
+        # Checked and created together so concurrent begins cannot both fit
+        async with self._spool_lock:
+            count, reserved = await executor.run(self._spooled_by, owner)
+            if count >= self.max_per_user:
+                raise ValueError(
+                    f"At most {self.max_per_user} uploads may be in progress at once; commit or abort one first"
+                )
+            if reserved + file_size > self.spool_quota:
+                raise ValueError(
+                    f"Upload quota exceeded: {reserved} of {self.spool_quota} bytes already in uploads in progress"
+                )
+            session = SpooledUploadSession(
+                secrets.token_urlsafe(16), owner, file_name, file_size, content_type,
+                self.spool_dir, self.commit_retries, sha256=sha256,
+            )
+            await executor.run(session.create)
+        return session
+
+    async def _expire_idle(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        for session in [s for s in self.sessions.values() if s.last_active < cutoff and not s.lock.locked()]:
+            self.sessions.pop(session.upload_id, None)
+            if not session.durable:
+                self.expired += 1
+                await session.abort()
+        if self.spool_dir:
+            self.expired += await get_backend_executor().run(self._sweep_spool)
+
+    async def begin(
+        self, owner: str, file_name: str, file_size: int, content_type: str, auth_token: str, sha256: Optional[str] = None
+    ) -> UploadSession:
+        await self._expire_idle()
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("Too many uploads in progress; try again later")
+        # Spooled uploads are counted on disk, where they stay while idle
+        if sum(1 for s in self.sessions.values() if s.owner == owner and not s.durable) >= self.max_per_user:
+            raise ValueError(f"At most {self.max_per_user} uploads may be open at once")
+
+        if sha256:
+            storage_id = get_content_index().lookup(owner, sha256.lower())
+            if storage_id is not None:
+                session = UploadSession(
+                    secrets.token_urlsafe(16), owner, file_name, file_size, content_type, self.queue_chunks,
+                    sha256=sha256, storage_id=storage_id,
+                )
+                self.sessions[session.upload_id] = session
+                self.begun += 1
+                self.deduplicated += 1
+                return session
+
+        if self.spool_dir:
+            session = await self._begin_spooled(owner, file_name, file_size, content_type, sha256)
+            self.sessions[session.upload_id] = session
+            self.begun += 1
+            return session
+
+        upload_response = await get_convex_client().generate_upload_url(auth_token)
+        if not upload_response.success:
+            raise ValueError(f"Failed to generate upload URL: {upload_response.error}")
+        upload_url = upload_response.data.get("uploadUrl")
+        if not upload_url:
+            raise ValueError("No upload URL received")
+
+        session = UploadSession(
+            secrets.token_urlsafe(16), owner, file_name, file_size, content_type, self.queue_chunks, sha256=sha256
+        )
+        session.start(upload_url)
+        self.sessions[session.upload_id] = session
+        self.begun += 1
+        return session
+
+    async def get(self, upload_id: str, owner: str) -> UploadSession:
+        session = self.sessions.get(upload_id)
+        if session is None and self.spool_dir and upload_id and set(upload_id) <= _UPLOAD_ID_CHARS:
+            # Begun before a restart, by another worker, or let go while idle
+            session = await get_backend_executor().run(
+                SpooledUploadSession.load, self.spool_dir, upload_id, owner, self.commit_retries
+            )
+            if session is not None and session.owner == owner:
+                session = self.sessions.setdefault(upload_id, session)
+                self.resumed += 1
+        if session is None or session.owner != owner:
+            raise ValueError("Unknown or expired upload_id")
+        return session
+
+    async def status(self, upload_id: str, owner: str) -> Dict[str, Any]:
+        """Where an upload stands, for a client resuming it."""
+        session = await self.get(upload_id, owner)
+        async with session.lock:
+            await session.refresh()
+            return {
+                "upload_id": upload_id,
+                "offset": session.offset,
+                "received": session.received,
+                "file_size": session.file_size,
+                "remaining": session.file_size - session.received,
+                "resumable": session.durable,
+            }
+
+    async def append(self, upload_id: str, owner: str, chunk: str, offset: Optional[int] = None) -> UploadSession:
+        if len(chunk) > self.max_chunk_size:
+            raise ValueError(f"Chunk too large. Max size: {self.max_chunk_size} base64 characters")
+        session = await self.get(upload_id, owner)
+        async with session.lock:
+            before, skipped_before = session.received, session.skipped
+            try:
+                await session.append(chunk, offset)
+            except UploadStorageError:
+                # Only a broken stream ends the upload; a refused chunk leaves it as it was
+                await self.abort(upload_id, owner)
+                raise
+            self.bytes_streamed += max(session.received - before, 0)
+            self.chars_skipped += session.skipped - skipped_before
+            return session
+
+    async def commit(self, upload_id: str, owner: str, auth_token: Optional[str] = None) -> str:
+        """Finish the upload; returns the storage id of the stored file."""
+        session = await self.get(upload_id, owner)
+        async with session.lock:
+            attempts_before = session.attempts
+            try:
+                result = await session.finish(auth_token)
+            except UploadStorageError:
+                await self.abort(upload_id, owner)
+                raise
+            finally:
+                self.commit_attempts += session.attempts - attempts_before
+            if not result.success and session.durable:
+                # The spool is intact; committing again retries without resending
+                raise ValueError(f"Failed to upload file: {result.error}; the upload is kept, commit again to retry")
+            self.sessions.pop(upload_id, None)
+            if session.durable:
+                await session.abort()
+        if not result.success:
+            self.aborted += 1
+            raise ValueError(f"Failed to upload file: {result.error}")
+        storage_id = (result.data or {}).get("storageId")
+        if not storage_id:
+            self.aborted += 1
+            raise ValueError("No storage ID received after upload")
+        get_content_index().remember(owner, session.digest(), storage_id, session.file_size)
+        self.committed += 1
+        return storage_id
+
+    async def abort(self, upload_id: str, owner: str):
+        try:
+            session = await self.get(upload_id, owner)
+        except ValueError:
+            return
+        self.sessions.pop(upload_id, None)
+        self.aborted += 1
+        await session.abort()
+
+    async def close(self):
+        for session in list(self.sessions.values()):
+            # Spooled uploads stay on disk to be resumed after a restart
+            if not session.durable:
+                await session.abort()
+        self.sessions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "open": len(self.sessions),
+            "resumable": bool(self.spool_dir),
+            "begun": self.begun,
+            "committed": self.committed,
+            "aborted": self.aborted,
+            "expired": self.expired,
+            "deduplicated": self.deduplicated,
+            "resumed": self.resumed,
+            "commit_attempts": self.commit_attempts,
+            "bytes_streamed": self.bytes_streamed,
+            "chars_skipped": self.chars_skipped,
+        }
+
+
+# Global upload session manager
+_upload_manager: Optional[UploadSessionManager] = None
+
+
+def get_upload_manager() -> UploadSessionManager:
+    """Get global upload session manager."""
+    global _upload_manager
+    if _upload_manager is None:
+        _upload_manager = UploadSessionManager()
+    return _upload_manager
+
+
+async def cleanup_upload_manager():
+    """Abort uploads still in progress."""
+    global _upload_manager
+    if _upload_manager is not None:
+        await _upload_manager.close()
+        _upload_manager = None